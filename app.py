@@ -2,6 +2,7 @@ import streamlit as st
 from modules import (
     dashboard,
     SeatInventoryCollections,
+    round_trip_analysis,
     employee_performance_analysis,
     sales_dashboard,
     enplanement_analysis,
@@ -11,12 +12,14 @@ from modules import (
 )
 from modules.data_loader import (
     load_seat_inventory,
+    load_round_trips,
     load_employee_performance,
     load_payment_report,
     load_enplanement_report,
     load_agent_productivity,
     load_invoice_summary_report,
-    load_agent_user_privileges
+    load_agent_user_privileges,
+    load_report_files
 )
 
 # ---------- إعداد الصفحة ----------
@@ -27,38 +30,53 @@ st.sidebar.title("📂 Navigation")
 page = st.sidebar.radio("Go to", [
     "🏠 Overview",
     "💺 Seat Inventory",
+    "🔁 Round Trips",
     "🛫 Passenger Enplanement",
     "💵 Sales & Collections",
     "👨‍💼 Staff Performance",
     "🤝 Agent Productivity",
     "📑 Invoice Summary",
-    "🔐 User Privileges"
+    "🔐 User Privileges",
+    "🔀 Privilege Changes"
 ])
 
 # ---------- تحميل البيانات ----------
 df = None
 
 if page == "💺 Seat Inventory":
-    df = load_seat_inventory("SeatInventoryAndCollectionsReport.csv")
+    df = load_report_files(
+        load_seat_inventory,
+        "SeatInventoryAndCollectionsReport*.csv",
+        incremental=True,
+        columns=SeatInventoryCollections.REQUIRED_COLUMNS
+    )
+
+elif page == "🔁 Round Trips":
+    df = load_report_files(load_round_trips, "SeatInventoryAndCollectionsReport*.csv")
 
 elif page == "👨‍💼 Staff Performance":
-    df = load_employee_performance("PerformanaceOfSalesStaffDetail.csv")
+    # the system exports only: the hand-flattened PerformanaceOfSalesStaffDetail.csv
+    # has no banner (no report period) and would be counted again
+    df = load_report_files(load_employee_performance, "PerformanaceOfSalesStaffDetail (*).csv")
 
 elif page == "💵 Sales & Collections":
-    df = load_payment_report("CompanyPaymentReport (6).csv")
+    df = load_report_files(load_payment_report, "CompanyPaymentReport*.csv")
 
 elif page == "🛫 Passenger Enplanement":
-    df = load_enplanement_report("EnplanementReport.csv")
+    df = load_report_files(load_enplanement_report, "EnplanementReport*.csv")
 
 elif page == "🤝 Agent Productivity":
-    df = load_agent_productivity("AgentProductivityReport.csv")
+    df = load_report_files(load_agent_productivity, "AgentProductivityReport*.csv")
 
 elif page == "📑 Invoice Summary":
-    df = load_invoice_summary_report("InvoiceSummaryReport.csv")
+    df = load_report_files(load_invoice_summary_report, "InvoiceSummaryReport*.csv")
 
 elif page == "🔐 User Privileges":
     df = load_agent_user_privileges("AgentUserPrivileges.csv")
 
+elif page == "🔀 Privilege Changes":
+    df = load_report_files(load_agent_user_privileges, "AgentUserPrivileges*.csv")
+
 # ---------- استدعاء الصفحات ----------
 if page == "🏠 Overview":
     dashboard.show()
@@ -66,6 +84,9 @@ if page == "🏠 Overview":
 elif page == "💺 Seat Inventory":
     SeatInventoryCollections.show(df)
 
+elif page == "🔁 Round Trips":
+    round_trip_analysis.show(df)
+
 elif page == "👨‍💼 Staff Performance":
     employee_performance_analysis.show(df)
 
@@ -83,3 +104,6 @@ elif page == "📑 Invoice Summary":
 
 elif page == "🔐 User Privileges":
     agent_user_privileges.show(df)
+
+elif page == "🔀 Privilege Changes":
+    agent_user_privileges.show_changes(df)
@@ -0,0 +1,78 @@
+"""
+Benchmark: report number parsing on a one-million-row money column.
+
+Compares the cleaning chain the loaders used to run
+(``astype(str).str.replace(",", "").str.strip()`` + ``pd.to_numeric``, plus the
+regex pass of the invoice loader) with ``modules.numeric.parse_numeric``.
+
+Run from the project root:
+
+    python benchmarks/bench_numeric.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.numeric import parse_numeric  # noqa: E402
+
+ROWS = 1_000_000
+
+
+def make_column(rows: int) -> pd.Series:
+    """Money strings like the CompanyPaymentReport export, with some blanks, percents, labels, signs, exponents and long notes."""
+    rng = np.random.default_rng(42)
+    values = np.round(rng.uniform(-1e6, 1e8, rows), 2)
+    col = pd.Series([f"{v:,.2f}" for v in values], dtype=object)
+    col[rng.random(rows) < 0.02] = ""
+    col[rng.random(rows) < 0.01] = "Detail"
+    col[rng.random(rows) < 0.02] = "82%"
+    col[rng.random(rows) < 0.01] = "+1,250.75"
+    col[rng.random(rows) < 0.001] = "1.5e3"
+    # one long note per decoding block: must not make the other rows slower
+    col[::65_536] = "Detail " * 300
+    return col
+
+
+def old_chain(col: pd.Series) -> pd.Series:
+    cleaned = col.astype(str).str.replace(",", "").str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def old_invoice_chain(col: pd.Series) -> pd.Series:
+    cleaned = col.astype(str).str.replace(",", "").str.replace("[^0-9.-]", "", regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def timed(func, col, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(col)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    col = make_column(ROWS)
+
+    t_old, old = timed(old_chain, col)
+    t_invoice, _ = timed(old_invoice_chain, col)
+    t_new, new = timed(parse_numeric, col)
+
+    # Same values wherever the old chain could parse the cell
+    mask = old.notna().to_numpy()
+    assert np.array_equal(old.to_numpy()[mask], new.to_numpy()[mask])
+
+    print(f"rows: {ROWS:,}")
+    print(f"str.replace + to_numeric:       {t_old * 1000:8.1f} ms")
+    print(f"str.replace + regex + to_numeric:{t_invoice * 1000:7.1f} ms")
+    print(f"parse_numeric:                  {t_new * 1000:8.1f} ms  ({t_old / t_new:.1f}x / {t_invoice / t_new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: grid / JSON payloads of the seat inventory report scaled 1000x.
+
+The 567-line SeatInventoryAndCollectionsReport sample (as ``load_round_trips``
+returns it) is repeated 1000 times and encoded with:
+
+- JSON: ``json.dumps(df.to_dict("records"))`` (a Python object per cell) and
+  st_aggrid's JSON path (``Timestamp.isoformat`` per date cell +
+  ``to_json(orient="records")``) against ``modules.payload.to_json``
+- Arrow (what AgGrid receives): st_aggrid's date conversion + Arrow IPC
+  against ``modules.payload.grid_frame`` + Arrow IPC
+
+Run from the project root:
+
+    python benchmarks/bench_payload.py
+"""
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.data_loader import load_round_trips  # noqa: E402
+from modules.payload import grid_frame, to_json  # noqa: E402
+
+SEAT_FILE = "SeatInventoryAndCollectionsReport.csv"
+SCALE = 1000
+
+
+def arrow_bytes(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def aggrid_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """st_aggrid's conversion of the frame it is given (per-cell isoformat on date columns)."""
+    df = df.copy(deep=False)
+    for col, dtype in df.dtypes.items():
+        if dtype.kind == "M":
+            df[col] = df[col].apply(lambda s: s.isoformat())
+    return df
+
+
+def records_json(df: pd.DataFrame) -> str:
+    return json.dumps(df.to_dict(orient="records"), default=str)
+
+
+def aggrid_json(df: pd.DataFrame) -> str:
+    return aggrid_dates(df).to_json(orient="records")
+
+
+def aggrid_arrow(df: pd.DataFrame) -> bytes:
+    return arrow_bytes(aggrid_dates(df))
+
+
+def payload_arrow(df: pd.DataFrame) -> bytes:
+    return arrow_bytes(grid_frame(df))
+
+
+def timed(func, df, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    sample = load_round_trips(SEAT_FILE)
+    df = pd.concat([sample] * SCALE, ignore_index=True)
+
+    t_records, _ = timed(records_json, df, repeat=1)
+    t_aggrid_json, old_json = timed(aggrid_json, df)
+    t_json, new_json = timed(to_json, df)
+    t_aggrid_arrow, old_arrow = timed(aggrid_arrow, df)
+    t_arrow, new_arrow = timed(payload_arrow, df)
+
+    # Same rows and dates in both JSON payloads
+    old_rows = json.loads(old_json)
+    new_cols = json.loads(new_json)
+    assert len(old_rows) == len(new_cols["flight_date"]) == len(df)
+    assert old_rows[0]["flight_date"][:10] == new_cols["flight_date"][0]
+
+    print(f"rows: {len(df):,} ({len(sample)} x {SCALE}), columns: {len(df.columns)}")
+    print("JSON")
+    print(f"  to_dict(records) + json.dumps:  {t_records * 1000:8.1f} ms  {len(records_json(sample)) * SCALE / 1e6:6.1f} MB")
+    print(f"  st_aggrid (isoformat + records):{t_aggrid_json * 1000:8.1f} ms  {len(old_json) / 1e6:6.1f} MB")
+    print(f"  payload.to_json (columnar):     {t_json * 1000:8.1f} ms  {len(new_json) / 1e6:6.1f} MB"
+          f"  ({t_records / t_json:.1f}x / {t_aggrid_json / t_json:.1f}x faster)")
+    print("Arrow IPC")
+    print(f"  st_aggrid (isoformat):          {t_aggrid_arrow * 1000:8.1f} ms  {len(old_arrow) / 1e6:6.1f} MB")
+    print(f"  payload.grid_frame:             {t_arrow * 1000:8.1f} ms  {len(new_arrow) / 1e6:6.1f} MB"
+          f"  ({t_aggrid_arrow / t_arrow:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 import streamlit as st
 from modules.seat_inventory import overview, load_factor, sales_class
+from modules.seat_inventory.cube import CUBE_COLUMNS
+from modules.lazy_tabs import lazy_tabs
+
+# كل الأعمدة التي تحتاجها التبويبات والـ cube، يُقرأ من الملف هذه الأعمدة فقط
+REQUIRED_COLUMNS = sorted(
+    set(overview.REQUIRED_COLUMNS) | set(load_factor.REQUIRED_COLUMNS) | set(sales_class.REQUIRED_COLUMNS)
+    | set(CUBE_COLUMNS)
+)
 
 def show(df):
     st.title("✈️ Seat Inventory & Collections")
-    tabs = st.tabs(["Overview", "Load Factor", "Sales by Class"])
-
-    with tabs[0]:
-        overview.show(df)
-    with tabs[1]:
-        load_factor.show(df)
-    with tabs[2]:
-        sales_class.show(df)
+    # التبويب المختار فقط يُحسب ويُعرض
+    lazy_tabs([
+        ("Overview", lambda: overview.show(df), ["overview_", "seat_overview_grid_"]),
+        ("Load Factor", lambda: load_factor.show(df), ["load_factor_"]),
+        ("Sales by Class", lambda: sales_class.show(df), ["sales_class_"])
+    ], key="seat_inventory_tab")
@@ -11,18 +11,12 @@ def show(df: pd.DataFrame):
         st.warning("No data loaded.")
         return
 
-    # -------- تنظيف الأعمدة الرقمية للتأكد --------
+    # الأعمدة الرقمية ونسبة المبيعات الشهرية (monthly_percentage) جاهزة من الـ loader
     numeric_cols = ['current_sale_usd', 'ytd_sale_month_usd', 'ytd_sale_usd']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-    # -------- حساب نسبة المبيعات الشهرية للسنوي لكل وكيل --------
-    df['monthly_percentage'] = (df['ytd_sale_month_usd'] / df['ytd_sale_usd'] * 100).round(2)
 
     # -------- عرض فترة التقرير --------
-    from_date = df['report_from_date'].iloc[0] if 'report_from_date' in df.columns else None
-    to_date = df['report_to_date'].iloc[0] if 'report_to_date' in df.columns else None
+    from_date = df['report_from_date'].min() if 'report_from_date' in df.columns else None
+    to_date = df['report_to_date'].max() if 'report_to_date' in df.columns else None
     if from_date and to_date:
         st.markdown(f"**Report Period:** {from_date.strftime('%d/%m/%Y')} - {to_date.strftime('%d/%m/%Y')}")
 
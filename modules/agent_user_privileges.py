@@ -1,43 +1,44 @@
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
+import numpy as np
 import pandas as pd
+from modules.privilege_diff import privilege_snapshots
+from modules.role_index import role_index
+from modules.role_mining import candidate_roles, privilege_outliers
 
 def show(df: pd.DataFrame):
     st.title("📋 Agent User Privileges")
 
-    # ----- استخراج قائمة الأدوار الفريدة -----
-    all_roles = []
-    for roles in df['Roles'].dropna():
-        all_roles.extend(str(roles).split("\n"))
-    all_roles = sorted(set([r.strip() for r in all_roles if r.strip()]))
+    index = role_index(df)
+    users = index.users
 
     # ----- فلاتر -----
     filter_agent = st.multiselect(
         "Filter by Agent Name", 
-        options=df['Agent Name'].unique(), 
+        options=users['Agent Name'].unique(), 
         default=None
     )
     filter_user = st.multiselect(
         "Filter by User ID", 
-        options=df['User ID'].unique(), 
+        options=users['User ID'].unique(), 
         default=None
     )
     filter_role = st.multiselect(
         "Filter by Role", 
-        options=all_roles, 
+        options=list(index.roles), 
         default=None
     )
 
-    df_filtered = df.copy()
-
+    selected = np.arange(len(users))
+    if filter_role:
+        selected = index.users_with_any(filter_role)
     if filter_agent:
-        df_filtered = df_filtered[df_filtered['Agent Name'].isin(filter_agent)]
+        selected = selected[np.isin(users['Agent Name'].to_numpy()[selected], filter_agent)]
     if filter_user:
-        df_filtered = df_filtered[df_filtered['User ID'].isin(filter_user)]
-    if filter_role:
-        df_filtered = df_filtered[df_filtered['Roles'].apply(
-            lambda x: any(r in str(x).split("\n") for r in filter_role)
-        )]
+        selected = selected[np.isin(users['User ID'].to_numpy()[selected], filter_user)]
+
+    df_filtered = users.take(selected)
+    df_filtered = df_filtered.assign(Roles=index.role_names(selected).to_numpy())
 
     # ----- عرض الجدول -----
     st.subheader("Agent Users Table")
@@ -56,7 +57,7 @@ def show(df: pd.DataFrame):
     grid_options = gb.build()
 
     AgGrid(
-        df_filtered,
+        df_filtered.copy(deep=False),  # AgGrid rewrites the frame it gets
         gridOptions=grid_options,
         height=500,
         width='100%',
@@ -68,15 +69,7 @@ def show(df: pd.DataFrame):
     # ----- إحصائيات -----
     st.subheader("📊 Summary Statistics")
     total_users = df_filtered['User ID'].nunique()
-
-    # استخراج كل الأدوار من العمود "Roles"
-    all_roles_filtered = []
-    for roles in df_filtered['Roles'].dropna():
-        all_roles_filtered.extend(str(roles).split("\n"))
-
-    all_roles_filtered = [r.strip() for r in all_roles_filtered if r.strip()]
-    role_counts = pd.Series(all_roles_filtered).value_counts()
-
+    role_counts = index.role_counts(selected)
     total_roles = len(role_counts)
 
     st.markdown(f"""
@@ -88,20 +81,69 @@ def show(df: pd.DataFrame):
 
     # عرض الأدوار مع عدد مرات التكرار
     st.write("### Roles Frequency")
-    st.dataframe(role_counts.reset_index().rename(columns={"index": "Role", 0: "Count"}))
+    st.dataframe(role_counts.reset_index())
 
     # ----- Top 5 Users بعدد الصلاحيات -----
     st.write("### 🏆 Top 5 Users with Most Roles")
-    df_filtered["Role Count"] = df_filtered["Roles"].apply(
-        lambda x: len(str(x).split("\n")) if pd.notna(x) else 0
-    )
-
-    top_users = df_filtered.sort_values("Role Count", ascending=False).head(5)
+    counts = index.role_count[selected]
+    top = selected[np.argsort(-counts, kind="stable")[:5]]
 
-    top_users["Roles List"] = top_users["Roles"].apply(
-        lambda x: ", ".join(str(x).split("\n")) if pd.notna(x) else ""
-    )
+    top_users = users.take(top).assign(**{
+        "Role Count": index.role_count[top],
+        "Roles List": index.role_names(top, sep=", ").to_numpy()
+    })
 
     st.table(
         top_users[["User ID", "User Name", "Agent Name", "Role Count", "Roles List"]]
     )
+
+    st.markdown("---")
+
+    # ----- Role Mining -----
+    st.subheader("🧩 Role Mining")
+    threshold = st.slider("Similarity threshold (Jaccard)", min_value=0.5, max_value=1.0, value=0.8, step=0.05,
+                          key="role_mining_threshold")
+    candidates = candidate_roles(index, threshold=threshold)
+    st.write(f"### Candidate Roles ({len(candidates)} groups of similar users)")
+    st.dataframe(candidates, hide_index=True)
+
+    st.write("### ⚠️ Least-Privilege Outliers")
+    st.caption("Roles few users of the same agent hold, and sensitive roles held by very few users.")
+    st.dataframe(privilege_outliers(index).style.format({"Peer Similarity": "{:.2f}"}), hide_index=True)
+
+
+def show_changes(df: pd.DataFrame):
+    st.title("🔀 Privilege Changes")
+
+    snapshots = privilege_snapshots(df)
+    dates = list(snapshots.snapshots)
+    if len(dates) < 2:
+        st.info("Only one AgentUserPrivileges snapshot found, add another export to compare.")
+        return
+
+    # ----- اختيار اللقطتين -----
+    labels = [f"{date:%d/%m/%Y}" for date in dates]
+    col1, col2 = st.columns(2)
+    old = col1.selectbox("From snapshot", range(len(dates)), index=len(dates) - 2,
+                         format_func=labels.__getitem__, key="privilege_diff_from")
+    new = col2.selectbox("To snapshot", range(len(dates)), index=len(dates) - 1,
+                         format_func=labels.__getitem__, key="privilege_diff_to")
+
+    changes = snapshots.diff(old, new)
+
+    # ----- إحصائيات -----
+    kpi1, kpi2, kpi3 = st.columns(3)
+    kpi1.metric("Users Changed", f"{changes[['Agent Code', 'User ID']].drop_duplicates().shape[0]:,}")
+    kpi2.metric("Roles Granted", f"{(changes['Change'] == 'granted').sum():,}")
+    kpi3.metric("Roles Revoked", f"{(changes['Change'] == 'revoked').sum():,}")
+
+    if changes.empty:
+        st.success("✅ No role changes between the two snapshots.")
+        return
+
+    st.write("### Changes by Role")
+    by_role = changes.groupby(["Role", "Change"]).size().unstack(fill_value=0).reset_index()
+    st.dataframe(by_role, hide_index=True)
+
+    st.write("### All Changes")
+    st.dataframe(changes.drop(columns=["From", "To"]), hide_index=True)
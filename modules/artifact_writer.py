@@ -0,0 +1,144 @@
+"""
+Background writer for the processed report artifacts (``processed/*_processed.parquet``).
+
+The loaders used to ``to_csv`` their result into ``processed/`` on every page
+render, on the render thread, with every session racing on the same file.
+``write_artifact`` instead:
+
+- is skipped when the artifact already records the same source fingerprint
+  (and, once checked, without reading it again while the artifact file
+  itself is unchanged)
+- runs on every load through ``writes_artifact`` (also on Parquet and shared
+  cache hits), so a deleted artifact is written again on the next load
+- runs on a single background thread (inside a loader worker process it runs
+  inline, that process is not rendering anything)
+- writes Parquet (zstd) to a temporary file and renames it over the artifact,
+  so readers never see a half-written file
+"""
+import functools
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+from modules.frame_cache import file_fingerprint
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - artifacts are simply not written
+    pa = pq = None
+
+ARTIFACT_FOLDER = "processed"
+
+# Parquet key-value metadata holding the fingerprint of the source CSV
+FINGERPRINT_KEY = b"source_fingerprint"
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+_pending = {}
+_lock = threading.Lock()
+# artifact path -> (source fingerprint, artifact stamp) of the last artifact written or checked
+_verified = {}
+
+
+def artifact_path(file_name: str) -> str:
+    """``processed/<report>_processed.parquet`` for the source ``file_name``."""
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    return os.path.join(ARTIFACT_FOLDER, f"{stem}_processed.parquet")
+
+
+def _artifact_stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _stored_fingerprint(path: str):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, ValueError):
+        return None
+    value = metadata.get(FINGERPRINT_KEY)
+    return json.loads(value) if value else None
+
+
+def _write(df: pd.DataFrame, path: str, fingerprint: dict) -> bool:
+    if _stored_fingerprint(path) == fingerprint:
+        _verified[path] = (fingerprint, _artifact_stamp(path))
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df)
+        # -------- ختم الملف ببصمة المصدر --------
+        metadata = dict(table.schema.metadata or {})
+        metadata[FINGERPRINT_KEY] = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        _verified[path] = (fingerprint, _artifact_stamp(path))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def write_artifact(df: pd.DataFrame, file_name: str, source_path: str) -> Future:
+    """
+    Queue ``df`` as the processed artifact of ``source_path``.
+
+    Returns a Future resolving to True when the artifact was (re)written and
+    False when it was already up to date.
+    """
+    if pq is None:
+        future = Future()
+        future.set_result(False)
+        return future
+
+    path = artifact_path(file_name)
+    fingerprint = file_fingerprint(source_path)
+
+    # -------- الملف موجود ولم يتغير منذ آخر تحقق: لا نسخ ولا قراءة --------
+    stamp = _artifact_stamp(path)
+    if stamp is not None and _verified.get(path) == (fingerprint, stamp):
+        future = Future()
+        future.set_result(False)
+        return future
+
+    if multiprocessing.parent_process() is not None:
+        future = Future()
+        future.set_result(_write(df, path, fingerprint))
+        return future
+
+    with _lock:
+        # a write of the same source version already queued: reuse it
+        pending = _pending.get(path)
+        if pending is not None and pending[0] == fingerprint and not pending[1].done():
+            return pending[1]
+        # the writer gets its own copy: the caller keeps using ``df``
+        future = _executor.submit(_write, df.copy(), path, fingerprint)
+        _pending[path] = (fingerprint, future)
+    return future
+
+
+def writes_artifact(data_folder: str):
+    """
+    Decorate a ``load_*(file_name, ...)`` function so every load (cached or
+    not) makes sure the processed artifact of ``file_name`` exists and is
+    current.
+    """
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(file_name, *args, **kwargs):
+            df = loader(file_name, *args, **kwargs)
+            write_artifact(df, file_name, os.path.join(data_folder, file_name))
+            return df
+
+        return wrapper
+
+    return decorator
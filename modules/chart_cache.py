@@ -0,0 +1,90 @@
+"""
+Rendered matplotlib charts, shared by every session.
+
+``st.pyplot`` needs a live pyplot figure on every rerun, and the pages never
+closed theirs, so each rerun left a figure behind in pyplot's registry. The
+chart pages now pass a draw function and the aggregated data it plots:
+
+- key: draw function, figure size, format, style arguments and a hash of
+  the data (values, index, columns, dtypes), so the same chart of the same
+  numbers is rendered once
+- figures are plain ``matplotlib.figure.Figure`` objects (never registered
+  with pyplot), rendered with the Agg canvas and released right after
+- the image bytes are kept in a bounded LRU (``MAX_CHARTS`` / ``MAX_BYTES``)
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+MAX_CHARTS = 128
+MAX_BYTES = 64 * 1024 * 1024
+
+# Same output as st.pyplot
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+_charts = OrderedDict()  # key -> bytes
+_charts_lock = threading.Lock()
+_total_bytes = 0
+
+
+def _values_bytes(values) -> bytes:
+    array = values.to_numpy() if hasattr(values, "to_numpy") else values
+    if array.dtype.kind in "biufcmM":
+        return array.tobytes()
+    return "\x1f".join(map(str, array)).encode()
+
+
+def data_hash(data) -> str:
+    """Hash of a Series / DataFrame: values, index, names and dtypes."""
+    digest = hashlib.blake2b(digest_size=16)
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    digest.update(repr((list(frame.columns), [str(t) for t in frame.dtypes], list(frame.index.names))).encode())
+    for level in range(frame.index.nlevels):
+        digest.update(_values_bytes(frame.index.get_level_values(level)))
+    for _, values in frame.items():
+        digest.update(_values_bytes(values))
+    return digest.hexdigest()
+
+
+def _render(draw, data, figsize, fmt, style) -> bytes:
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig.add_subplot(), data, **style)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, **SAVEFIG_OPTIONS)
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def render_chart(draw, data, figsize=(10, 5), fmt="png", **style) -> bytes:
+    """Image bytes of ``draw(ax, data, **style)``, rendered once per distinct chart."""
+    global _total_bytes
+    key = (f"{draw.__module__}.{draw.__qualname__}", tuple(figsize), fmt,
+           repr(sorted(style.items())), data_hash(data))
+    with _charts_lock:
+        image = _charts.get(key)
+        if image is not None:
+            _charts.move_to_end(key)
+            return image
+
+    image = _render(draw, data, figsize, fmt, style)
+    with _charts_lock:
+        if key not in _charts:
+            _charts[key] = image
+            _total_bytes += len(image)
+        # -------- LRU: الأقدم استخداماً يخرج أولاً --------
+        while len(_charts) > 1 and (len(_charts) > MAX_CHARTS or _total_bytes > MAX_BYTES):
+            _, evicted = _charts.popitem(last=False)
+            _total_bytes -= len(evicted)
+    return image
+
+
+def show_chart(draw, data, figsize=(10, 5), **style):
+    """Render (or reuse) the chart and show it like ``st.pyplot`` does."""
+    st.image(render_chart(draw, data, figsize=figsize, **style), width="stretch")
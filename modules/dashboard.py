@@ -2,29 +2,31 @@
 
 import streamlit as st
 import pandas as pd
-from modules.data_loader import load_payment_report, load_employee_performance
+from modules.data_loader import load_payment_report, load_employee_performance, load_report_files
 
 
 def show():
     st.title("🏠 Overview")
 
     # ---------- Load Data ----------
-    SALES_FILE = "CompanyPaymentReport (6).csv"
-    EMP_FILE = "PerformanaceOfSalesStaffDetail.csv"
+    SALES_PATTERN = "CompanyPaymentReport*.csv"
+    # the system exports, like the Staff Performance page
+    EMP_PATTERN = "PerformanaceOfSalesStaffDetail (*).csv"
 
     try:
-        sales_df = load_payment_report(SALES_FILE)
-        emp_df = load_employee_performance(EMP_FILE)
+        sales_df = load_report_files(load_payment_report, SALES_PATTERN)
+        emp_df = load_report_files(load_employee_performance, EMP_PATTERN)
         st.success("✅ Data loaded successfully!")
     except Exception as e:
         st.error(f"❌ Error loading data: {e}")
         return
 
     # ---------- Report Date Range ----------
-    from_date = sales_df['report_from_date'].iloc[0] if 'report_from_date' in sales_df.columns else None
-    to_date = sales_df['report_to_date'].iloc[0] if 'report_to_date' in sales_df.columns else None
+    from_date = sales_df['report_from_date'].min() if 'report_from_date' in sales_df.columns else None
+    to_date = sales_df['report_to_date'].max() if 'report_to_date' in sales_df.columns else None
 
-    if from_date and to_date:
+    # min / max of a report without a banner period are NaT, not None
+    if pd.notna(from_date) and pd.notna(to_date):
         st.markdown(
             f"""
             <div style="
@@ -49,7 +51,7 @@ def show():
 
     if not sales_df.empty and "Currency" in sales_df.columns and "Net Amount" in sales_df.columns:
         sales_by_currency = (
-            sales_df.groupby("Currency")["Net Amount"]
+            sales_df.groupby("Currency", observed=True)["Net Amount"]
             .sum()
             .reset_index()
             .sort_values("Net Amount", ascending=False)
@@ -68,7 +70,7 @@ def show():
         # Show top 5 employees by revenue
         if "user_name" in emp_df.columns and "total_charges" in emp_df.columns:
             top_employees = (
-                emp_df.groupby("user_name")["total_charges"]
+                emp_df.groupby("user_name", observed=True)["total_charges"]
                 .sum()
                 .reset_index()
                 .sort_values("total_charges", ascending=False)
@@ -1,6 +1,15 @@
 import pandas as pd
+import numpy as np
 import os
-import re
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from modules.artifact_writer import writes_artifact
+from modules.frame_cache import parquet_cached
+from modules.incremental_store import load_incremental
+from modules.shared_cache import shared_cached
+from modules.numeric import parse_numeric
+from modules.report_parser import ReportSpec, parse_report, FROM_DATE, TO_DATE, PRINT_DATE
+
 DATA_FOLDER = "data"
 
 # أعمدة مهمة لمقاعد الطيران
@@ -9,44 +18,99 @@ KEEP_COLS_SEAT = [
     "seats_allocated", "seats_sold", "seats_available", "seat_factor"
 ]
 
-def load_seat_inventory(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
-    df = pd.read_csv(file_path)
-
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-    rename_map = {
-        "flight_date": "flight_date",
-        "flight_no": "flight_no",
-        "segment": "segment",
-        "cos": "class_of_service",
-        "seats_allocate": "seats_allocated",
-        "seats_sold": "seats_sold",
-        "fare_collection(usd)": "fare_usd",
-        "seat_factor": "seat_factor",
-        "seats_available": "seats_available"
-    }
-    df = df.rename(columns=rename_map)
+# ---------- ضغط أنواع الأعمدة ----------
+# نصوص تتكرر قيمها (segment, COS, currency, agent ...) تُخزن كـ category
+CATEGORY_MAX_RATIO = 0.5
 
-    numeric_cols = ["fare_usd", "seats_sold", "seats_allocated", "seats_available"]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
-    if "flight_date" in df.columns:
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
+def compact_dtypes(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Replace the wide default dtypes of a loaded frame with compact ones:
+    - repetitive text columns -> category
+    - integer counts -> the smallest int type (int8/int16/int32)
+    - whole-number float columns without NaN -> int; real money stays float64
 
-    df = df[[col for col in KEEP_COLS_SEAT if col in df.columns]]
+    The frame name and its sizes before and after are kept in
+    ``df.attrs["memory_bytes"]``.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy()
+            if len(values) and not series.isna().any() and (values == values.round()).all():
+                df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
+            if pd.api.types.infer_dtype(series, skipna=True) != "string":
+                continue  # mixed columns are left as they are
+            if len(series) and series.nunique(dropna=True) <= len(series) * CATEGORY_MAX_RATIO:
+                df[col] = series.astype("category")
+
+    after = int(df.memory_usage(deep=True).sum())
+    df.attrs["memory_bytes"] = {"frame": name, "before": before, "after": after}
     return df
 
 
-def load_employee_performance(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
-    df = pd.read_csv(file_path)
-
-    df.columns = df.columns.str.strip().str.replace('\n', ' ')
-
-    rename_map = {
+def _data_file(file_name: str, *args, **kwargs) -> list:
+    return [os.path.join(DATA_FOLDER, file_name)]
+
+
+def _data_files(loader, pattern: str, *args, **kwargs) -> list:
+    return [os.path.join(DATA_FOLDER, name) for name in find_report_files(pattern)]
+
+
+# ---------- مواصفات التقارير ----------
+SEAT_INVENTORY_SPEC = ReportSpec(
+    name="SeatInventoryAndCollectionsReport",
+    header_marker="Flight Date",
+    rename_map={
+        "Flight Date": "flight_date",
+        "Flight No": "flight_no",
+        "Segment": "segment",
+        "COS": "class_of_service",
+        "Seats Allocate": "seats_allocated",
+        "Seats Sold": "seats_sold",
+        "Fare Collection(USD)": "fare_usd",
+        "Seat Factor": "seat_factor",
+        "Seats Available": "seats_available",
+        "On Hold": "seats_on_hold",
+        "Over sell": "seats_oversell"
+    },
+    numeric=("fare_usd", "seats_sold", "seats_allocated", "seats_available", "seats_on_hold", "seats_oversell"),
+    dates=("flight_date",),
+    date_format="%m/%d/%Y",
+    source_dtypes={
+        "Flight Date": "str",
+        "Flight No": "str",
+        "Segment": "str",
+        "COS": "str",
+        # numbers are read as text: a stray "CNX" must become 0, not fail the
+        # whole file; parse_numeric and numeric_fill convert them
+        "Seats Allocate": "str",
+        "Seats Sold": "str",
+        "Seats Available": "str",
+        "On Hold": "str",
+        "Over sell": "str",
+        "Fare Collection(USD)": "str",
+        "Seat Factor": "str"
+    },
+    dtypes={
+        "seats_allocated": "int64", "seats_sold": "int64", "seats_available": "int64",
+        "seats_on_hold": "int64", "seats_oversell": "int64"
+    }
+)
+
+EMPLOYEE_PERFORMANCE_SPEC = ReportSpec(
+    name="PerformanaceOfSalesStaffDetail (UC_REPM_010)",
+    header_marker="Agent Name",
+    metadata={"report_from_date": FROM_DATE, "report_to_date": TO_DATE},
+    group_column="Agent Name",
+    rename_map={
         'Agent Name': 'agent_name',
         'Login ID': 'login_id',
         'User Name': 'user_name',
@@ -54,453 +118,467 @@ def load_employee_performance(file_name: str) -> pd.DataFrame:
         'No. of PAX': 'pax',
         'Total Charges(USD)': 'total_charges',
         'Total Discount(USD)': 'total_discount'
-    }
-    df = df.rename(columns=rename_map)
+    },
+    numeric=('reservations', 'pax', 'total_charges', 'total_discount')
+)
+
+PAYMENT_REPORT_SPEC = ReportSpec(
+    name="CompanyPaymentReport (UC_REPM_02)",
+    header_marker="Agent/GSA Code",
+    metadata={"report_from_date": FROM_DATE, "report_to_date": TO_DATE},
+    numeric=('Net Amount',),
+    numeric_fill=None,
+    required=('Net Amount',)
+)
+
+ENPLANEMENT_REPORT_SPEC = ReportSpec(
+    name="EnplanementReport (UC_REPM_0)",
+    header_marker="Departure Date",
+    metadata={"report_from_date": FROM_DATE, "report_to_date": TO_DATE},
+    rename_map={
+        'Go Shows': 'go_shows',
+        'No Shows': 'no_shows',
+        'Flown Load': 'flown_load',
+        'Booked Load (Adult/Infant)': 'booked_load',
+        'Flight Number': 'flight_number',
+        'Segment': 'segment',
+        'Departure Date': 'departure_date'
+    },
+    numeric=('go_shows', 'no_shows', 'flown_load'),
+    dates=('departure_date',),
+    dtypes={'go_shows': int, 'no_shows': int, 'flown_load': int}
+)
+
+AGENT_PRODUCTIVITY_SPEC = ReportSpec(
+    name="AgentProductivityReport (UC_REPM_011)",
+    header_marker="Agent Code",
+    metadata={"report_from_date": FROM_DATE, "report_to_date": TO_DATE},
+    rename_map={
+        'Agent Code': 'agent_code',
+        'Agent Name': 'agent_name',
+        'Current Sale(USD)': 'current_sale_usd',
+        'YTD Sale for the Month(USD)': 'ytd_sale_month_usd',
+        'YTD Sale(USD)': 'ytd_sale_usd'
+    },
+    numeric=('current_sale_usd', 'ytd_sale_month_usd', 'ytd_sale_usd'),
+    required=('agent_code', 'agent_name'),
+    drop_empty_columns=True
+)
 
-    for col in ['reservations', 'pax', 'total_charges', 'total_discount']:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.replace(',', '', regex=False).str.strip()
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        else:
-            df[col] = 0
+INVOICE_SUMMARY_SPEC = ReportSpec(
+    name="InvoiceSummaryReport (UC_REPM_00)",
+    header_marker="Agent Code",
+    metadata={
+        "report_year": (r"Year\s*:\s*([^,\s]+)", str),
+        "report_month": (r"Month\s*:\s*([^,\s]+)", str)
+    },
+    numeric=("Invoice Total", "Fare", "Tax", "Modify", "Surcharge"),
+    drop_empty_columns=True
+)
 
-    return df
+AGENT_USER_PRIVILEGES_SPEC = ReportSpec(
+    name="AgentUserPrivileges (UC_REPM_028)",
+    header_marker="Agent Code",
+    metadata={"print_date": PRINT_DATE},
+    drop_empty_columns=True
+)
 
 
+# كل الأعمدة التي يمكن طلبها من التقرير (KEEP_COLS_SEAT هي الافتراضية)
+SEAT_COLUMNS = KEEP_COLS_SEAT + ["seats_on_hold", "seats_oversell", "fare_usd"]
 
-OUTPUT_FOLDER = "processed"
 
-def load_payment_report(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
-
-    # -------- قراءة أول 5 أسطر لاستخراج التواريخ --------
-    with open(file_path, 'r', encoding='utf-8') as f:
-        header_lines = [next(f).strip() for _ in range(5)]
-
-    from_date = None
-    to_date = None
-    for line in header_lines:
-        # البحث عن From Date
-        if "From Date" in line:
-            match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-            if match:
-                from_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-
-        # البحث عن To Date
-        if "To Date" in line:
-            match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-            if match:
-                to_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-
-    # -------- قراءة البيانات مع تخطي أول 5 أسطر --------
-    df = pd.read_csv(file_path, skiprows=5)
-
-    # -------- حذف آخر 3 أسطر --------
-    if len(df) > 3:
-        df = df.iloc[:-3]
-
-    # -------- تنظيف الأعمدة الرقمية --------
-    if 'Net Amount' in df.columns:
-        df['Net Amount'] = df['Net Amount'].astype(str).str.replace(',', '').str.strip()
-        df['Net Amount'] = pd.to_numeric(df['Net Amount'], errors='coerce')
-
-    # -------- إضافة أعمدة التاريخ --------
-    df['report_from_date'] = from_date
-    df['report_to_date'] = to_date
-
-    # -------- إزالة الصفوف الفارغة في الأعمدة المهمة --------
-    df = df.dropna(subset=['Net Amount'])
-
-    # -------- حفظ الملف بعد المعالجة --------
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    output_path = os.path.join(OUTPUT_FOLDER, file_name.replace(".csv", "_processed.csv"))
-    df.to_csv(output_path, index=False)
-    print(f"Processed file saved at: {output_path}")
+def _seat_columns(columns=None) -> list:
+    return [col for col in SEAT_COLUMNS if col in (columns or KEEP_COLS_SEAT)]
+
+
+def _finish_seat_inventory(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    columns = _seat_columns(columns)
+    df = df[[col for col in columns if col in df.columns]]
+    return compact_dtypes(df, "SeatInventory")
+
+
+@shared_cached(sources=_data_file)
+@parquet_cached(version=6, data_folder=DATA_FOLDER)
+def load_seat_inventory(file_name: str, columns=None) -> pd.DataFrame:
+    """
+    Load SeatInventoryAndCollectionsReport.
 
+    ``columns`` is the set of canonical columns the calling page needs
+    (defaults to ``KEEP_COLS_SEAT``); only those are parsed from the CSV.
+    """
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), SEAT_INVENTORY_SPEC, columns=_seat_columns(columns))
+    return _finish_seat_inventory(df, columns)
+
+
+def round_trip_keys(segment: pd.Series, flight_date: pd.Series) -> tuple:
+    """
+    origin, destination and round_trip_id ("<A>-<B>-<YYYY-MM-DD>" with A <= B,
+    so both directions share the key) as categoricals.
+
+    Strings are only handled once per distinct segment, city pair and day;
+    the rows only carry integer codes.
+    """
+    segment = segment.astype("category")
+    seg_codes = segment.cat.codes.to_numpy()
+
+    def per_row(codes):
+        return np.where(seg_codes >= 0, np.asarray(codes)[np.maximum(seg_codes, 0)], -1)
+
+    # ---------- استخراج Origin و Destination (مرة لكل segment) ----------
+    parts = pd.Series(segment.cat.categories.astype(str)).str.split("/")
+    origins, destinations = parts.str[0], parts.str[1]
+    origin_codes, origin_names = pd.factorize(origins)
+    destination_codes, destination_names = pd.factorize(destinations)
+
+    # الزوج مرتب (A <= B)
+    forward = origins <= destinations
+    pairs = origins.where(forward, destinations) + "-" + destinations.where(forward, origins)
+    pair_codes, pair_names = pd.factorize(pairs)
+
+    # ---------- Round-Trip ID = رقم الزوج × عدد الأيام + رقم اليوم ----------
+    day_codes, days = pd.factorize(flight_date.to_numpy(dtype="datetime64[D]"))
+    n_days = max(len(days), 1)
+    row_pairs = per_row(pair_codes).astype("int64")
+    valid = (row_pairs >= 0) & (day_codes >= 0)
+    combined = row_pairs * n_days + day_codes
+    keys = np.unique(combined[valid])
+    key_codes = np.where(valid, np.searchsorted(keys, combined), -1)
+    day_names = pd.Index(np.datetime_as_string(np.asarray(days, dtype="datetime64[D]"), unit="D"), dtype="str")
+    key_names = pair_names[keys // n_days] + "-" + day_names[keys % n_days]
+
+    return (
+        pd.Categorical.from_codes(per_row(origin_codes), categories=origin_names.astype("str")),
+        pd.Categorical.from_codes(per_row(destination_codes), categories=destination_names.astype("str")),
+        pd.Categorical.from_codes(key_codes, categories=key_names.astype("str")),
+    )
+
+
+@shared_cached(sources=_data_file)
+def load_round_trips(file_name: str) -> pd.DataFrame:
+    """
+    Seat inventory rows with the round-trip columns used by round_trip_analysis:
+    origin, destination, round_trip_id, load_factor and avg_fare_per_seat.
+    """
+    df = load_seat_inventory(file_name, columns=SEAT_COLUMNS)
+    df["origin"], df["destination"], df["round_trip_id"] = round_trip_keys(df["segment"], df["flight_date"])
+
+    # ---------- حساب Load Factor و Avg Fare ----------
+    df["load_factor"] = (df["seats_sold"] / df["seats_allocated"] * 100).fillna(0)
+    df["avg_fare_per_seat"] = (df["fare_usd"] / df["seats_sold"]).fillna(0)
     return df
 
-# def load_enplanement_report(file_name: str) -> pd.DataFrame:
-#     """
-#     Load Enplanement Report CSV, extract report dates, clean numeric columns,
-#     skip header and footer lines.
-#     """
-#     file_path = os.path.join(DATA_FOLDER, file_name)
-
-#     # -------- قراءة أول 5 أسطر لاستخراج التواريخ --------
-#     with open(file_path, 'r', encoding='utf-8') as f:
-#         header_lines = [next(f).strip() for _ in range(5)]
-
-#     from_date = None
-#     to_date = None
-#     for line in header_lines:
-#         if "From Date" in line:
-#             match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-#             if match:
-#                 from_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-#         if "To Date" in line:
-#             match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-#             if match:
-#                 to_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-
-#     # -------- قراءة البيانات مع تخطي أول 5 أسطر --------
-#     df = pd.read_csv(file_path, skiprows=5)
-
-#     # -------- حذف آخر 3 أسطر --------
-#     if len(df) > 3:
-#         df = df.iloc[:-3]
-
-#     # -------- تنظيف الأعمدة الرقمية --------
-#     numeric_cols = ['Booked Load (Adult/Infant)', 'Go Shows', 'No Recs. No Shows', 'Flown Load']
-#     for col in numeric_cols:
-#         if col in df.columns:
-#             df[col] = df[col].astype(str).str.replace(',', '').str.strip()
-#             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-#     # -------- إضافة أعمدة التاريخ --------
-#     df['report_from_date'] = from_date
-#     df['report_to_date'] = to_date
-
-#     # -------- إزالة الصفوف الفارغة في الأعمدة المهمة --------
-#     important_col = 'Flown Load' if 'Flown Load' in df.columns else None
-#     if important_col:
-#         df = df.dropna(subset=[important_col])
-
-#     # -------- حفظ الملف بعد المعالجة --------
-#     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-#     output_path = os.path.join(OUTPUT_FOLDER, file_name.replace(".csv", "_processed.csv"))
-#     df.to_csv(output_path, index=False)
-#     print(f"Processed file saved at: {output_path}")
-
-#     return df
-
-# def load_enplanement_report(file_name: str) -> pd.DataFrame:
-#     """
-#     تحميل ومعالجة ملف EnplanementReport.csv:
-#     - حذف أول 5 أسطر (رؤوس غير ضرورية)
-#     - حذف آخر 3 أسطر (ملخص أو فارغ)
-#     - تنظيف أسماء الأعمدة
-#     - تحويل الأعمدة الرقمية للقيم الصحيحة
-#     """
-#     file_path = os.path.join(DATA_FOLDER, file_name)
-
-#     # -------- قراءة البيانات مع تخطي أول 5 أسطر --------
-#     df = pd.read_csv(file_path, skiprows=5)
-
-#     # -------- حذف آخر 3 أسطر --------
-#     if len(df) > 3:
-#         df = df.iloc[:-3]
-
-#     # -------- تنظيف أسماء الأعمدة --------
-#     df.columns = df.columns.str.strip().str.replace('\n', ' ').str.replace('  ', ' ')
-
-#     # -------- إعادة تسمية الأعمدة الرقمية --------
-#     rename_map = {
-#         'Go Shows': 'go_shows',
-#         'No Shows': 'no_shows',
-#         'Flown Load': 'flown_load'
-#     }
-#     df = df.rename(columns=rename_map)
-
-#     # -------- تنظيف الأعمدة الرقمية --------
-#     numeric_cols = ['go_shows', 'no_shows', 'flown_load']
-#     for col in numeric_cols:
-#         if col in df.columns:
-#             # إزالة أي نصوص غير رقمية وتحويل للأعداد الصحيحة
-#             df[col] = pd.to_numeric(df[col].astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(0).astype(int)
-
-#     return df
-
-
-# def load_enplanement_report(file_name: str) -> pd.DataFrame:
-#     """
-#     تحميل ومعالجة ملف EnplanementReport.csv:
-#     - حذف أول 5 أسطر (رؤوس غير ضرورية)
-#     - حذف آخر 3 أسطر (ملخص أو فارغ)
-#     - تنظيف أسماء الأعمدة
-#     - تحويل الأعمدة الرقمية للقيم الصحيحة
-#     - فصل عمود Booked Load (Adult/Infant) إلى adult_booked و infant_booked
-#     """
-#     file_path = os.path.join(DATA_FOLDER, file_name)
-
-#     # -------- قراءة البيانات مع تخطي أول 5 أسطر --------
-#     df = pd.read_csv(file_path, skiprows=5)
-
-#     # -------- حذف آخر 3 أسطر --------
-#     if len(df) > 3:
-#         df = df.iloc[:-3]
-
-#     # -------- تنظيف أسماء الأعمدة --------
-#     df.columns = df.columns.str.strip().str.replace('\n', ' ').str.replace('  ', ' ')
-
-#     # -------- إعادة تسمية الأعمدة الرقمية --------
-#     rename_map = {
-#         'Go Shows': 'go_shows',
-#         'No Shows': 'no_shows',
-#         'Flown Load': 'flown_load',
-#         'Booked Load (Adult/Infant)': 'booked_load'
-#     }
-#     df = df.rename(columns=rename_map)
-
-#     # -------- فصل booked_load إلى عمودين --------
-#     if 'booked_load' in df.columns:
-#         df[['adult_booked', 'infant_booked']] = df['booked_load'].astype(str).str.split(r'\\', expand=True)
-#         df['adult_booked'] = pd.to_numeric(df['adult_booked'], errors='coerce').fillna(0).astype(int)
-#         df['infant_booked'] = pd.to_numeric(df['infant_booked'], errors='coerce').fillna(0).astype(int)
-#         df = df.drop(columns=['booked_load'])
-
-#     # -------- تنظيف الأعمدة الرقمية --------
-#     numeric_cols = ['go_shows', 'no_shows', 'flown_load']
-#     for col in numeric_cols:
-#         if col in df.columns:
-#             df[col] = pd.to_numeric(df[col].astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(0).astype(int)
-
-#     return df
-# modules/enplanement_processing.py
 
-import os
-import pandas as pd
+@shared_cached(sources=_data_file)
+@parquet_cached(version=5, data_folder=DATA_FOLDER)
+def load_employee_performance(file_name: str) -> pd.DataFrame:
+    """
+    Load PerformanaceOfSalesStaffDetail, either the system export (agent
+    group rows, "Total :" rows, one banner per month) or a flattened copy
+    with the agent on every row.
+    """
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), EMPLOYEE_PERFORMANCE_SPEC)
+    df = df.drop(columns=["To Detail"], errors="ignore")
+
+    for col in EMPLOYEE_PERFORMANCE_SPEC.numeric:
+        if col not in df.columns:
+            df[col] = 0
+
+    return compact_dtypes(df, "EmployeePerformance")
 
-DATA_FOLDER = "data"  # مسار ملفات البيانات
 
+# الملف بعد المعالجة يُحفظ في الخلفية (writes_artifact)
+@writes_artifact(DATA_FOLDER)
+@shared_cached(sources=_data_file)
+@parquet_cached(version=5, data_folder=DATA_FOLDER)
+def load_payment_report(file_name: str) -> pd.DataFrame:
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), PAYMENT_REPORT_SPEC)
+    return compact_dtypes(df, "CompanyPayment")
+
+
+@shared_cached(sources=_data_file)
+@parquet_cached(version=6, data_folder=DATA_FOLDER)
 def load_enplanement_report(file_name: str) -> pd.DataFrame:
     """
     Load and clean EnplanementReport CSV file:
-    - Skip first 5 rows (headers)
-    - Remove last 3 rows (summary/empty)
-    - Clean column names (remove newlines and extra spaces)
+    - Parse the report body (banner and footer rows are skipped by the parser)
     - Convert numeric columns to integers
     - Split 'Booked Load (Adult/Infant)' into adult_booked and infant_booked
     - Ensure Flight Number, Segment, Departure Date are clean
     """
-    file_path = os.path.join(DATA_FOLDER, file_name)
-    
-    # -------- Read CSV skipping first 5 rows --------
-    df = pd.read_csv(file_path, skiprows=5)
-    
-    # -------- Remove last 3 rows --------
-    if len(df) > 3:
-        df = df.iloc[:-3]
-    
-    # -------- Clean column names --------
-    df.columns = df.columns.str.strip().str.replace('\n', ' ', regex=True).str.replace('  ', ' ', regex=False)
-    
-    # -------- Rename columns to convenient names --------
-    rename_map = {
-        'Go Shows': 'go_shows',
-        'No Shows': 'no_shows',
-        'Flown Load': 'flown_load',
-        'Booked Load (Adult/Infant)': 'booked_load',
-        'Flight Number': 'flight_number',
-        'Segment': 'segment',
-        'Departure Date': 'departure_date'
-    }
-    df = df.rename(columns=rename_map)
-    
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), ENPLANEMENT_REPORT_SPEC)
+
     # -------- Split booked_load into adult_booked and infant_booked --------
     if 'booked_load' in df.columns:
         df[['adult_booked', 'infant_booked']] = df['booked_load'].astype(str).str.split(r'\\', expand=True)
-        df['adult_booked'] = pd.to_numeric(df['adult_booked'], errors='coerce').fillna(0).astype(int)
-        df['infant_booked'] = pd.to_numeric(df['infant_booked'], errors='coerce').fillna(0).astype(int)
+        df['adult_booked'] = parse_numeric(df['adult_booked']).fillna(0).astype(int)
+        df['infant_booked'] = parse_numeric(df['infant_booked']).fillna(0).astype(int)
         df = df.drop(columns=['booked_load'])
-    
-    # -------- Convert numeric columns --------
-    numeric_cols = ['go_shows', 'no_shows', 'flown_load']
-    for col in numeric_cols:
+
+    # -------- Clean Flight Number, Segment --------
+    for col in ['flight_number', 'segment']:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col].astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(0).astype(int)
-    
-    # -------- Clean Flight Number, Segment, Departure Date --------
-    if 'flight_number' in df.columns:
-        df['flight_number'] = df['flight_number'].astype(str).str.strip().str.replace('\n', '', regex=True)
-    if 'segment' in df.columns:
-        df['segment'] = df['segment'].astype(str).str.strip().str.replace('\n', '', regex=True)
-    if 'departure_date' in df.columns:
-        df['departure_date'] = pd.to_datetime(df['departure_date'], errors='coerce')
-    
-    return df
+            df[col] = df[col].astype(str).str.strip()
+
+    # -------- أعمدة مشتقة تستخدمها الصفحة --------
+    passenger_cols = [col for col in ['go_shows', 'adult_booked', 'infant_booked'] if col in df.columns]
+    df['total_passengers'] = df[passenger_cols].sum(axis=1)
+    if 'segment' in df.columns and 'departure_date' in df.columns:
+        df['label'] = df['segment'] + " | " + df['departure_date'].dt.strftime('%Y-%m-%d')
+
+    return compact_dtypes(df, "Enplanement")
 
 
-    
+@writes_artifact(DATA_FOLDER)
+@shared_cached(sources=_data_file)
+@parquet_cached(version=6, data_folder=DATA_FOLDER)
 def load_agent_productivity(file_name: str) -> pd.DataFrame:
-    import os, re
-    import pandas as pd
-
-    file_path = os.path.join(DATA_FOLDER, file_name)
-
-    # -------- قراءة أول 5 أسطر لاستخراج التواريخ --------
-    with open(file_path, 'r', encoding='utf-8') as f:
-        header_lines = [next(f).strip() for _ in range(5)]
-
-    from_date = None
-    to_date = None
-    for line in header_lines:
-        if "From Date" in line:
-            match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-            if match:
-                from_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-        if "To Date" in line:
-            match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
-            if match:
-                to_date = pd.to_datetime(match.group(1), dayfirst=True, errors='coerce')
-
-    # -------- قراءة البيانات مع تخطي أول 6 أسطر --------
-    df = pd.read_csv(file_path, skiprows=6)
-
-    # -------- حذف أي أعمدة فارغة بدون اسم أو كل قيمها NaN --------
-    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    df = df.dropna(axis=1, how='all')
-
-    # -------- تنظيف أسماء الأعمدة --------
-    df.columns = df.columns.str.strip().str.replace('\n', ' ').str.replace('  ', ' ')
-
-    # -------- إعادة تسمية الأعمدة لتوحيد الأسماء --------
-    rename_map = {
-        'Agent Code': 'agent_code',
-        'Agent Name': 'agent_name',
-        'Current Sale(USD)': 'current_sale_usd',
-        'YTD Sale for the Month(USD)': 'ytd_sale_month_usd',
-        'YTD Sale(USD)': 'ytd_sale_usd'
-    }
-    df = df.rename(columns=rename_map)
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), AGENT_PRODUCTIVITY_SPEC)
+
+    # -------- نسبة المبيعات الشهرية للسنوي لكل وكيل --------
+    df['monthly_percentage'] = (df['ytd_sale_month_usd'] / df['ytd_sale_usd'] * 100).round(2)
+
+    return compact_dtypes(df, "AgentProductivity")
+
+
+@shared_cached(sources=_data_file)
+@parquet_cached(version=4, data_folder=DATA_FOLDER)
+def load_invoice_summary_report(file_name: str) -> pd.DataFrame:
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), INVOICE_SUMMARY_SPEC)
+    return compact_dtypes(df, "InvoiceSummary")
+
 
-    # -------- تحويل الأعمدة الرقمية --------
-    numeric_cols = ['current_sale_usd', 'ytd_sale_month_usd', 'ytd_sale_usd']
-    for col in numeric_cols:
+@shared_cached(sources=_data_file)
+@parquet_cached(version=6, data_folder=DATA_FOLDER)
+def load_agent_user_privileges(file_name: str) -> pd.DataFrame:
+    """
+    Load AgentUserPrivileges as one row per (user, role): the user columns,
+    ``Role`` and the snapshot's ``print_date``. ``modules.role_index.role_index``
+    turns it into the user x role bitmap used by the privileges page.
+    """
+    df = parse_report(os.path.join(DATA_FOLDER, file_name), AGENT_USER_PRIVILEGES_SPEC)
+
+    # -------- ملء الفراغات في الأعمدة التعريفية --------
+    key_cols = ["Agent Code", "Agent Name", "User ID", "User Name"]
+    for col in key_cols:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', '').str.strip(), errors='coerce').fillna(0)
+            df[col] = df[col].ffill()  # fill forward القيم الفارغة بالأعلى
 
-    # -------- إضافة أعمدة التاريخ --------
-    df['report_from_date'] = from_date
-    df['report_to_date'] = to_date
+    # -------- صف لكل (مستخدم، دور) --------
+    if "Roles" in df.columns:
+        df = df.rename(columns={"Roles": "Role"})
+        df["Role"] = df["Role"].str.strip()
 
-    # -------- إزالة أي صفوف فارغة في الأعمدة الأساسية --------
-    essential_cols = ['agent_code', 'agent_name']
-    df = df.dropna(subset=[col for col in essential_cols if col in df.columns])
+        # حذف أي صفوف لا تحتوي على أي دور
+        df = df[df["Role"].fillna("") != ""]
+        df = df[[col for col in key_cols + ["Role", "print_date"] if col in df.columns]]
+        df = df.drop_duplicates(ignore_index=True)
 
-    # -------- حذف آخر 3 أسطر إذا كانت موجودة --------
-    if len(df) > 3:
-        df = df.iloc[:-3]
+    return compact_dtypes(df, "AgentUserPrivileges")
 
-    # -------- حفظ الملف بعد المعالجة --------
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    output_path = os.path.join(OUTPUT_FOLDER, file_name.replace(".csv", "_processed.csv"))
-    df.to_csv(output_path, index=False)
-    print(f"Processed file saved at: {output_path}")
 
-    return df
+# ---------- أسعار الصرف (يحدّثها قسم المالية) ----------
+USD_RATES_FILE = "usd_rates.csv"
+USD_RATES_COLUMNS = ["currency", "usd_per_unit", "rate_date", "source", "note"]
 
-def load_invoice_summary_report(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
-
-    # -------- قراءة الملف كسطور --------
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # -------- استخراج Year و Month من أول 9 أسطر --------
-    year, month = None, None
-    for line in lines[:9]:
-        if "Year" in line:
-            # إزالة أي فواصل أو نص بعد الرقم
-            year = line.split(":")[-1].strip().split(",")[0]
-        if "Month" in line:
-            month = line.split(":")[-1].strip().split(",")[0]
-
-    # -------- قراءة الجدول ابتداءً من السطر 10 --------
-    df = pd.read_csv(file_path, skiprows=9)
-
-    # -------- حذف آخر 3 أسطر --------
-    if len(df) > 3:
-        df = df.iloc[:-3, :]
-
-    # -------- تنظيف أسماء الأعمدة فوراً --------
-    df.columns = (
-        df.columns
-        .str.strip()
-        .str.replace("\n", " ")
-        .str.replace("  ", " ")
-        .str.replace('"', '')
+
+@shared_cached(sources=_data_file)
+def load_usd_rates(file_name: str) -> pd.DataFrame:
+    """
+    USD per unit of each currency, as kept by finance in ``data/usd_rates.csv``
+    (one row per currency code as the exports write it, with the date and
+    source of its rate).
+    """
+    df = pd.read_csv(os.path.join(DATA_FOLDER, file_name), dtype={"currency": "str"}, parse_dates=["rate_date"])
+    missing = [col for col in USD_RATES_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{file_name}: missing columns {missing}")
+    df["currency"] = df["currency"].str.strip()
+    duplicated = df.loc[df["currency"].duplicated(), "currency"].tolist()
+    if duplicated:
+        raise ValueError(f"{file_name}: more than one rate for {duplicated}")
+    bad = df.loc[~(df["usd_per_unit"] > 0) | df["rate_date"].isna(), "currency"].tolist()
+    if bad:
+        raise ValueError(f"{file_name}: no positive rate or no rate date for {bad}")
+    return df[USD_RATES_COLUMNS]
+
+
+# ---------- تحميل تزايدي (الصفوف الجديدة فقط) ----------
+# loader name -> (spec, columns(**kwargs), finish(df, **kwargs)) for reports that only grow at the end
+INCREMENTAL_LOADERS = {
+    "load_seat_inventory": (SEAT_INVENTORY_SPEC, _seat_columns, _finish_seat_inventory),
+}
+
+
+def _load_incremental(loader, file_names: list, **kwargs) -> list:
+    if loader.__name__ not in INCREMENTAL_LOADERS:
+        raise ValueError(f"{loader.__name__} has no incremental mode")
+    spec, columns, finish = INCREMENTAL_LOADERS[loader.__name__]
+
+    paths = [os.path.join(DATA_FOLDER, name) for name in file_names]
+    frames = load_incremental(
+        loader.__name__, paths, spec,
+        version=loader.cache_version,
+        columns=columns(**kwargs),
+        finish=lambda df: finish(df, **kwargs)
     )
+    return [frames[os.path.abspath(path)] for path in paths]
 
-    # -------- حذف الأعمدة الفارغة بالكامل --------
-    df = df.loc[:, df.columns.str.strip() != ""]
-    df = df.dropna(axis=1, how="all")
 
-    # -------- تنظيف الأعمدة الرقمية --------
-    numeric_cols = ["Invoice Total", "Fare", "Tax", "Surcharge"]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = (
-                df[col].astype(str)
-                .str.replace(",", "")          
-                .str.replace("[^0-9.-]", "", regex=True)
-                .str.strip()
-            )
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    # -------- إضافة أعمدة السنة والشهر للمعالجة الداخلية فقط --------
-    df["report_year"] = year
-    df["report_month"] = month
+# ---------- تحميل عدة ملفات (شهر لكل ملف) ----------
+PERIOD_COLS = ["report_from_date", "report_to_date"]
 
-    return df
 
-def load_agent_user_privileges(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
-    df = pd.read_csv(file_path, skiprows=4)  # حذف أول 4 أسطر
-    if len(df) > 3:
-        df = df.iloc[:-3, :]  # حذف آخر 3 أسطر
+def find_report_files(pattern: str) -> list:
+    """
+    File names (relative to DATA_FOLDER) matching ``pattern``.
+    ``pattern`` is a glob ("CompanyPaymentReport*.csv") or a sub-folder of
+    DATA_FOLDER, in which case every CSV inside it is used.
+    """
+    full_pattern = os.path.join(DATA_FOLDER, pattern)
+    if os.path.isdir(full_pattern):
+        full_pattern = os.path.join(full_pattern, "*.csv")
+    paths = sorted(p for p in glob.glob(full_pattern) if os.path.isfile(p))
+    return [os.path.relpath(p, DATA_FOLDER) for p in paths]
 
-    # إعادة تسمية الأعمدة
-    df.columns = ['Agent Code', 'Agent Name', 'User ID', 'User Name', 'Role']
 
-    # ملء الفراغات في الأعمدة التعريفية
-    df[['Agent Code', 'Agent Name', 'User ID', 'User Name']] = df[['Agent Code', 'Agent Name', 'User ID', 'User Name']].ffill()
+def report_period(df: pd.DataFrame):
+    """
+    (start, end) of the period a report covers: the From Date / To Date banner,
+    else the Year / Month banner, else the range of its first date column.
+    """
+    if all(col in df.columns for col in PERIOD_COLS) and len(df):
+        return df["report_from_date"].min(), df["report_to_date"].max()
 
-    # حذف الصفوف بدون Role
-    df = df[df['Role'].notna()].reset_index(drop=True)
+    if "report_year" in df.columns and "report_month" in df.columns and len(df):
+        start = pd.to_datetime(f"{df['report_year'].iloc[0]}-{df['report_month'].iloc[0]}-01", errors="coerce")
+        return start, start + pd.offsets.MonthEnd(0)
 
-    return df
-import os
-import pandas as pd
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]) and df[col].notna().any():
+            return df[col].min(), df[col].max()
 
-def load_agent_user_privileges(file_name: str) -> pd.DataFrame:
-    file_path = os.path.join(DATA_FOLDER, file_name)
+    return pd.NaT, pd.NaT
 
-    # -------- قراءة الملف كسطور --------
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
 
-    # -------- حذف أول 4 أسطر --------
-    data_lines = lines[4:]
+def _drop_covered_periods(frames: list) -> list:
+    """
+    Drop reports whose period is inside the period of a newer report
+    (a re-run of the same month, or a month-to-date run superseded by the full month).
+    Returns the (file name, frame, start, end) of the kept reports, oldest
+    period first, and the names of the skipped ones.
+    """
+    kept, skipped = [], []
+    frames = sorted(frames, key=lambda frame: (frame[3], frame[2], frame[4]))
+    for i, (name, df, start, end, mtime) in enumerate(frames):
+        covered = any(
+            pd.notna(start) and pd.notna(end)
+            and o_start <= start and end <= o_end
+            and (o_end, o_start, o_mtime) > (end, start, mtime)
+            for j, (_, _, o_start, o_end, o_mtime) in enumerate(frames)
+            if j != i
+        )
+        if covered:
+            skipped.append(name)
+        else:
+            kept.append((name, df, start, end))
+    return kept, skipped
 
-    # -------- تحويل السطور إلى DataFrame --------
-    import io
-    data_str = "".join(data_lines)
-    df = pd.read_csv(io.StringIO(data_str))
 
-    # -------- حذف آخر 3 أسطر --------
-    if len(df) > 3:
-        df = df.iloc[:-3, :]
+def _overlap_clusters(periods: list) -> list:
+    """
+    Cluster id of every (start, end) period: periods that intersect, directly
+    or through other periods, share one. A period without dates is alone.
+    """
+    clusters = [None] * len(periods)
+    dated = sorted((i for i, (start, end) in enumerate(periods) if pd.notna(start) and pd.notna(end)),
+                   key=lambda i: periods[i][0])
+    cluster, cluster_end = -1, None
+    for i in dated:
+        start, end = periods[i]
+        if cluster_end is None or start > cluster_end:
+            cluster, cluster_end = cluster + 1, end
+        else:
+            cluster_end = max(cluster_end, end)
+        clusters[i] = cluster
+    for i, value in enumerate(clusters):
+        if value is None:
+            cluster += 1
+            clusters[i] = cluster
+    return clusters
 
-    # -------- تنظيف أسماء الأعمدة --------
-    df.columns = df.columns.str.strip().str.replace("\n", " ").str.replace('"', '')
-    
-    # -------- حذف الأعمدة الفارغة بالكامل --------
-    df = df.loc[:, df.columns.str.strip() != ""]
-    df = df.dropna(axis=1, how="all")
 
-    # -------- ملء الفراغات في الأعمدة التعريفية --------
-    key_cols = ["Agent Code", "Agent Name", "User ID", "User Name"]
-    for col in key_cols:
-        if col in df.columns:
-            df[col] = df[col].ffill()  # fill forward القيم الفارغة بالأعلى
+def merge_reports(frames: list, label: str) -> pd.DataFrame:
+    """
+    Merge (file name, frame, start, end, mtime) reports into one frame.
 
-    # -------- دمج Roles لكل شخص --------
-    if "Roles" in df.columns:
-        df = df.groupby(key_cols, dropna=False)["Roles"] \
-               .apply(lambda x: "\n".join(str(r).strip() for r in x if pd.notna(r))) \
-               .reset_index()
+    Reports covered by a newer one are skipped (their names are kept in
+    ``df.attrs["skipped_reports"]``). A row repeated inside one report is
+    real data; a row repeated across reports whose periods overlap is kept
+    once (the copy from the newest report). Reports of disjoint periods keep
+    all their rows, even rows identical to another period's.
+    """
+    kept, skipped = _drop_covered_periods(frames)
+    clusters = _overlap_clusters([(start, end) for _, _, start, end in kept])
+    parts = []
+    for (name, frame, _, _), cluster in zip(kept, clusters):
+        # categories differ from file to file: back to plain values before concat
+        categorical = frame.select_dtypes("category").columns
+        frame = frame.astype({col: frame[col].cat.categories.dtype for col in categorical})
+        parts.append(frame.assign(_source=name, _cluster=cluster))
+    df = pd.concat(parts, ignore_index=True)
+
+    # -------- حذف المكرر بين التقارير المتداخلة فقط --------
+    data_cols = [col for col in df.columns if col not in PERIOD_COLS + ["_source", "_cluster"]]
+    df["_copy"] = df.groupby(data_cols + ["_source"], dropna=False, sort=False).cumcount()
+    df = df.drop_duplicates(subset=data_cols + ["_cluster", "_copy"], keep="last")
+    df = df.drop(columns=["_source", "_cluster", "_copy"]).reset_index(drop=True)
+
+    df = compact_dtypes(df, f"{label} ({len(kept)} files)")
+    df.attrs["skipped_reports"] = skipped
+    return df
 
-        # حذف أي صفوف لا تحتوي على أي دور
-        df = df[df["Roles"].str.strip() != ""].reset_index(drop=True)
 
-    return df
+@shared_cached(sources=_data_files)
+def load_report_files(loader, pattern: str, max_workers=None, incremental=False, **kwargs) -> pd.DataFrame:
+    """
+    Load every report matching ``pattern`` with ``loader`` (one of the
+    ``load_*`` functions above) and return them as one frame.
+
+    The files are parsed concurrently in a process pool, each row carries the
+    period of its report in ``report_from_date`` / ``report_to_date``, reports
+    covered by a newer one are skipped and rows repeated across reports with
+    overlapping periods are kept once (``merge_reports``).
+
+    ``incremental=True`` (loaders in ``INCREMENTAL_LOADERS`` only) keeps a
+    watermark per file and only parses the rows appended since the last load.
+    """
+    file_names = find_report_files(pattern)
+    if not file_names:
+        raise FileNotFoundError(f"No report files match '{pattern}' in '{DATA_FOLDER}'")
+
+    if incremental:
+        results = _load_incremental(loader, file_names, **kwargs)
+    elif len(file_names) == 1:
+        results = [loader(file_names[0], **kwargs)]
+    else:
+        workers = min(len(file_names), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(loader, name, **kwargs) for name in file_names]
+            results = [future.result() for future in futures]
+
+    frames = []
+    for name, df in zip(file_names, results):
+        start, end = report_period(df)
+        df = df.copy(deep=False)
+        if not all(col in df.columns for col in PERIOD_COLS):
+            df["report_from_date"] = start
+            df["report_to_date"] = end
+        mtime = os.path.getmtime(os.path.join(DATA_FOLDER, name))
+        frames.append((name, df, start, end, mtime))
+
+    if len(frames) == 1:
+        return frames[0][1]
+
+    # -------- دمج الفترات وحذف المكرر --------
+    return merge_reports(frames, pattern)
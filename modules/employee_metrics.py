@@ -0,0 +1,61 @@
+"""
+Per-employee metrics for the employee performance page.
+
+One groupby over (agent_name, user_name) per dataset gives the sums every
+chart needs; the table of an agent selection is a slice of it (or, for all
+agents, a regroup of that small table) and is kept per selection. Top-N
+charts take ``top_n`` of it: ``np.argpartition`` then a sort of the N rows
+only, so moving a slider costs a slice.
+"""
+import numpy as np
+import pandas as pd
+
+from modules.shared_cache import per_dataset
+
+ALL_AGENTS = "All Agents"
+
+SUMS = ["reservations", "pax", "total_charges", "total_discount"]
+
+
+def _ratios(table: pd.DataFrame) -> pd.DataFrame:
+    charges = table["total_charges"].where(table["total_charges"] != 0)
+    pax = table["pax"].where(table["pax"] != 0)
+    return table.assign(
+        discount_ratio=(table["total_discount"] / charges * 100).fillna(0),
+        revenue_per_pax=(table["total_charges"] / pax).fillna(0)
+    )
+
+
+class EmployeeMetrics:
+    def __init__(self, df: pd.DataFrame):
+        # -------- تجميع واحد لكل (وكيل، موظف) --------
+        self.by_agent = df.groupby(["agent_name", "user_name"], observed=True, sort=True, dropna=False)[SUMS].sum().reset_index()
+        self._tables = {}
+
+    def table(self, agent=ALL_AGENTS) -> pd.DataFrame:
+        """One row per employee of ``agent`` (all agents by default) with sums and ratios."""
+        table = self._tables.get(agent)
+        if table is None:
+            if agent == ALL_AGENTS:
+                table = self.by_agent.groupby("user_name", observed=True, sort=True, dropna=False)[SUMS].sum().reset_index()
+            else:
+                table = self.by_agent.loc[self.by_agent["agent_name"] == agent, ["user_name"] + SUMS]
+            table = _ratios(table.reset_index(drop=True))
+            self._tables[agent] = table
+        return table
+
+
+def top_n(table: pd.DataFrame, column: str, n: int) -> pd.DataFrame:
+    """The ``n`` rows with the largest ``column``, largest first."""
+    values = table[column].to_numpy()
+    if n < len(values):
+        positions = np.argpartition(-values, n - 1)[:n]
+    else:
+        positions = np.arange(len(values))
+    positions = positions[np.argsort(-values[positions], kind="stable")]
+    return table.take(positions)
+
+
+def employee_metrics(df: pd.DataFrame) -> EmployeeMetrics:
+    """The metrics of ``df``, aggregated on first use."""
+    return per_dataset(df, EmployeeMetrics, "agent_name")
@@ -1,64 +1,12 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from modules.employee_metrics import ALL_AGENTS, employee_metrics, top_n
 
-def show(df: pd.DataFrame):
-    st.title("👨‍💼 Employee Performance Dashboard")
-
-    # ------------------ Agent Selection ------------------
-    agent_names = df['agent_name'].dropna().unique().tolist()
-    agent_options = ["All Agents"] + sorted(agent_names)
-    selected_agent = st.selectbox("Select Agent", agent_options)
-
-    # ------------------ Filter by Agent ------------------
-    if selected_agent == "All Agents":
-        agent_filtered_df = df.copy()
-    else:
-        agent_filtered_df = df[df['agent_name'] == selected_agent]
-
-    # ------------------ Employee Selection ------------------
-    user_names = agent_filtered_df['user_name'].dropna().unique().tolist()
-    user_options = ["All Employees"] + sorted(user_names)
-    selected_user = st.selectbox("Select Employee", user_options)
-
-    # ------------------ Filter by Employee ------------------
-    if selected_user == "All Employees":
-        filtered_df = agent_filtered_df.copy()
-    else:
-        filtered_df = agent_filtered_df[agent_filtered_df['user_name'] == selected_user]
-
-    # ------------------ Display Table ------------------
-    st.subheader("📋 Employee Data")
-    st.dataframe(
-        filtered_df[['agent_name', 'user_name', 'reservations', 'pax', 'total_charges', 'total_discount']],
-        use_container_width=True
-    )
-
-    # ------------------ Totals ------------------
-    total_reservations = int(filtered_df['reservations'].sum())
-    total_pax = int(filtered_df['pax'].sum())
-    total_charges = round(filtered_df['total_charges'].sum(), 2)
-    total_discount = round(filtered_df['total_discount'].sum(), 2)
-    total_employees = filtered_df['user_name'].nunique()  # عدد الموظفين الفريدين
-
-    st.subheader("📊 Totals")
-    col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Total Reservations", f"{total_reservations:,}")
-    col2.metric("Total PAX", f"{total_pax:,}")
-    col3.metric("Total Revenue ($)", f"{total_charges:,.2f}")
-    col4.metric("Total Discounts ($)", f"{total_discount:,.2f}")
-    col5.metric("Employees Contributed", f"{total_employees:,}")
-
-    # ------------------ Top N Sliders ------------------
-    top_n_reservations = st.slider("Top N Employees by Reservations", min_value=1, max_value=20, value=5)
-    top_n_revenue = st.slider("Top N Employees by Revenue", min_value=1, max_value=20, value=5)
-    top_n_multi = st.slider("Top N Employees for Combined Metrics Chart", min_value=1, max_value=20, value=5)
-
-    # ------------------ Top N by Reservations ------------------
-    ranking_df = filtered_df.groupby("user_name", as_index=False).agg({
-        'reservations': 'sum',
-        'pax': 'sum'
-    }).sort_values(by="reservations", ascending=False).head(top_n_reservations)
+@st.fragment
+def reservations_chart(metrics: pd.DataFrame):
+    top_n_reservations = st.slider("Top N Employees by Reservations", min_value=1, max_value=20, value=5, key="employee_top_n_reservations")
+    ranking_df = top_n(metrics, "reservations", top_n_reservations)
 
     total_pax_top_res = ranking_df['pax'].sum()
     st.write(f"Total PAX for top {top_n_reservations} employees (by Reservations): {total_pax_top_res:,}")
@@ -77,11 +25,13 @@ def show(df: pd.DataFrame):
     fig_reservations.update_layout(yaxis={'categoryorder':'total ascending'}, showlegend=False)
     st.plotly_chart(fig_reservations, use_container_width=True)
 
+
+@st.fragment
+def revenue_charts(metrics: pd.DataFrame):
+    top_n_revenue = st.slider("Top N Employees by Revenue", min_value=1, max_value=20, value=5, key="employee_top_n_revenue")
+
     # ------------------ Top N by Revenue (Treemap) ------------------
-    revenue_df = filtered_df.groupby("user_name", as_index=False).agg({
-        'total_charges': 'sum',
-        'pax': 'sum'
-    }).sort_values(by="total_charges", ascending=False).head(top_n_revenue)
+    revenue_df = top_n(metrics, "total_charges", top_n_revenue)
 
     total_pax_top_rev = revenue_df['pax'].sum()
     st.write(f"Total PAX for top {top_n_revenue} employees (by Revenue): {total_pax_top_rev:,}")
@@ -107,12 +57,11 @@ def show(df: pd.DataFrame):
     )
     st.plotly_chart(fig_revenue_pie, use_container_width=True)
 
-    # ------------------ Top N Combined Metrics (Grouped Bar) ------------------
-    multi_df = filtered_df.groupby("user_name", as_index=False).agg({
-        'reservations': 'sum',
-        'total_charges': 'sum',
-        'pax': 'sum'
-    }).sort_values('reservations', ascending=False).head(top_n_multi)
+
+@st.fragment
+def combined_metrics_chart(metrics: pd.DataFrame):
+    top_n_multi = st.slider("Top N Employees for Combined Metrics Chart", min_value=1, max_value=20, value=5, key="employee_top_n_multi")
+    multi_df = top_n(metrics, "reservations", top_n_multi)
 
     total_pax_top_multi = multi_df['pax'].sum()
     st.write(f"Total PAX for top {top_n_multi} employees (Combined Metrics): {total_pax_top_multi:,}")
@@ -127,3 +76,60 @@ def show(df: pd.DataFrame):
         title="Top Employees: Combined Metrics"
     )
     st.plotly_chart(fig_multi, use_container_width=True)
+
+
+def show(df: pd.DataFrame):
+    st.title("👨‍💼 Employee Performance Dashboard")
+
+    # ------------------ Agent Selection ------------------
+    agent_names = df['agent_name'].dropna().unique().tolist()
+    agent_options = [ALL_AGENTS] + sorted(agent_names)
+    selected_agent = st.selectbox("Select Agent", agent_options)
+
+    # ------------------ Filter by Agent ------------------
+    if selected_agent == ALL_AGENTS:
+        agent_filtered_df = df
+    else:
+        agent_filtered_df = df[df['agent_name'] == selected_agent]
+
+    # ------------------ Employee Selection ------------------
+    user_names = agent_filtered_df['user_name'].dropna().unique().tolist()
+    user_options = ["All Employees"] + sorted(user_names)
+    selected_user = st.selectbox("Select Employee", user_options)
+
+    # ------------------ Filter by Employee ------------------
+    # جدول الموظفين محسوب مرة لكل وكيل، اختيار موظف = صف منه
+    metrics = employee_metrics(df).table(selected_agent)
+    if selected_user == "All Employees":
+        filtered_df = agent_filtered_df
+    else:
+        filtered_df = agent_filtered_df[agent_filtered_df['user_name'] == selected_user]
+        metrics = metrics[metrics['user_name'] == selected_user]
+
+    # ------------------ Display Table ------------------
+    st.subheader("📋 Employee Data")
+    st.dataframe(
+        filtered_df[['agent_name', 'user_name', 'reservations', 'pax', 'total_charges', 'total_discount']],
+        use_container_width=True
+    )
+
+    # ------------------ Totals ------------------
+    total_reservations = int(metrics['reservations'].sum())
+    total_pax = int(metrics['pax'].sum())
+    total_charges = round(metrics['total_charges'].sum(), 2)
+    total_discount = round(metrics['total_discount'].sum(), 2)
+    total_employees = metrics['user_name'].nunique()  # عدد الموظفين الفريدين
+
+    st.subheader("📊 Totals")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Total Reservations", f"{total_reservations:,}")
+    col2.metric("Total PAX", f"{total_pax:,}")
+    col3.metric("Total Revenue ($)", f"{total_charges:,.2f}")
+    col4.metric("Total Discounts ($)", f"{total_discount:,.2f}")
+    col5.metric("Employees Contributed", f"{total_employees:,}")
+
+    # ------------------ Top N Charts ------------------
+    # كل مخطط Fragment مستقل له slider خاص به: تحريكه يعيد رسم المخطط فقط من جدول metrics المحسوب
+    reservations_chart(metrics)
+    revenue_charts(metrics)
+    combined_metrics_chart(metrics)
@@ -2,77 +2,44 @@
 
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder
+from modules.paged_grid import paged_grid
+from modules.shared_cache import per_dataset
 import plotly.express as px
 
-def show(df: pd.DataFrame):
-    """
-    Passenger Enplanement Dashboard
-    - Displays the Enplanement DataTable with AgGrid
-    - Shows KPIs summary
-    - Plots Top N & Bottom N flights by Segment + Departure Date
-    """
+class PassengerRanking:
+    """Total passengers per label, ordered both ways once per dataset: Top/Bottom N are slices."""
 
-    st.title("🛫 Passenger Enplanement")
+    def __init__(self, df: pd.DataFrame):
+        summary = df.groupby('label', observed=True)['total_passengers'].sum().reset_index()
+        # stable sorts keep the same ties as nlargest / nsmallest
+        self.largest = summary.sort_values('total_passengers', ascending=False, kind='stable', ignore_index=True)
+        self.smallest = summary.sort_values('total_passengers', kind='stable', ignore_index=True)
 
-    # -------- Clean column names --------
-    df.columns = df.columns.str.strip().str.replace('\n', ' ', regex=True).str.replace('  ', ' ', regex=False)
 
-    # -------- Convert numeric columns --------
-    numeric_cols = ['go_shows', 'no_shows', 'flown_load', 'adult_booked', 'infant_booked']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+def passenger_ranking(df: pd.DataFrame) -> PassengerRanking:
+    return per_dataset(df, PassengerRanking, 'total_passengers')
 
-    # -------- Display AgGrid table --------
-    st.subheader("📋 Enplanement Data Table")
-    gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_side_bar()
-    gb.configure_default_column(resizable=True, filter=True, sortable=True, editable=False, wrapText=True, minWidth=120)
-    gb.configure_grid_options(headerHeight=40)
-    grid_options = gb.build()
-
-    AgGrid(
-        df,
-        gridOptions=grid_options,
+
+# الجدول Fragment: البحث والترتيب وتغيير الصفحة لا تعيد تشغيل الصفحة
+@st.fragment
+def enplanement_table(df: pd.DataFrame):
+    paged_grid(
+        df.drop(columns=['total_passengers', 'label'], errors='ignore'),
+        key="enplanement_grid",
+        default_column={'minWidth': 120},
+        side_bar=True,
         height=400,
         width="100%",
         enable_enterprise_modules=True,
         fit_columns_on_grid_load=True
     )
 
-    # -------- KPIs --------
-    st.subheader("💡 KPIs Summary")
-    total_go_shows = df['go_shows'].sum() if 'go_shows' in df.columns else 0
-    total_no_shows = df['no_shows'].sum() if 'no_shows' in df.columns else 0
-    total_flown = df['flown_load'].sum() if 'flown_load' in df.columns else 0
-    total_adults = df['adult_booked'].sum() if 'adult_booked' in df.columns else 0
-    total_infants = df['infant_booked'].sum() if 'infant_booked' in df.columns else 0
-
-    col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Go Shows", f"{total_go_shows}")
-    col2.metric("No Shows", f"{total_no_shows}")
-    col3.metric("Flown Load", f"{total_flown}")
-    col4.metric("Booked Adults", f"{total_adults}")
-    col5.metric("Booked Infants", f"{total_infants}")
 
-    # -------- Prepare total passengers and labels --------
-    if 'segment' in df.columns and 'departure_date' in df.columns:
-        df['total_passengers'] = df[['go_shows', 'adult_booked', 'infant_booked']].sum(axis=1)
-        df['label'] = df['segment'] + " | " + df['departure_date'].dt.strftime('%Y-%m-%d')
-        summary = df.groupby('label')['total_passengers'].sum().reset_index()
-    else:
-        st.warning("Columns 'segment' and/or 'departure_date' not found in dataset.")
-        return
-
-    # -------- Top N and Bottom N sliders --------
-    st.subheader("⚖️ Top/Bottom N Flights Settings")
-    top_n = st.slider("Top N Flights (Highest Passengers)", min_value=1, max_value=20, value=5)
-    bottom_n = st.slider("Bottom N Flights (Lowest Passengers)", min_value=1, max_value=20, value=5)
-
-    # -------- Plot: Top N Flights --------
-    top_summary = summary.nlargest(top_n, 'total_passengers')
+# كل مخطط Fragment مستقل: تحريك الـ slider يعيد تشغيل المخطط فقط وليس الصفحة كلها
+@st.fragment
+def top_flights_chart(ranking: PassengerRanking):
+    top_n = st.slider("Top N Flights (Highest Passengers)", min_value=1, max_value=20, value=5, key="enplanement_top_n")
+    top_summary = ranking.largest.head(top_n)
     st.subheader(f"📈 Top {top_n} Flights by Total Passengers")
     fig_top = px.bar(
         top_summary,
@@ -87,8 +54,11 @@ def show(df: pd.DataFrame):
     fig_top.update_layout(yaxis={'categoryorder':'total ascending'})
     st.plotly_chart(fig_top, use_container_width=True)
 
-    # -------- Plot: Bottom N Flights --------
-    bottom_summary = summary.nsmallest(bottom_n, 'total_passengers')
+
+@st.fragment
+def bottom_flights_chart(ranking: PassengerRanking):
+    bottom_n = st.slider("Bottom N Flights (Lowest Passengers)", min_value=1, max_value=20, value=5, key="enplanement_bottom_n")
+    bottom_summary = ranking.smallest.head(bottom_n)
     st.subheader(f"📉 Bottom {bottom_n} Flights by Total Passengers")
     fig_bottom = px.bar(
         bottom_summary,
@@ -102,3 +72,44 @@ def show(df: pd.DataFrame):
     )
     fig_bottom.update_layout(yaxis={'categoryorder':'total ascending'})
     st.plotly_chart(fig_bottom, use_container_width=True)
+
+
+def show(df: pd.DataFrame):
+    """
+    Passenger Enplanement Dashboard
+    - Displays the Enplanement DataTable with AgGrid
+    - Shows KPIs summary
+    - Plots Top N & Bottom N flights by Segment + Departure Date
+    """
+
+    st.title("🛫 Passenger Enplanement")
+
+    # -------- Display AgGrid table --------
+    st.subheader("📋 Enplanement Data Table")
+    enplanement_table(df)
+
+    # -------- KPIs --------
+    st.subheader("💡 KPIs Summary")
+    total_go_shows = df['go_shows'].sum() if 'go_shows' in df.columns else 0
+    total_no_shows = df['no_shows'].sum() if 'no_shows' in df.columns else 0
+    total_flown = df['flown_load'].sum() if 'flown_load' in df.columns else 0
+    total_adults = df['adult_booked'].sum() if 'adult_booked' in df.columns else 0
+    total_infants = df['infant_booked'].sum() if 'infant_booked' in df.columns else 0
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Go Shows", f"{total_go_shows}")
+    col2.metric("No Shows", f"{total_no_shows}")
+    col3.metric("Flown Load", f"{total_flown}")
+    col4.metric("Booked Adults", f"{total_adults}")
+    col5.metric("Booked Infants", f"{total_infants}")
+
+    # -------- Total passengers per label (columns added by the loader) --------
+    if 'label' not in df.columns:
+        st.warning("Columns 'segment' and/or 'departure_date' not found in dataset.")
+        return
+    ranking = passenger_ranking(df)
+
+    # -------- Top N and Bottom N Flights --------
+    st.subheader("⚖️ Top/Bottom N Flights Settings")
+    top_flights_chart(ranking)
+    bottom_flights_chart(ranking)
@@ -0,0 +1,117 @@
+"""
+Persistent columnar cache for the report loaders.
+
+Every ``load_*`` function in ``modules.data_loader`` is wrapped with
+``parquet_cached``. The first call parses the raw CSV as usual and stores the
+cleaned frame as a Parquet file under ``cache/frames``; later calls (every
+Streamlit rerun) read that file back with a memory-mapped columnar read.
+
+The cache key is built from:
+- the source file path, size and modification time
+- a content hash of the source file
+- the loader name and its ``version`` (bump it whenever the cleaning changes)
+- any extra loader arguments
+"""
+import functools
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (required by pandas for parquet I/O)
+except ImportError:  # pragma: no cover - the cache is simply skipped
+    pyarrow = None
+
+CACHE_FOLDER = os.path.join("cache", "frames")
+
+# (path, size, mtime_ns) -> content hash, so unchanged files are not re-hashed on every rerun
+_content_hashes = {}
+
+
+def file_fingerprint(path: str) -> dict:
+    """Return size, mtime and content hash of ``path``."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    digest = _content_hashes.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _content_hashes[memo_key] = digest
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest}
+
+
+def _cache_paths(loader_name: str, version: int, path: str, args, kwargs):
+    """Return (entry path, prefix shared by every entry of the same source)."""
+    source = json.dumps(
+        {"path": os.path.abspath(path), "args": repr(args), "kwargs": repr(sorted(kwargs.items()))},
+        sort_keys=True,
+    )
+    source_id = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+    key = json.dumps(
+        {"loader": loader_name, "version": version, "source": source, "file": file_fingerprint(path)},
+        sort_keys=True,
+    )
+    key_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    prefix = f"{loader_name}-{source_id}-"
+    return os.path.join(CACHE_FOLDER, f"{prefix}{key_id}.parquet"), prefix
+
+
+def _write_entry(df: pd.DataFrame, entry_path: str, prefix: str):
+    """Atomically write ``df`` and drop stale entries of the same source."""
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, entry_path)
+    except (ValueError, TypeError, pyarrow.ArrowException):
+        # -------- frames pyarrow cannot encode (mixed object columns) are just not cached --------
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    for name in os.listdir(CACHE_FOLDER):
+        stale = os.path.join(CACHE_FOLDER, name)
+        if name.startswith(prefix) and name.endswith(".parquet") and stale != entry_path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def parquet_cached(version: int, data_folder: str):
+    """
+    Decorate a ``load_*(file_name, ...)`` function with the on-disk Parquet cache.
+
+    ``data_folder`` is the folder ``file_name`` is resolved against.
+    """
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(file_name, *args, **kwargs):
+            path = os.path.join(data_folder, file_name)
+            if pyarrow is None or not os.path.isfile(path):
+                return loader(file_name, *args, **kwargs)
+
+            entry_path, prefix = _cache_paths(loader.__name__, version, path, args, kwargs)
+            if os.path.exists(entry_path):
+                try:
+                    return pd.read_parquet(entry_path, memory_map=True)
+                except (OSError, ValueError, pyarrow.ArrowException):
+                    pass  # corrupted entry: rebuild it below
+
+            df = loader(file_name, *args, **kwargs)
+            _write_entry(df, entry_path, prefix)
+            return df
+
+        wrapper.cache_version = version
+        return wrapper
+
+    return decorator
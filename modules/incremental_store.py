@@ -0,0 +1,232 @@
+"""
+Incremental (append-only) columnar store for reports that grow in place.
+
+Daily exports such as SeatInventoryAndCollectionsReport only gain rows at the
+end of the body. Instead of re-parsing the whole history on every refresh,
+each source file keeps a watermark in ``manifest.json``:
+
+- ``offset``: byte offset where the rows parsed so far end (the footer start)
+- ``head_len`` / ``head_sha1``: banner + header bytes, they must not change
+- ``tail_sha1``: hash of the last bytes before ``offset``, a cheap check that
+  the history before the watermark is still the same
+- ``size`` / ``mtime_ns``: an unchanged file is not even opened
+- ``last_date``: newest value of the report's first date column
+
+Only the bytes after ``offset`` are read and parsed; their rows are written as
+a new Parquet part next to the existing ones. When a file has more than one
+part they are merged once and written back as a single compacted part, so
+later loads read one file and do not re-merge the history. A new file is
+parsed and added as its own part. A file that was removed, shrank or changed
+before its watermark makes the whole store rebuild from scratch.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from modules.report_parser import ReportSpec, parse_report_text, report_layout
+
+STORE_FOLDER = os.path.join("cache", "incremental")
+
+# Bytes before the watermark that are re-hashed to detect edits of the history
+TAIL_CHECK_BYTES = 64 * 1024
+
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _store_folder(store_name: str, spec: ReportSpec, version: int, columns) -> str:
+    key = json.dumps({"spec": spec.name, "version": version, "columns": columns}, sort_keys=True)
+    return os.path.join(STORE_FOLDER, f"{store_name}-{_sha1(key.encode('utf-8'))[:12]}")
+
+
+def _read_manifest(folder: str) -> dict:
+    try:
+        with open(os.path.join(folder, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def _write_atomic(path: str, write):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(folder: str, manifest: dict):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    _write_atomic(os.path.join(folder, "manifest.json"), write)
+
+
+def _can_append(path: str, entry: dict, stat) -> bool:
+    """True when ``path`` only grew after its watermark."""
+    offset = entry["offset"]
+    if stat.st_size < offset:
+        return False
+    with open(path, "rb") as f:
+        if _sha1(f.read(entry["head_len"])) != entry["head_sha1"]:
+            return False
+        tail_start = max(entry["head_len"], offset - TAIL_CHECK_BYTES)
+        f.seek(tail_start)
+        return _sha1(f.read(offset - tail_start)) == entry["tail_sha1"]
+
+
+def _parse_from(path: str, spec: ReportSpec, columns, entry=None):
+    """
+    Parse ``path`` from its watermark (the whole body when ``entry`` is None).
+    Returns (frame or None, new watermark entry).
+    """
+    with open(path, "rb") as f:
+        head = f.read(entry["head_len"]) if entry else b""
+        start = entry["offset"] if entry else 0
+        f.seek(start)
+        raw = f.read()
+
+    # -------- نص التقرير = البانر + الهيدر + الصفوف الجديدة فقط --------
+    head_text = head.decode("utf-8")
+    text = head_text + raw.decode("utf-8")
+    _, header_end, body_end = report_layout(text, spec)
+    head_len = entry["head_len"] if entry else len(text[:header_end].encode("utf-8"))
+    offset = start + len(text[len(head_text):body_end].encode("utf-8"))
+
+    df = None
+    if entry is None or body_end > header_end:
+        df = parse_report_text(text[:body_end], spec, columns)
+
+    with open(path, "rb") as f:
+        head_bytes = f.read(head_len)
+        tail_start = max(head_len, offset - TAIL_CHECK_BYTES)
+        f.seek(tail_start)
+        tail_bytes = f.read(offset - tail_start)
+
+    stat = os.stat(path)
+    new_entry = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "offset": offset,
+        "head_len": head_len,
+        "head_sha1": _sha1(head_bytes),
+        "tail_sha1": _sha1(tail_bytes),
+        "last_date": entry["last_date"] if entry else None,
+        "parts": list(entry["parts"]) if entry else [],
+        "next_part": entry.get("next_part", len(entry["parts"])) if entry else 0,
+    }
+    return df, new_entry
+
+
+def _new_part(path: str, entry: dict) -> str:
+    """File name of the next part of ``path`` (never the name of an existing part)."""
+    part = f"{_sha1(path.encode('utf-8'))[:8]}-{entry['next_part']:05d}.parquet"
+    entry["next_part"] += 1
+    return part
+
+
+def _read_parts(folder: str, parts: list, finish=None) -> pd.DataFrame:
+    """
+    The parts of one file as one frame. Parts were compacted one by one (a
+    small appended part keeps text where the first part has categories, or
+    a narrower int), so ``finish`` is applied again to the concatenation.
+    """
+    frames = [pd.read_parquet(os.path.join(folder, part), memory_map=True) for part in parts]
+    if len(frames) == 1:
+        return frames[0]
+    if not frames:
+        return pd.DataFrame()
+    # every part has its own categories: give them the union so concat keeps the category dtype
+    for col in frames[0].select_dtypes("category").columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = union_categoricals([frame[col] for frame in frames]).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    df = pd.concat(frames, ignore_index=True)
+    return finish(df) if finish is not None else df
+
+
+def load_incremental(store_name: str, paths: list, spec: ReportSpec, version: int,
+                     columns=None, finish=None) -> dict:
+    """
+    Return {path: frame} for ``paths``, parsing only what was appended since the last call.
+
+    ``finish(df)`` is applied to every newly parsed block before it is stored
+    (projection, dtype compaction ...) and to the parts of a file read back
+    together, so an appended file has the same dtypes as a freshly parsed one.
+
+    Each frame's ``attrs["incremental"]`` holds the rows parsed for it in this
+    call and whether the store was rebuilt.
+    """
+    folder = _store_folder(store_name, spec, version, columns)
+    files = _read_manifest(folder)["files"]
+    paths = [os.path.abspath(p) for p in paths]
+
+    # -------- ملف حُذف أو تغيّر قبل الـ watermark: إعادة بناء كاملة --------
+    rebuild = any(p not in paths for p in files)
+    pending = []
+    for path in paths:
+        stat = os.stat(path)
+        entry = files.get(path)
+        if entry is None:
+            pending.append((path, None))
+        elif (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+            continue
+        elif _can_append(path, entry, stat):
+            pending.append((path, entry))
+        else:
+            rebuild = True
+            break
+
+    if rebuild:
+        shutil.rmtree(folder, ignore_errors=True)
+        files = {}
+        pending = [(path, None) for path in paths]
+    os.makedirs(folder, exist_ok=True)
+
+    # -------- parse only the new bytes of each file --------
+    new_rows = dict.fromkeys(paths, 0)
+    for path, entry in pending:
+        df, new_entry = _parse_from(path, spec, columns, entry)
+        if df is not None and len(df):
+            if finish is not None:
+                df = finish(df)
+            part = _new_part(path, new_entry)
+            _write_atomic(os.path.join(folder, part), df.to_parquet)
+            new_entry["parts"].append(part)
+
+            date_col = spec.dates[0] if spec.dates else None
+            if date_col in df.columns and df[date_col].notna().any():
+                last_dates = [df[date_col].max()]
+                if new_entry["last_date"]:
+                    last_dates.append(pd.Timestamp(new_entry["last_date"]))
+                new_entry["last_date"] = max(last_dates).isoformat()
+            new_rows[path] = len(df)
+        files[path] = new_entry
+
+    # -------- دمج الأجزاء مرة واحدة وحفظها كجزء واحد --------
+    frames, merged = {}, []
+    for path in paths:
+        entry = files[path]
+        df = _read_parts(folder, entry["parts"], finish)
+        if len(entry["parts"]) > 1:
+            entry.setdefault("next_part", len(entry["parts"]))
+            part = _new_part(path, entry)
+            _write_atomic(os.path.join(folder, part), df.to_parquet)
+            merged += entry["parts"]
+            entry["parts"] = [part]
+        df.attrs["incremental"] = {"new_rows": new_rows[path], "rebuilt": rebuild}
+        frames[path] = df
+
+    if pending or merged:
+        _write_manifest(folder, {"version": version, "spec": spec.name, "files": files})
+    # the old parts go only once the manifest no longer lists them
+    for part in merged:
+        try:
+            os.remove(os.path.join(folder, part))
+        except OSError:
+            pass
+    return frames
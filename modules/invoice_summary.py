@@ -1,6 +1,6 @@
-from st_aggrid import AgGrid, GridOptionsBuilder
 import streamlit as st
 import pandas as pd
+from modules.paged_grid import paged_grid
 
 def show(df: pd.DataFrame):
     st.title("📑 Invoice Summary Report")
@@ -14,7 +14,7 @@ def show(df: pd.DataFrame):
     filter_territory = st.multiselect("Filter by Territory", options=df['Territory'].unique(), default=None)
     filter_agent = st.multiselect("Filter by Agent Name", options=df['Agent Name'].unique(), default=None)
 
-    df_filtered = df.copy()
+    df_filtered = df
     if filter_country:
         df_filtered = df_filtered[df_filtered['Country'].isin(filter_country)]
     if filter_territory:
@@ -26,29 +26,16 @@ def show(df: pd.DataFrame):
     columns_to_show = [
         col for col in df_filtered.columns
         if col not in ["report_year", "report_month", "Invoice Number", "Emails Sent", "Detail",
-                       "Agent Code", "Station Name", "Station Code"]
+                       "Agent Code", "Station Name", "Station Code", "report_from_date", "report_to_date"]
     ]
     df_display = df_filtered[columns_to_show]
 
-    # ----- عرض الجدول باستخدام AgGrid -----
+    # ----- عرض الجدول باستخدام AgGrid (صفحة واحدة في كل مرة) -----
     st.subheader("Invoice Data")
-    gb = GridOptionsBuilder.from_dataframe(df_display)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_default_column(
-        editable=False,
-        filter=True,
-        sortable=True,
-        resizable=True,
-        wrapText=True,
-        minWidth=150,
-        cellStyle={'font-size': '16px'}
-    )
-    gb.configure_grid_options(headerHeight=40)
-    grid_options = gb.build()
-
-    AgGrid(
+    paged_grid(
         df_display,
-        gridOptions=grid_options,
+        key="invoice_grid",
+        default_column={'minWidth': 150, 'cellStyle': {'font-size': '16px'}},
         height=600,
         width='100%',
         fit_columns_on_grid_load=True
@@ -56,12 +43,6 @@ def show(df: pd.DataFrame):
 
     st.markdown("---")
 
-    # ----- التأكد من أن الأعمدة الرقمية أرقام -----
-    if "Invoice Total" in df_filtered.columns:
-        df_filtered["Invoice Total"] = pd.to_numeric(df_filtered["Invoice Total"], errors="coerce").fillna(0)
-    if "Modify" in df_filtered.columns:
-        df_filtered["Modify"] = pd.to_numeric(df_filtered["Modify"], errors="coerce").fillna(0)
-
     # ----- حساب الملخص -----
     total_invoices = df_filtered["Invoice Total"].sum() if "Invoice Total" in df_filtered.columns else 0
     avg_invoice = df_filtered["Invoice Total"].mean() if "Invoice Total" in df_filtered.columns else 0
@@ -0,0 +1,34 @@
+"""
+Tabs that run only the selected tab.
+
+``st.tabs`` runs the body of every tab on every rerun, the user sees one.
+With ``on_change="rerun"`` Streamlit tracks the selected tab (``tab.open``)
+and reruns when it changes, so ``lazy_tabs`` calls the ``render()`` of the
+selected tab only. The data behind the other tabs (cubes, rankings, rendered
+charts) stays in the per-dataset and chart caches until they are opened.
+
+Widgets of the hidden tabs are not drawn in that run and Streamlit would drop
+their state; the session state of the keys starting with the tab's prefixes
+is written back, so the filters are as the user left them on return.
+"""
+import streamlit as st
+
+
+def _keep_widget_state(prefixes):
+    for name in list(st.session_state.keys()):
+        if isinstance(name, str) and name.startswith(tuple(prefixes)):
+            st.session_state[name] = st.session_state[name]
+
+
+def lazy_tabs(tabs, key: str):
+    """
+    ``tabs``: (label, render, widget key prefixes) for every tab.
+    ``key`` is the widget key of the tab bar.
+    """
+    containers = st.tabs([label for label, _, _ in tabs], key=key, on_change="rerun")
+    for container, (_, render, prefixes) in zip(containers, tabs):
+        if container.open:
+            with container:
+                render()
+        elif prefixes:
+            _keep_widget_state(prefixes)
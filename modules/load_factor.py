@@ -1,61 +1,24 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import pandas as pd
+from modules.chart_cache import show_chart
+from modules.seat_inventory.filters import segment_date_filter
+
+def draw_load_factor(ax, segment_summary):
+    ax.bar(segment_summary["segment"], segment_summary["load_factor"], color="skyblue")
+    ax.set_ylabel("Load Factor (%)")
+    ax.set_xlabel("Segment")
+    ax.set_title("Load Factor per Segment (Sorted by Value)")
+    ax.set_xticks(range(len(segment_summary["segment"])))
+    ax.set_xticklabels(segment_summary["segment"], rotation=45, ha='right')
 
 def show(df):
     st.title("📈 Load Factor & Seats Analysis")
 
     # تحويل التاريخ إذا لم يكن datetime
     if not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
-
-    # ---------- فلتر الوجهات بطريقة السيليكت الثنائية ----------
-    st.subheader("✈️ Filter by Segment")
-    all_segments = sorted(df["segment"].unique().tolist())
-
-    segment_filter_type = st.selectbox(
-        "Choose Segment Filter Type",
-        ["All Segments", "Custom Selection"],
-        index=0,
-        key="load_factor_segment_filter"
-    )
+        df = df.assign(flight_date=pd.to_datetime(df["flight_date"], errors="coerce"))
 
-    if segment_filter_type == "All Segments":
-        selected_segments = all_segments
-    else:
-        selected_segments = st.multiselect(
-            "Select Segments",
-            options=all_segments,
-            default=all_segments[:2],
-            key="load_factor_multiselect_segments"
-        )
-
-    # ---------- فلتر التاريخ ----------
-    st.subheader("📅 Filter by Date")
-    min_date = df["flight_date"].min()
-    max_date = df["flight_date"].max()
-    start_date = st.date_input(
-        "Start Date",
-        value=min_date,
-        min_value=min_date,
-        max_value=max_date,
-        key="load_factor_start_date"
-    )
-    end_date = st.date_input(
-        "End Date",
-        value=max_date,
-        min_value=min_date,
-        max_value=max_date,
-        key="load_factor_end_date"
-    )
-
-    # ---------- تطبيق الفلاتر ----------
-    df_filtered = df[
-        (df["flight_date"] >= pd.to_datetime(start_date)) &
-        (df["flight_date"] <= pd.to_datetime(end_date))
-    ]
-    if selected_segments:
-        df_filtered = df_filtered[df_filtered["segment"].isin(selected_segments)]
+    df_filtered = segment_date_filter(df, key="load_factor")
 
     if df_filtered.empty:
         st.warning("⚠️ No data available for selected filters.")
@@ -74,14 +37,7 @@ def show(df):
     segment_summary = segment_summary.sort_values(by="load_factor", ascending=False)
 
     # ---------- رسم Load Factor ----------
-    fig, ax = plt.subplots(figsize=(10,5))
-    ax.bar(segment_summary["segment"], segment_summary["load_factor"], color="skyblue")
-    ax.set_ylabel("Load Factor (%)")
-    ax.set_xlabel("Segment")
-    ax.set_title("Load Factor per Segment (Sorted by Value)")
-    ax.set_xticklabels(segment_summary["segment"], rotation=45, ha='right')
-
-    st.pyplot(fig)
+    show_chart(draw_load_factor, segment_summary[["segment", "load_factor"]], figsize=(10,5))
 
     # ---------- جدول أسفل المخطط ----------
     st.subheader("💺 Seats Summary by Segment")
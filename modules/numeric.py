@@ -0,0 +1,202 @@
+"""
+Bulk decoder for the number formats found in the report exports.
+
+The exports write money as ``"31,059,376.00"``, percentages as ``"82%"``,
+counts as ``"115"`` and leave blanks or labels (``"Detail"``) in numeric
+columns. ``parse_numeric`` converts a whole column at once, working on the
+raw UTF-8 bytes of the column (Arrow string layout: one data buffer plus row
+offsets) instead of on Python strings:
+
+- all rows are walked together, one character position at a time, so every
+  step is a handful of NumPy operations over the whole block of rows
+- a number is: blanks, an optional ``-`` / ``+``, digits with ``,`` only as
+  a thousands separator (``1,234,567``), an optional ``.`` and decimals,
+  blanks and an optional trailing ``%``. Every row carries its state in
+  that format, moved on by one table lookup per byte (``_NEXT``); digits are
+  folded into an int64 mantissa (Horner's scheme)
+- the mantissa is divided by the matching power of ten. Both are exact in
+  float64 while the mantissa is at most 2**53 (every number of up to 15
+  significant digits) and there are at most 22 decimals, so the quotient is
+  the correctly rounded float ``float(s)`` gives
+- longer mantissas, more decimals, numbers with an exponent (``1e5``) and
+  cells longer than ``_MAX_WIDTH`` bytes are rare and checked against
+  ``_NUMBER`` and decoded one by one with ``float``; a block is only walked
+  as far as its longest short cell
+
+Cells that contain anything else (letters, a second ``.``, ``12%34``,
+``1 234``, ``- 5``, no digits at all) become NaN, like
+``pd.to_numeric(errors="coerce")``.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# -------- character classes --------
+_OTHER, _DIGIT, _DOT, _COMMA, _PERCENT, _SIGN, _BLANK, _EXP = range(8)
+# Blanks around a number (NUL pads rows shorter than the current position)
+_BLANKS = " \t\r\n\"\0"
+_CLASS = np.full(256, _OTHER, dtype=np.uint8)
+_CLASS[ord("0"):ord("9") + 1] = _DIGIT
+_CLASS[ord(".")] = _DOT
+_CLASS[ord(",")] = _COMMA
+_CLASS[ord("%")] = _PERCENT
+_CLASS[[ord("-"), ord("+")]] = _SIGN
+_CLASS[[ord(c) for c in _BLANKS]] = _BLANK
+_CLASS[[ord("e"), ord("E")]] = _EXP
+_MINUS = ord("-")
+
+# Digit value and mantissa multiplier per byte: mantissa = mantissa * _SHIFT + _VALUE
+_VALUE = np.zeros(256, dtype=np.int64)
+_VALUE[ord("0"):ord("9") + 1] = np.arange(10)
+_SHIFT = np.where(_CLASS == _DIGIT, 10, 1).astype(np.int64)
+
+# -------- states of the number format --------
+# START (leading blanks), SIGN, INT1..INT3 (integer digits before any ","),
+# INT (4+ digits, no "," allowed), GROUP0..GROUP3 (digits after a ","), DOT0
+# ("." with no digit before), DOT, FRACTION, TRAIL (blanks after), PERCENT,
+# EXPONENT (the rest is checked by _NUMBER) and DEAD
+(_START, _SIGNED, _INT1, _INT2, _INT3, _INT, _GROUP0, _GROUP1, _GROUP2, _GROUP3,
+ _DOT0, _DOTTED, _FRACTION, _TRAIL, _PERCENTED, _EXPONENT, _DEAD) = range(17)
+_STATES = 17
+_NEXT = np.full((_STATES, 8), _DEAD, dtype=np.uint8)
+_NEXT[_START, [_DIGIT, _DOT, _SIGN, _BLANK, _EXP]] = [_INT1, _DOT0, _SIGNED, _START, _EXPONENT]
+_NEXT[_SIGNED, [_DIGIT, _DOT]] = [_INT1, _DOT0]
+for _state, _digit in [(_INT1, _INT2), (_INT2, _INT3), (_INT3, _INT), (_INT, _INT), (_GROUP3, _DEAD)]:
+    _NEXT[_state, [_DIGIT, _COMMA, _DOT, _BLANK, _PERCENT, _EXP]] = [_digit, _GROUP0, _DOTTED, _TRAIL, _PERCENTED, _EXPONENT]
+_NEXT[_INT, _COMMA] = _DEAD  # "1234,567"
+_NEXT[[_GROUP0, _GROUP1, _GROUP2], _DIGIT] = [_GROUP1, _GROUP2, _GROUP3]
+_NEXT[_DOT0, _DIGIT] = _FRACTION
+for _state in (_DOTTED, _FRACTION):
+    _NEXT[_state, [_DIGIT, _BLANK, _PERCENT, _EXP]] = [_FRACTION, _TRAIL, _PERCENTED, _EXPONENT]
+_NEXT[_TRAIL, [_BLANK, _PERCENT]] = [_TRAIL, _PERCENTED]
+_NEXT[_PERCENTED, _BLANK] = _PERCENTED
+_NEXT[_EXPONENT, :] = _EXPONENT
+_NEXT = _NEXT.ravel()  # indexed by state * 8 + class
+_ACCEPT = np.zeros(_STATES, dtype=bool)
+_ACCEPT[[_INT1, _INT2, _INT3, _INT, _GROUP3, _DOTTED, _FRACTION, _TRAIL, _PERCENTED]] = True
+
+# The same format (plus exponents), for the cells decoded one by one
+_NUMBER = re.compile(
+    r'[ \t\r\n"\0]*([+-]?)((?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+)([eE][+-]?\d+)?'
+    r'[ \t\r\n"\0]*(?:%[ \t\r\n"\0]*)?'
+)
+
+# int64 holds every mantissa of up to 18 digits exactly
+_MAX_DIGITS = 18
+
+# float64 holds every integer up to 2**53 exactly
+_MAX_EXACT = 2 ** 53
+
+# Longer cells are not walked with the block (one long cell would make every row pay for it)
+_MAX_WIDTH = 48
+
+# Rows decoded per block, keeps the per-position vectors in cache
+_CHUNK_ROWS = 1 << 16
+
+_POW10 = 10.0 ** np.arange(0, 23)
+
+
+def _parse_one(text: str) -> float:
+    match = _NUMBER.fullmatch(text)
+    if match is None:
+        return np.nan  # like pd.to_numeric(errors="coerce")
+    sign, number, exponent = match.groups()
+    try:
+        return float(sign + number.replace(",", "") + (exponent or ""))
+    except ValueError:
+        return np.nan
+
+
+def _decode_block(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Decode the rows ``data[starts[i]:starts[i] + lengths[i]]`` into float64."""
+    n = len(starts)
+    long = lengths > _MAX_WIDTH
+    width = int(lengths[~long].max(initial=0))
+    shortest = int(lengths.min()) if n else 0
+
+    mantissa = np.zeros(n, dtype=np.int64)
+    digits = np.zeros(n, dtype=np.uint8)
+    decimals = np.zeros(n, dtype=np.uint8)
+    negative = np.zeros(n, dtype=bool)
+    state = np.full(n, _START, dtype=np.uint8)
+
+    index = starts.copy()
+    char = np.empty(n, dtype=np.uint8)
+    cls = np.empty(n, dtype=np.uint8)
+    edge = np.empty(n, dtype=np.intp)
+
+    for position in range(width):
+        np.take(data, index, out=char)
+        index += 1
+        if position >= shortest:
+            char[lengths <= position] = 0
+
+        # -------- الحالة التالية من الجدول --------
+        np.take(_CLASS, char, out=cls)
+        np.multiply(state, 8, out=edge)
+        edge += cls
+        np.take(_NEXT, edge, out=state)
+
+        # mantissa = mantissa * 10 + digit, only where the byte is a digit
+        mantissa *= _SHIFT[char]
+        mantissa += _VALUE[char]
+        digits += cls == _DIGIT
+        decimals += state == _FRACTION
+        negative |= char == _MINUS
+
+    valid = _ACCEPT[state]
+    fast = valid & ~long & (digits <= _MAX_DIGITS) & (decimals < len(_POW10))
+    fast[fast] = mantissa[fast] <= _MAX_EXACT
+    values = mantissa / _POW10[np.minimum(decimals, len(_POW10) - 1)]
+    values[negative] *= -1
+    values[~fast] = np.nan
+
+    # -------- long numbers, exponents and long cells: rare, decoded one by one --------
+    for i in np.flatnonzero(~fast & (valid | (state == _EXPONENT) | (long & (state != _DEAD)))):
+        values[i] = _parse_one(bytes(data[starts[i]:starts[i] + lengths[i]]).decode("utf-8"))
+
+    return values
+
+
+def _arrow_chunks(series: pd.Series):
+    """Yield the column as pyarrow large_string arrays."""
+    try:
+        array = pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # mixed object columns (numbers and text): go through str
+        array = pa.array(series.astype(str), from_pandas=True)
+    if not pa.types.is_large_string(array.type):
+        array = array.cast(pa.large_string())
+    return array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+
+
+def parse_numeric(series: pd.Series) -> pd.Series:
+    """
+    Convert a column of report numbers to float64 (NaN where unparseable).
+
+    Columns the CSV reader already typed as numbers are returned unchanged.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series
+
+    parts = []
+    for chunk in _arrow_chunks(series):
+        _, offsets_buf, data_buf = chunk.buffers()
+        offsets = np.frombuffer(offsets_buf, dtype=np.int64)[chunk.offset:chunk.offset + len(chunk) + 1]
+        data = np.frombuffer(data_buf, dtype=np.uint8) if data_buf is not None else np.zeros(0, np.uint8)
+        # pad so reads past the end of the last row stay in bounds
+        longest = int(np.diff(offsets).max()) if len(chunk) else 0
+        data = np.concatenate([data, np.zeros(min(longest, _MAX_WIDTH) + 1, dtype=np.uint8)])
+
+        values = np.empty(len(chunk))
+        for start in range(0, len(chunk), _CHUNK_ROWS):
+            bounds = offsets[start:start + _CHUNK_ROWS + 1]
+            values[start:start + _CHUNK_ROWS] = _decode_block(data, bounds[:-1], np.diff(bounds))
+        if chunk.null_count:
+            values[chunk.is_null().to_numpy(zero_copy_only=False)] = np.nan
+        parts.append(values)
+
+    result = np.concatenate(parts) if parts else np.empty(0)
+    return pd.Series(result, index=series.index, name=series.name)
@@ -0,0 +1,135 @@
+"""
+Paged AgGrid for large tables.
+
+``AgGrid(df)`` serializes every row of ``df`` to JSON and sends it to the
+browser on every rerun. ``paged_grid`` keeps the rows on the server and
+sends one page:
+
+- search, sort column / order, page size and page are Streamlit controls
+  above the grid, answered in Python
+- ``GridIndex`` keeps, per dataset, the sort order of every column already
+  sorted on (one stable argsort each) and the rows of the last search
+- only the rows of the visible page are handed to AgGrid, formatted by
+  ``payload.grid_frame``; its own pagination, sorting and filters are off
+  (they would only see the page)
+- the matching rows of all pages can be downloaded as columnar JSON
+  (``payload.to_json``, built when the button is clicked)
+
+``paged_grid`` returns the matching rows of all pages, in grid order, for the
+KPIs and charts under the table.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder
+
+from modules.payload import grid_frame, to_json
+from modules.shared_cache import DerivedCache
+
+PAGE_SIZES = (25, 50, 100, 250)
+NO_SORT = "(none)"
+
+# Grid indexes kept (one per table on screen, a few datasets each)
+MAX_INDEXES = 16
+
+
+class GridIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._orders = {}
+        self._search = (None, None)
+
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Row positions sorted by ``column`` (stable, missing values last)."""
+        order = self._orders.get((column, ascending))
+        if order is None:
+            values = self.df[column].reset_index(drop=True)
+            order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+            self._orders[(column, ascending)] = order
+        return order
+
+    def matches(self, text: str) -> np.ndarray:
+        """Boolean mask of the rows with ``text`` in one of their text columns (case-insensitive)."""
+        if self._search[0] == text:
+            return self._search[1]
+        mask = np.zeros(len(self.df), dtype=bool)
+        for col in self.df.columns:
+            values = self.df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                hits = values.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+                mask |= np.isin(values.array.codes, np.flatnonzero(hits))
+            elif pd.api.types.is_string_dtype(values.dtype) or values.dtype == object:
+                mask |= values.astype("str").str.contains(text, case=False, regex=False, na=False).to_numpy()
+        self._search = (text, mask)
+        return mask
+
+
+_indexes = DerivedCache(MAX_INDEXES)
+
+
+def grid_index(df: pd.DataFrame) -> GridIndex:
+    """The grid index of ``df``, built on first use."""
+    return _indexes.get(df, GridIndex, df.columns[0])
+
+
+def _page_controls(df: pd.DataFrame, key: str, page_size: int):
+    search_col, sort_col, order_col, size_col = st.columns([3, 2, 1, 1])
+    text = search_col.text_input("Search", key=f"{key}_search", placeholder="Search text columns")
+    sort_by = sort_col.selectbox("Sort by", [NO_SORT] + list(df.columns), key=f"{key}_sort")
+    ascending = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Ascending"
+    sizes = sorted(set(PAGE_SIZES) | {page_size})
+    size = size_col.selectbox("Rows / page", sizes, index=sizes.index(page_size), key=f"{key}_size")
+    return text.strip(), sort_by, ascending, size
+
+
+def paged_grid(df: pd.DataFrame, key: str, page_size: int = 50, default_column=None, columns=None,
+               header_height: int = 40, side_bar: bool = False, **aggrid_kwargs) -> pd.DataFrame:
+    """
+    Show ``df`` one page at a time in AgGrid and return its matching rows.
+
+    - ``key``: prefix of the widget keys, unique per table
+    - ``default_column`` / ``columns``: AgGrid column properties for all
+      columns / per column name
+    - other keyword arguments go to ``AgGrid`` (height, width ...)
+    """
+    text, sort_by, ascending, size = _page_controls(df, key, page_size)
+
+    # -------- ترتيب وبحث من الفهرس المخزن --------
+    index = grid_index(df) if len(df.columns) else None
+    positions = None
+    if index is not None and sort_by != NO_SORT:
+        positions = index.order(sort_by, ascending)
+    if index is not None and text:
+        mask = index.matches(text)
+        positions = np.flatnonzero(mask) if positions is None else positions[mask[positions]]
+    total = len(df) if positions is None else len(positions)
+
+    # -------- الصفحة الظاهرة فقط --------
+    pages = max((total + size - 1) // size, 1)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page_col, info_col = st.columns([1, 5])
+    page = page_col.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    start = (page - 1) * size
+    window = np.arange(start, min(start + size, total))
+    visible = grid_frame(df.take(window if positions is None else positions[window]))
+    info_col.caption(f"Page {page:,} of {pages:,}, rows {start + 1 if total else 0:,}–{start + len(window):,} of {total:,}")
+
+    gb = GridOptionsBuilder.from_dataframe(visible)
+    gb.configure_default_column(editable=False, resizable=True, wrapText=True, **(default_column or {}))
+    gb.configure_default_column(filter=False, sortable=False)
+    for col, props in (columns or {}).items():
+        if col in visible.columns:
+            gb.configure_column(col, **props)
+    if side_bar:
+        gb.configure_side_bar()
+    gb.configure_grid_options(headerHeight=header_height)
+
+    AgGrid(visible, gridOptions=gb.build(), **aggrid_kwargs)
+
+    matching = df if positions is None else df.take(positions)
+    # الملف يُبنى عند الضغط فقط
+    st.download_button("⬇️ Matching rows (JSON)", data=lambda: to_json(matching),
+                       file_name=f"{key}.json", mime="application/json", key=f"{key}_download")
+    return matching
@@ -0,0 +1,67 @@
+"""
+Column-at-a-time encoding of DataFrames for the grid and for JSON downloads.
+
+Generic paths convert cell by cell (st_aggrid runs ``Timestamp.isoformat``
+on every date, ``to_dict("records")`` boxes every value). Here each column
+gets one formatter, picked from its dtype and name:
+
+- dates: factorized, the distinct dates formatted once with
+  ``np.datetime_as_string`` (day precision when all are midnight)
+- categoricals: the categories encoded once, then taken by code
+- money (``MONEY_PATTERN``): rounded to 2 decimals
+- other numbers and text: pandas' C JSON writer, NaN -> null
+
+``grid_frame`` returns the frame to hand to AgGrid (shipped as Arrow, the
+dates already text so st_aggrid has nothing to convert), ``to_json`` the
+columns as one JSON object ``{column: [values, ...]}``.
+"""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+MONEY_PATTERN = re.compile(r"fare|amount|total|usd|charges|revenue|discount|tax|surcharge|refund|invoice", re.I)
+MONEY_DECIMALS = 2
+
+
+def is_money(name) -> bool:
+    return bool(MONEY_PATTERN.search(str(name)))
+
+
+def _date_text(values: pd.Series) -> pd.Categorical:
+    """ISO text of a datetime column as a categorical (each distinct date formatted once)."""
+    codes, uniques = pd.factorize(values.to_numpy(dtype="datetime64[s]"))
+    stamps = np.asarray(uniques, dtype="datetime64[s]")
+    unit = "D" if (stamps.astype(np.int64) % 86400 == 0).all() else "s"
+    text = pd.Index(np.datetime_as_string(stamps, unit=unit), dtype="str")
+    return pd.Categorical.from_codes(codes, categories=text)
+
+
+def _column(values: pd.Series, name):
+    """The column as it goes into the payload."""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return _date_text(values)
+    if pd.api.types.is_float_dtype(values.dtype) and is_money(name):
+        return values.round(MONEY_DECIMALS)
+    return values
+
+
+def grid_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """A new frame with every column formatted for AgGrid (``df`` is not modified)."""
+    return pd.DataFrame({col: _column(df[col], col) for col in df.columns}, index=df.index, copy=False)
+
+
+def _json_array(values) -> str:
+    if isinstance(values, pd.Categorical) or isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+        values = pd.Categorical(values)
+        # كل قيمة مختلفة تُرمَّز مرة واحدة ثم تؤخذ بالرمز
+        encoded = np.array([json.dumps(v, default=str) for v in values.categories.tolist()] + ["null"], dtype=object)
+        return "[" + ",".join(encoded[values.codes]) + "]"
+    return pd.Series(values).to_json(orient="values", date_format="iso", double_precision=10)
+
+
+def to_json(df: pd.DataFrame) -> str:
+    """``df`` as a JSON object of columns: ``{"column": [values, ...], ...}``."""
+    parts = [f"{json.dumps(str(col))}:{_json_array(_column(df[col], col))}" for col in df.columns]
+    return "{" + ",".join(parts) + "}"
@@ -0,0 +1,80 @@
+"""
+Role changes between AgentUserPrivileges snapshots.
+
+The snapshots come as one frame (``load_report_files`` over
+``AgentUserPrivileges*.csv``), one row per (user, role), with the print date
+of each export in ``print_date``. Users are keyed by (Agent Code, User ID)
+and hashed once into codes shared by all snapshots, the roles share the
+codes of the ``Role`` column, so every snapshot becomes a bitset array of the
+same shape (``role_index.pack_roles``):
+
+- granted = new & ~old, revoked = old & ~new
+- only the users whose words differ (old ^ new) are decoded back to role names
+"""
+import numpy as np
+import pandas as pd
+
+from modules.role_index import pack_roles
+from modules.shared_cache import per_dataset
+
+USER_KEY = ["Agent Code", "User ID"]
+SNAPSHOT_COLUMN = "print_date"
+
+
+class PrivilegeSnapshots:
+    def __init__(self, df: pd.DataFrame, snapshot_column: str = SNAPSHOT_COLUMN):
+        user_codes, keys = pd.MultiIndex.from_frame(df[USER_KEY].astype(str)).factorize()
+        role_codes, self.roles = pd.factorize(df["Role"].astype(str), sort=True)
+        snapshot_codes, self.snapshots = pd.factorize(df[snapshot_column], sort=True)
+
+        # -------- جدول المستخدمين: آخر اسم معروف لكل مفتاح --------
+        self.users = keys.to_frame(index=False, name=USER_KEY)
+        names = df[["Agent Name", "User Name"]].astype(str).groupby(user_codes, sort=True).last()
+        self.users = self.users.join(names.reindex(np.arange(len(keys))))
+
+        # -------- bitset لكل لقطة بنفس الأبعاد --------
+        n_users, n_roles = len(self.users), len(self.roles)
+        self.bits = []
+        self.present = []
+        for s in range(len(self.snapshots)):
+            rows = snapshot_codes == s
+            self.bits.append(pack_roles(user_codes[rows], role_codes[rows], n_users, n_roles))
+            self.present.append(np.bincount(user_codes[rows], minlength=n_users) > 0)
+
+    def _decode(self, users: np.ndarray, words: np.ndarray) -> tuple:
+        """(user positions, role codes) of the bits set in ``words`` (rows of ``users``)."""
+        flags = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")[:, :len(self.roles)]
+        rows, roles = np.nonzero(flags)
+        return users[rows], roles
+
+    def diff(self, old: int, new: int) -> pd.DataFrame:
+        """Roles granted and revoked from snapshot ``old`` to snapshot ``new`` (positions in ``snapshots``)."""
+        before, after = self.bits[old], self.bits[new]
+        changed = np.flatnonzero((before ^ after).any(axis=1))
+
+        parts = []
+        for change, words in (("granted", after[changed] & ~before[changed]),
+                              ("revoked", before[changed] & ~after[changed])):
+            users, roles = self._decode(changed, words)
+            part = self.users.take(users).reset_index(drop=True)
+            part["Role"] = np.asarray(self.roles, dtype=object)[roles]
+            part["Change"] = change
+            part["User Status"] = np.select(
+                [~self.present[old][users], ~self.present[new][users]], ["new user", "removed user"], ""
+            )
+            parts.append(part)
+
+        result = pd.concat(parts, ignore_index=True)
+        result.insert(0, "From", self.snapshots[old])
+        result.insert(1, "To", self.snapshots[new])
+        return result.sort_values(["Agent Code", "User ID", "Change", "Role"], kind="stable", ignore_index=True)
+
+    def changes(self) -> pd.DataFrame:
+        """Changes between every pair of consecutive snapshots."""
+        frames = [self.diff(i - 1, i) for i in range(1, len(self.snapshots))]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def privilege_snapshots(df: pd.DataFrame) -> PrivilegeSnapshots:
+    """The snapshots of ``df``, encoded on first use."""
+    return per_dataset(df, PrivilegeSnapshots, "Role")
@@ -0,0 +1,325 @@
+"""
+Declarative parser for the reservation system's CSV report exports.
+
+Every report (UC_REPM_xxx) has the same shape:
+
+    banner rows      title, Report ID, From Date / To Date, Print Date ...
+    header row       column names, sometimes spread over several lines
+    body rows
+    footer rows      Total / Grand Total, "Syrian Air Reservation System",
+                     "Page 1 of 1", "*** End of Report ***"
+
+A ``ReportSpec`` describes one report and ``parse_report`` turns a file into a
+clean DataFrame. The file is read once: the banner is scanned record by record
+until the header row is found (collecting the metadata on the way), the footer
+is trimmed from the end of the text and only the body is handed to the C CSV
+parser.
+
+Grouped reports (``group_column`` set, e.g. PerformanceOfSalesStaffDetail)
+write the group once on its own row ("ALHIJAZ OFFICE,,,,") above the rows it
+applies to, with a "Total :" row after each group. They are read in one
+streaming pass of the csv module instead: group rows are forward-filled onto
+their rows, subtotals skipped, and every banner + header + body section of a
+concatenated export (one per month) keeps its own metadata.
+"""
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from modules.numeric import parse_numeric
+
+# Rows at the end of a report that are not data
+DEFAULT_FOOTER_MARKERS = (
+    r"^\*\*\* End of Report",
+    r"^Syrian Air",
+    r"^Page\b",
+    r"^(Grand )?Total\b",
+)
+
+# Banner rows are only scanned this far before giving up on the header
+MAX_BANNER_ROWS = 25
+
+
+def banner_date(value: str):
+    """Parse a banner date such as ``01/08/2025`` (day first)."""
+    return pd.to_datetime(value, dayfirst=True, errors="coerce")
+
+
+# Banner fields shared by most reports
+FROM_DATE = (r"From Date[^0-9]*(\d{1,2}/\d{1,2}/\d{4})", banner_date)
+TO_DATE = (r"To Date[^0-9]*(\d{1,2}/\d{1,2}/\d{4})", banner_date)
+PRINT_DATE = (r"Print Date[^0-9]*(\d{1,2}/\d{1,2}/\d{4})", banner_date)
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """
+    Description of one report export.
+
+    - header_marker: text the first cell of the header row starts with
+    - metadata: column name -> (regex with one group, parser) searched in the banner;
+      each value found is added to the frame as a constant column
+    - footer_markers: regexes matched against the first non-empty cell of trailing rows
+    - rename_map: cleaned source column name -> canonical name
+    - numeric: columns converted to numbers (after renaming)
+    - numeric_fill: value used for unparseable numbers (None keeps NaN)
+    - dates: columns parsed with ``pd.to_datetime`` (after renaming)
+    - date_format: explicit format for ``dates`` (None lets pandas infer it)
+    - source_dtypes: cleaned source column name -> dtype handed to the CSV reader,
+      so those columns skip type inference
+    - dtypes: final ``astype`` per column (after numeric conversion)
+    - required: rows missing any of these columns are dropped
+    - drop_empty_columns: drop columns that are entirely empty
+    - group_column: cleaned source column given once per group on a row of its own
+      (grouped reports only)
+    - subtotal_markers: regexes matched against the first non-empty cell of the
+      per-group total rows inside the body (grouped reports only)
+    """
+    name: str
+    header_marker: str
+    metadata: dict = field(default_factory=dict)
+    footer_markers: tuple = DEFAULT_FOOTER_MARKERS
+    rename_map: dict = field(default_factory=dict)
+    numeric: tuple = ()
+    numeric_fill: float = 0
+    dates: tuple = ()
+    date_format: str = None
+    source_dtypes: dict = field(default_factory=dict)
+    dtypes: dict = field(default_factory=dict)
+    required: tuple = ()
+    drop_empty_columns: bool = False
+    group_column: str = None
+    subtotal_markers: tuple = (r"^Total\b",)
+
+
+def clean_column_names(columns) -> pd.Index:
+    """Collapse the multi-line, padded header cells of the exports into plain names."""
+    return (
+        pd.Index(columns).astype(str)
+        .str.replace('"', "", regex=False)
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+    )
+
+
+def _first_cell(row) -> str:
+    for cell in row:
+        cell = cell.strip()
+        if cell:
+            return cell
+    return ""
+
+
+def _find_header(text: str, spec: ReportSpec):
+    """Return (offset of the header record, offset just after it)."""
+    consumed = 0
+    record_start = 0
+
+    def lines():
+        nonlocal consumed
+        for line in io.StringIO(text):
+            consumed += len(line)
+            yield line
+
+    for i, row in enumerate(csv.reader(lines())):
+        if row and row[0].strip().startswith(spec.header_marker):
+            return record_start, consumed
+        if i >= MAX_BANNER_ROWS:
+            break
+        record_start = consumed
+
+    raise ValueError(f"{spec.name}: header row starting with '{spec.header_marker}' not found")
+
+
+def _header_cells(text: str, header_start: int) -> list:
+    """Raw (uncleaned) header cells of the record starting at ``header_start``."""
+    return next(csv.reader(io.StringIO(text[header_start:])), [])
+
+
+def _find_body_end(text: str, start: int, spec: ReportSpec) -> int:
+    """Return the offset where the footer rows begin."""
+    markers = [re.compile(m) for m in spec.footer_markers]
+    end = len(text)
+    while end > start:
+        line_start = text.rfind("\n", start, end - 1) + 1
+        line = text[line_start:end]
+        first = _first_cell(next(csv.reader([line]), []))
+        if first and not any(m.search(first) for m in markers):
+            break
+        end = line_start
+    return end
+
+
+def _extract_metadata(banner: str, spec: ReportSpec) -> dict:
+    values = {}
+    for column, (pattern, parser) in spec.metadata.items():
+        match = re.search(pattern, banner)
+        values[column] = parser(match.group(1)) if match else None
+    return values
+
+
+def report_layout(text: str, spec: ReportSpec):
+    """
+    Offsets (in characters) of the parts of a report text:
+    (header start, header end = body start, body end = footer start).
+    """
+    header_start, header_end = _find_header(text, spec)
+    body_end = max(_find_body_end(text, header_start, spec), header_end)
+    return header_start, header_end, body_end
+
+
+def parse_report(path: str, spec: ReportSpec, columns=None) -> pd.DataFrame:
+    """
+    Parse the report at ``path`` according to ``spec``.
+
+    ``columns`` (canonical names, after renaming) limits the columns handed to
+    the CSV reader; the others are never parsed. Metadata columns are always
+    added.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return parse_report_text(text, spec, columns)
+
+
+def parse_report_text(text: str, spec: ReportSpec, columns=None) -> pd.DataFrame:
+    """``parse_report`` on a report already read into memory."""
+    if spec.group_column is not None:
+        return _parse_grouped(text, spec, columns)
+
+    # -------- banner + header detection --------
+    header_start, _, body_end = report_layout(text, spec)
+    metadata = _extract_metadata(text[:header_start], spec)
+
+    # -------- projection + explicit dtypes --------
+    raw_names = _header_cells(text, header_start)
+    clean_names = clean_column_names(raw_names)
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = [
+            raw for raw, clean in zip(raw_names, clean_names)
+            if spec.rename_map.get(clean, clean) in wanted
+        ]
+    dtype = {
+        raw: spec.source_dtypes[clean]
+        for raw, clean in zip(raw_names, clean_names)
+        if clean in spec.source_dtypes and (usecols is None or raw in usecols)
+    }
+
+    # -------- body --------
+    # thousands="," lets the C tokenizer type clean money columns directly;
+    # whatever it leaves as text goes through parse_numeric below
+    df = pd.read_csv(
+        io.StringIO(text[header_start:body_end]),
+        thousands=",",
+        usecols=usecols,
+        dtype=dtype or None
+    )
+    df.columns = clean_column_names(df.columns)
+    df = _finish(df, spec)
+
+    # -------- banner metadata as constant columns --------
+    for column, value in metadata.items():
+        df[column] = value
+
+    return df
+
+
+def _finish(df: pd.DataFrame, spec: ReportSpec) -> pd.DataFrame:
+    """Drop unnamed/empty columns, rename and type the body of a report."""
+    df = df.loc[:, (df.columns != "") & ~df.columns.str.startswith("Unnamed")]
+    if spec.drop_empty_columns:
+        df = df.dropna(axis=1, how="all")
+    df = df.rename(columns=spec.rename_map)
+
+    # -------- typing --------
+    for col in spec.numeric:
+        if col in df.columns:
+            df[col] = parse_numeric(df[col])
+            if spec.numeric_fill is not None:
+                df[col] = df[col].fillna(spec.numeric_fill)
+    for col in spec.dates:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=spec.date_format, errors="coerce")
+    for col, dtype in spec.dtypes.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+
+    required = [col for col in spec.required if col in df.columns]
+    if required:
+        df = df.dropna(subset=required)
+    return df
+
+
+def _parse_grouped(text: str, spec: ReportSpec, columns=None) -> pd.DataFrame:
+    """
+    One pass over a grouped report (possibly several reports one after the
+    other): banner -> header -> body -> footer, repeated.
+    """
+    footers = [re.compile(m) for m in spec.footer_markers]
+    subtotals = [re.compile(m) for m in spec.subtotal_markers]
+
+    header = None
+    banner = []
+    sections = []  # (header, metadata, rows)
+    rows = []
+    group = None
+    group_at = None
+
+    for row in csv.reader(io.StringIO(text)):
+        first = _first_cell(row)
+
+        # -------- banner: حتى صف العناوين --------
+        if row and row[0].strip().startswith(spec.header_marker):
+            header = clean_column_names(row)
+            if spec.group_column not in header:
+                raise ValueError(f"{spec.name}: group column '{spec.group_column}' not in header")
+            group_at = header.get_loc(spec.group_column)
+            rows = []
+            sections.append((header, _extract_metadata("\n".join(banner), spec), rows))
+            banner, group = [], None
+            continue
+        if header is None:
+            banner.append(",".join(row))
+            continue
+
+        # -------- body --------
+        if not first:
+            continue
+        if any(m.search(first) for m in subtotals):
+            continue
+        if any(m.search(first) for m in footers):
+            header = None  # نهاية التقرير، قد يبدأ تقرير آخر بعده
+            continue
+
+        cells = (row + [""] * len(header))[:len(header)]
+        value = cells[group_at].strip()
+        if value and not any(cell.strip() for i, cell in enumerate(cells) if i != group_at):
+            group = value  # صف المجموعة
+            continue
+        if value:
+            group = value
+        else:
+            cells[group_at] = group
+        rows.append(cells)
+
+    if not sections:
+        raise ValueError(f"{spec.name}: header row starting with '{spec.header_marker}' not found")
+
+    # -------- كل قسم بعناوينه و metadata الخاصة به --------
+    frames = []
+    for header, metadata, rows in sections:
+        df = pd.DataFrame(rows, columns=header, dtype="str").replace("", None)
+        df = _finish(df, spec)
+        for column, value in metadata.items():
+            df[column] = value
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    if columns is not None:
+        wanted = set(columns) | set(spec.metadata)
+        df = df[[col for col in df.columns if col in wanted]]
+    return df
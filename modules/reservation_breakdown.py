@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder
+from modules.paged_grid import paged_grid
 
 def show(df: pd.DataFrame):
     st.title("📊 Reservation Breakdown Report")
@@ -24,7 +24,7 @@ def show(df: pd.DataFrame):
         default=None
     )
 
-    df_filtered = df.copy()
+    df_filtered = df
     if filter_agent:
         df_filtered = df_filtered[df_filtered['Travel Agent Name'].isin(filter_agent)]
     if filter_agent_code:
@@ -38,25 +38,12 @@ def show(df: pd.DataFrame):
     # ----- إزالة أعمدة from_date و to_date من الجدول -----
     df_display = df_filtered.drop(columns=["from_date", "to_date"], errors='ignore')
 
-    # ----- عرض الجدول باستخدام AgGrid -----
+    # ----- عرض الجدول باستخدام AgGrid (صفحة واحدة في كل مرة) -----
     st.subheader("Reservation Data")
-    gb = GridOptionsBuilder.from_dataframe(df_display)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_default_column(
-        editable=False,
-        filter=True,
-        sortable=True,
-        resizable=True,
-        wrapText=True,
-        minWidth=150,
-        cellStyle={'font-size': '14px'}
-    )
-    gb.configure_grid_options(headerHeight=40)
-    grid_options = gb.build()
-
-    AgGrid(
+    paged_grid(
         df_display,
-        gridOptions=grid_options,
+        key="reservation_grid",
+        default_column={'minWidth': 150, 'cellStyle': {'font-size': '14px'}},
         height=600,
         width='100%',
         fit_columns_on_grid_load=True
@@ -0,0 +1,83 @@
+"""
+User x role index over the AgentUserPrivileges report.
+
+``load_agent_user_privileges`` returns one row per (user, role).
+``RoleIndex`` encodes it once per dataset:
+
+- ``users``: the user table (Agent Code, Agent Name, User ID, User Name),
+  a user is its row position
+- ``roles``: the sorted role names, a role is its position
+- ``role_users``: inverted index, for every role the sorted positions of the
+  users holding it
+- ``bits``: packed role bitsets, one row of uint64 words per user (role ``r``
+  is bit ``r % 64`` of word ``r // 64``)
+
+Filtering by role is a union of posting lists, role counts are one
+``np.bincount`` over the (user, role) pairs of the selected users.
+"""
+import numpy as np
+import pandas as pd
+
+from modules.shared_cache import per_dataset
+
+USER_COLUMNS = ["Agent Code", "Agent Name", "User ID", "User Name"]
+
+
+def pack_roles(user_codes: np.ndarray, role_codes: np.ndarray, n_users: int, n_roles: int) -> np.ndarray:
+    """(n_users, words) uint64 bitsets with bit ``role`` set for every (user, role) pair."""
+    bits = np.zeros((n_users, max((n_roles + 63) // 64, 1)), dtype=np.uint64)
+    role_codes = np.asarray(role_codes, dtype=np.uint64)
+    np.bitwise_or.at(bits, (user_codes, role_codes >> np.uint64(6)), np.uint64(1) << (role_codes & np.uint64(63)))
+    return bits
+
+
+class RoleIndex:
+    def __init__(self, df: pd.DataFrame):
+        user_columns = [col for col in USER_COLUMNS if col in df.columns]
+        user_codes, users = pd.MultiIndex.from_frame(df[user_columns].astype(str)).factorize()
+        self.users = users.to_frame(index=False, name=user_columns)
+        role_codes, self.roles = pd.factorize(df["Role"].astype(str), sort=True)
+
+        # -------- الأزواج مرتبة حسب الدور: قائمة المستخدمين لكل دور --------
+        order = np.lexsort((user_codes, role_codes))
+        self.pair_users = user_codes[order]
+        self.pair_roles = role_codes[order]
+        bounds = np.searchsorted(self.pair_roles, np.arange(len(self.roles) + 1))
+        self.role_users = [self.pair_users[bounds[i]:bounds[i + 1]] for i in range(len(self.roles))]
+
+        self.bits = pack_roles(user_codes, role_codes, len(self.users), len(self.roles))
+        self.role_count = np.bincount(user_codes, minlength=len(self.users))
+
+    def role_codes(self, roles) -> np.ndarray:
+        codes = self.roles.get_indexer(list(roles))
+        return codes[codes >= 0]
+
+    def users_with_any(self, roles) -> np.ndarray:
+        """Sorted positions of the users holding at least one of ``roles``."""
+        lists = [self.role_users[code] for code in self.role_codes(roles)]
+        return np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.intp)
+
+    def role_counts(self, users=None) -> pd.Series:
+        """Number of users (among ``users`` positions, default all) holding each role, most common first."""
+        if users is None:
+            counts = np.fromiter((len(u) for u in self.role_users), dtype=np.int64, count=len(self.roles))
+        else:
+            selected = np.zeros(len(self.users), dtype=bool)
+            selected[users] = True
+            counts = np.bincount(self.pair_roles[selected[self.pair_users]], minlength=len(self.roles))
+        counts = pd.Series(counts, index=pd.Index(self.roles, name="Role"), name="Count")
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+    def role_names(self, users, sep="\n") -> pd.Series:
+        """Role names of every user in ``users`` joined with ``sep``, indexed by user position."""
+        users = np.asarray(users)
+        selected = np.zeros(len(self.users), dtype=bool)
+        selected[users] = True
+        keep = selected[self.pair_users]
+        names = pd.Series(np.asarray(self.roles, dtype=object)[self.pair_roles[keep]], index=self.pair_users[keep])
+        return names.groupby(level=0, sort=True).agg(sep.join).reindex(users, fill_value="")
+
+
+def role_index(df: pd.DataFrame) -> RoleIndex:
+    """The index of ``df``, built on first use."""
+    return per_dataset(df, RoleIndex, "Role")
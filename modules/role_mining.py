@@ -0,0 +1,156 @@
+"""
+Role mining and least-privilege checks over the user x role bitsets of
+``modules.role_index.RoleIndex``.
+
+- similarity: Jaccard |A & B| / |A | B| of two role sets, computed with
+  ``np.bitwise_count`` (popcount) over the packed uint64 words, tile by tile
+  (``BLOCK`` x ``BLOCK`` sets at a time) so memory stays bounded
+- candidate roles: users are first grouped by identical role set, then sets
+  with a similarity >= ``threshold`` are joined (connected components); every
+  group is a candidate role with the roles most of its users hold
+- outliers: a user holding a role that few users of the same agent hold, or
+  a sensitive role (``SENSITIVE_ROLES``) that is rare overall
+"""
+import numpy as np
+import pandas as pd
+
+from modules.role_index import RoleIndex
+
+# Sets compared per tile side (BLOCK x BLOCK x words uint64 per tile)
+BLOCK = 1024
+
+# Roles that should stay with very few users
+SENSITIVE_ROLES = ("ALL COMPANY PAYMENT", "USER ADMIN", "RB Admin", "SYSTEM", "SYSTEMS MANAGEMENT", "REFUND ROLE")
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of roles in every bitset (last axis = words)."""
+    return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+
+def jaccard_blocks(bits: np.ndarray, block: int = BLOCK):
+    """
+    Yield (rows, cols, similarity) tiles of the Jaccard matrix of ``bits``
+    for the upper triangle (tiles with rows.start <= cols.start).
+    """
+    sizes = popcount(bits)
+    n = len(bits)
+    for i in range(0, n, block):
+        rows = slice(i, min(i + block, n))
+        left = bits[rows, None, :]
+        for j in range(i, n, block):
+            cols = slice(j, min(j + block, n))
+            inter = np.bitwise_count(left & bits[None, cols, :]).sum(axis=-1, dtype=np.int64)
+            union = sizes[rows, None] + sizes[None, cols] - inter
+            yield rows, cols, np.divide(inter, union, out=np.ones(inter.shape), where=union > 0)
+
+
+def _components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Connected component label (smallest member) of every node for the edges a[k] - b[k]."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]  # pointer jumping
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def candidate_roles(index: RoleIndex, threshold: float = 0.8, core_share: float = 0.5) -> pd.DataFrame:
+    """
+    Groups of users with near-identical role sets, largest first: number of
+    users and of distinct role sets, the core roles (held by at least
+    ``core_share`` of the group) and the users' IDs.
+    """
+    # -------- كل مجموعة أدوار مختلفة مرة واحدة --------
+    sets, user_set = np.unique(index.bits, axis=0, return_inverse=True)
+    user_set = user_set.ravel()
+
+    edges_a, edges_b = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for rows, cols, similarity in jaccard_blocks(sets):
+        r, c = np.nonzero(similarity >= threshold)
+        r, c = r + rows.start, c + cols.start
+        keep = r < c
+        edges_a.append(r[keep])
+        edges_b.append(c[keep])
+    set_group = _components(len(sets), np.concatenate(edges_a), np.concatenate(edges_b))
+    user_group = set_group[user_set]
+
+    # -------- الأدوار الأساسية لكل مجموعة --------
+    group_codes, group_of_user = np.unique(user_group, return_inverse=True)
+    n_groups, n_roles = len(group_codes), len(index.roles)
+    group_size = np.bincount(group_of_user, minlength=n_groups)
+    holders = np.bincount(
+        group_of_user[index.pair_users] * n_roles + index.pair_roles, minlength=n_groups * n_roles
+    ).reshape(n_groups, n_roles)
+    core = holders >= np.ceil(group_size[:, None] * core_share)
+
+    roles = np.asarray(index.roles, dtype=object)
+    user_ids = index.users["User ID"].to_numpy(dtype=object)
+    members = pd.Series(user_ids).groupby(group_of_user).agg(", ".join)
+    result = pd.DataFrame({
+        "Users": group_size,
+        "Role Sets": np.bincount(np.searchsorted(group_codes, set_group), minlength=n_groups),
+        "Core Roles": [", ".join(roles[row]) for row in core],
+        "User IDs": members.reindex(np.arange(n_groups), fill_value="").to_numpy(),
+    })
+    return result.sort_values(["Users", "Role Sets"], ascending=False, kind="stable", ignore_index=True)
+
+
+def privilege_outliers(index: RoleIndex, peer_share: float = 0.2, min_peers: int = 3,
+                       rare_users: int = 5, sensitive=SENSITIVE_ROLES) -> pd.DataFrame:
+    """
+    (user, role) pairs that deviate from the user's peers.
+
+    - ``peer_share``: the role is held by less than this share of the users of
+      the same agent (agents with at least ``min_peers`` users)
+    - sensitive roles held by at most ``rare_users`` users overall
+    The ``Peer Similarity`` column is the user's mean Jaccard similarity to the
+    other users of the agent.
+    """
+    users = index.users
+    agent_codes, agents = pd.factorize(users["Agent Code"])
+    n_agents, n_roles = len(agents), len(index.roles)
+    agent_size = np.bincount(agent_codes, minlength=n_agents)
+
+    # -------- عدد من يحمل كل دور داخل كل وكيل --------
+    pair_agent = agent_codes[index.pair_users]
+    agent_role = np.bincount(pair_agent * n_roles + index.pair_roles, minlength=n_agents * n_roles)
+    share = agent_role[pair_agent * n_roles + index.pair_roles] / agent_size[pair_agent]
+
+    role_users = np.bincount(index.pair_roles, minlength=n_roles)
+    is_sensitive = np.isin(np.asarray(index.roles, dtype=object), list(sensitive))
+
+    uncommon = (share < peer_share) & (agent_size[pair_agent] >= min_peers)
+    rare_sensitive = is_sensitive[index.pair_roles] & (role_users[index.pair_roles] <= rare_users)
+    flagged = uncommon | rare_sensitive
+
+    result = users.take(index.pair_users[flagged]).reset_index(drop=True)
+    result["Role"] = np.asarray(index.roles, dtype=object)[index.pair_roles[flagged]]
+    result["Agent Holders"] = agent_role[(pair_agent * n_roles + index.pair_roles)[flagged]]
+    result["Agent Users"] = agent_size[pair_agent[flagged]]
+    result["Role Users"] = role_users[index.pair_roles[flagged]]
+    result["Reason"] = np.where(rare_sensitive[flagged], "rare sensitive role", "uncommon for agent")
+    result["Peer Similarity"] = _peer_similarity(index, agent_codes)[index.pair_users[flagged]]
+    return result.sort_values(["Role Users", "Agent Holders"], kind="stable", ignore_index=True)
+
+
+def _peer_similarity(index: RoleIndex, agent_codes: np.ndarray) -> np.ndarray:
+    """Mean Jaccard similarity of every user to the other users of the same agent (NaN alone)."""
+    order = np.argsort(agent_codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(agent_codes[order])) + 1
+    result = np.full(len(agent_codes), np.nan)
+    for members in np.split(order, bounds):
+        if len(members) < 2:
+            continue
+        total = np.zeros(len(members))
+        for rows, cols, similarity in jaccard_blocks(index.bits[members]):
+            total[rows] += similarity.sum(axis=1)
+            if rows.start != cols.start:
+                total[cols] += similarity.sum(axis=0)
+        # without the user's similarity to itself (1)
+        result[members] = (total - 1) / (len(members) - 1)
+    return result
@@ -0,0 +1,100 @@
+"""
+Outbound / inbound rotation matching for the round-trip page.
+
+A rotation is a leg out of a home base (DAM/ALP) and the nearest reciprocal
+leg back on the same day or later, within ``window``. The legs are sorted
+once by city pair, date and flight_no and each pair is matched in one pass:
+
+- legs: seat rows summed per flight_date x flight_no x origin x destination
+- outbound legs are walked in time order; each takes the nearest inbound leg
+  of its pair at or after its date that no earlier outbound leg took
+- an outbound leg with no free inbound leg within ``window`` is reported
+  without a return
+
+Inbound legs skipped by one outbound leg are older than every later one, so
+a single pointer per pair is enough: O(n log n) for the sort, O(n) after.
+"""
+import numpy as np
+import pandas as pd
+
+# المحطات التي تبدأ منها الرحلات (الذهاب = الإقلاع من إحداها)
+HOME_BASES = ("DAM", "ALP")
+
+DEFAULT_WINDOW = pd.Timedelta(days=7)
+
+LEG_KEYS = ["flight_date", "flight_no", "origin", "destination"]
+LEG_MEASURES = ["seats_sold", "seats_allocated", "fare_usd"]
+
+
+def flight_legs(df: pd.DataFrame, home_bases=HOME_BASES) -> pd.DataFrame:
+    """One row per leg with its city pair and direction (``outbound``)."""
+    legs = df.groupby(LEG_KEYS, observed=True)[LEG_MEASURES].sum().reset_index()
+
+    origin = legs["origin"].astype(str)
+    destination = legs["destination"].astype(str)
+    forward = origin <= destination
+    legs["pair"] = origin.where(forward, destination) + "-" + destination.where(forward, origin)
+
+    # -------- الاتجاه: من المحطة الأساسية = ذهاب، وإلا حسب الترتيب الأبجدي --------
+    from_base = origin.isin(home_bases)
+    to_base = destination.isin(home_bases)
+    legs["outbound"] = np.where(from_base != to_base, from_base, forward)
+
+    return legs.sort_values(["pair", "flight_date", "flight_no"], kind="stable", ignore_index=True)
+
+
+def _nearest_returns(pair_codes: np.ndarray, dates: np.ndarray, outbound: np.ndarray, window: int) -> np.ndarray:
+    """
+    Position of the inbound leg matched with every leg (-1 for inbound legs
+    and unmatched outbound legs). The legs are sorted by pair, then date.
+    """
+    matched = np.full(len(dates), -1)
+    bounds = np.flatnonzero(np.diff(pair_codes)) + 1
+    for group in np.split(np.arange(len(dates)), bounds):
+        inbound = group[~outbound[group]]
+        free = 0
+        for leg in group[outbound[group]]:
+            # رحلات العودة قبل هذا التاريخ لن تصلح لأي رحلة ذهاب لاحقة
+            while free < len(inbound) and dates[inbound[free]] < dates[leg]:
+                free += 1
+            if free < len(inbound) and dates[inbound[free]] <= dates[leg] + window:
+                matched[leg] = inbound[free]
+                free += 1
+    return matched
+
+
+def match_rotations(df: pd.DataFrame, window=DEFAULT_WINDOW, home_bases=HOME_BASES) -> pd.DataFrame:
+    """
+    Pair every outbound leg of ``df`` (seat inventory rows with origin /
+    destination) with the nearest inbound leg of the same city pair within
+    ``window``.
+
+    One row per outbound leg: ``*_out`` and ``*_in`` columns (``*_in`` empty
+    when no return was found), ``rotation_load_factor`` (both legs' seats
+    sold / allocated, %) and ``rotation_revenue`` (USD).
+    """
+    legs = flight_legs(df, home_bases)
+    dates = legs["flight_date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    window = pd.Timedelta(window).value
+    matched = _nearest_returns(pd.factorize(legs["pair"])[0], dates, legs["outbound"].to_numpy(), window)
+
+    # -------- رحلة الذهاب + رحلة العودة التي أخذتها (إن وجدت) --------
+    leg_cols = ["flight_no", "origin", "destination"] + LEG_MEASURES
+    out_rows = np.flatnonzero(legs["outbound"].to_numpy())
+    out_legs = legs.iloc[out_rows]
+    in_legs = legs.reindex(matched[out_rows])  # -1 -> empty row
+    rotations = pd.concat([
+        out_legs[["pair", "flight_date"]].reset_index(drop=True),
+        out_legs[leg_cols].add_suffix("_out").reset_index(drop=True),
+        in_legs[leg_cols].add_suffix("_in").reset_index(drop=True),
+        in_legs[["flight_date"]].rename(columns={"flight_date": "return_date"}).reset_index(drop=True),
+    ], axis=1)
+    rotations = rotations.sort_values(["flight_date", "flight_no_out"], kind="stable", ignore_index=True)
+
+    # ---------- Load Factor و Revenue للرحلة كاملة ----------
+    sold = rotations["seats_sold_out"] + rotations["seats_sold_in"].fillna(0)
+    allocated = rotations["seats_allocated_out"] + rotations["seats_allocated_in"].fillna(0)
+    rotations["rotation_load_factor"] = (sold / allocated.where(allocated > 0) * 100).fillna(0)
+    rotations["rotation_revenue"] = rotations["fare_usd_out"] + rotations["fare_usd_in"].fillna(0)
+    rotations["days_away"] = (rotations["return_date"] - rotations["flight_date"]).dt.days
+    return rotations.rename(columns={"flight_date": "departure_date"})
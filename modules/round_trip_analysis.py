@@ -1,71 +1,33 @@
 # modules/round_trip_analysis.py
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 import plotly.express as px
+from modules.paged_grid import paged_grid
+from modules.rotations import match_rotations
 
 def show(df):
     st.title("✈️ Round-Trip Performance Analysis")
 
-    # ---------- تنظيف الأعمدة ----------
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-    # الأعمدة الرقمية الأساسية
-    numeric_cols = {
-        "fare_usd": "fare_collection(usd)",
-        "seats_sold": "seats_sold",
-        "seats_allocated": "seats_allocate",
-        "seats_available": "seats_available"
-    }
-
-    for new_col, orig_col in numeric_cols.items():
-        if orig_col in df.columns:
-            df[new_col] = pd.to_numeric(df[orig_col], errors="coerce").fillna(0)
-        else:
-            df[new_col] = 0
-
-    # ---------- تحويل التاريخ ----------
-    if "flight_date" in df.columns:
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
-    else:
-        st.error("Column 'flight_date' not found in the CSV!")
+    # الأعمدة المشتقة (origin, destination, round_trip_id, load_factor, avg_fare_per_seat)
+    # تأتي جاهزة من data_loader.load_round_trips
+    if "round_trip_id" not in df.columns:
+        st.error("Round-trip columns not found, load the data with load_round_trips()!")
         return
 
-    # ---------- استخراج Origin و Destination ----------
-    df["origin"] = df["segment"].str.split("/").str[0]
-    df["destination"] = df["segment"].str.split("/").str[1]
-
-    # ---------- إنشاء Round-Trip ID ----------
-    df["round_trip_id"] = df.apply(
-        lambda row: f"{min(row['origin'], row['destination'])}-{max(row['origin'], row['destination'])}-{row['flight_date'].date()}",
-        axis=1
-    )
-
-    # ---------- حساب Load Factor و Avg Fare ----------
-    df["load_factor"] = (df["seats_sold"] / df["seats_allocated"] * 100).fillna(0)
-    df["avg_fare_per_seat"] = (df["fare_usd"] / df["seats_sold"]).fillna(0)
-
     # ---------- عرض الجدول ----------
     st.subheader("📊 Round-Trip Table (Filtered Data)")
-    gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_default_column(filter=True, sortable=True, resizable=True, wrapText=True)
-    for col in df.columns:
-        gb.configure_column(col, minWidth=120, maxWidth=400)
-    grid_options = gb.build()
-
-    grid_response = AgGrid(
-        df,
-        gridOptions=grid_options,
+    table = df.drop(columns=[col for col in ['report_from_date', 'report_to_date'] if col in df.columns])
+    # الـ KPIs والمخططات تحت الجدول تتبع البحث في الجدول
+    df_filtered = paged_grid(
+        table,
+        key="round_trip_grid",
+        default_column={'minWidth': 120, 'maxWidth': 400},
         enable_enterprise_modules=False,
         fit_columns_on_grid_load=True,
         height=600,
-        width="100%",
-        update_mode=GridUpdateMode.MODEL_CHANGED
+        width="100%"
     )
 
-    df_filtered = pd.DataFrame(grid_response["data"])
-
     # ---------- KPIs ----------
     total_revenue = df_filtered["fare_usd"].sum()
     total_seats_sold = df_filtered["seats_sold"].sum()
@@ -121,3 +83,40 @@ def show(df):
         labels={"avg_fare_per_seat": "Avg Fare / Seat (USD)", "load_factor": "Load Factor (%)"}
     )
     st.plotly_chart(fig3, use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------- Rotations: ذهاب + أقرب عودة ----------
+    st.subheader("🔄 Rotations (Outbound + Return)")
+    window_days = st.slider("Return window (days)", min_value=0, max_value=30, value=7, key="rotation_window_days")
+    rotations = match_rotations(df, window=pd.Timedelta(days=window_days))
+    if rotations.empty:
+        st.warning("⚠️ No outbound legs found.")
+        return
+
+    matched = rotations[rotations["return_date"].notna()]
+    sold = matched["seats_sold_out"].sum() + matched["seats_sold_in"].sum()
+    allocated = matched["seats_allocated_out"].sum() + matched["seats_allocated_in"].sum()
+
+    kpi1, kpi2, kpi3 = st.columns(3)
+    kpi1.metric("Matched Rotations", f"{len(matched):,} / {len(rotations):,}")
+    kpi2.metric("Rotation Load Factor", f"{(sold / allocated * 100) if allocated > 0 else 0:.1f}%")
+    kpi3.metric("Rotation Revenue (USD)", f"{matched['rotation_revenue'].sum():,.0f}")
+
+    by_pair = matched.groupby("pair").agg(
+        rotations=("rotation_revenue", "size"),
+        seats_sold=("seats_sold_out", "sum"),
+        seats_sold_return=("seats_sold_in", "sum"),
+        avg_load_factor=("rotation_load_factor", "mean"),
+        revenue=("rotation_revenue", "sum"),
+        avg_days_away=("days_away", "mean")
+    ).reset_index().sort_values("revenue", ascending=False)
+    st.dataframe(by_pair.style.format({
+        "seats_sold_return": "{:,.0f}",
+        "avg_load_factor": "{:.1f}%",
+        "revenue": "{:,.0f}",
+        "avg_days_away": "{:.1f}"
+    }), hide_index=True)
+
+    with st.expander("All rotations"):
+        st.dataframe(rotations, hide_index=True)
@@ -1,13 +1,24 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import pandas as pd
+from modules.chart_cache import show_chart
+
+def draw_class_sales(ax, class_sales):
+    class_sales[["seats_sold","seats_allocated"]].plot(kind="bar", stacked=True, ax=ax, color=["skyblue","lightgreen"])
+    ax.set_ylabel("Seats")
+    ax.set_xlabel("Class of Service")
+    ax.set_title("Seats Sold vs Available by Class")
+    ax.legend(["Seats Sold", "Seats Available"])
+
+    # ---------- عرض عدد المقاعد فوق كل عمود ----------
+    for i, val in enumerate(class_sales["seats_sold"]):
+        ax.text(i, val + max(class_sales["seats_allocated"])*0.01, f"{int(val)}", ha='center', va='bottom', fontsize=8, color='black')
 
 def show(df):
     st.title("🎟️ Sales by Class of Service")
 
     # ---------- تحويل التاريخ إذا لم يكن datetime ----------
     if not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
+        df = df.assign(flight_date=pd.to_datetime(df["flight_date"], errors="coerce"))
 
     # ---------- فلتر الوجهات ----------
     st.subheader("✈️ Filter by Segment")
@@ -57,18 +68,7 @@ def show(df):
         class_sales["occupancy_rate (%)"] = (class_sales["seats_sold"] / total_seats * 100).round(1)
 
         # ---------- رسم المخطط ----------
-        fig, ax = plt.subplots(figsize=(8,5))
-        class_sales[["seats_sold","seats_allocated"]].plot(kind="bar", stacked=True, ax=ax, color=["skyblue","lightgreen"])
-        ax.set_ylabel("Seats")
-        ax.set_xlabel("Class of Service")
-        ax.set_title("Seats Sold vs Available by Class")
-        ax.legend(["Seats Sold", "Seats Available"])
-
-        # ---------- عرض عدد المقاعد فوق كل عمود ----------
-        for i, val in enumerate(class_sales["seats_sold"]):
-            ax.text(i, val + max(class_sales["seats_allocated"])*0.01, f"{int(val)}", ha='center', va='bottom', fontsize=8, color='black')
-
-        st.pyplot(fig)
+        show_chart(draw_class_sales, class_sales[["seats_sold","seats_allocated"]], figsize=(8,5))
 
         # ---------- عرض الجدول ----------
         st.subheader("💺 Seats Summary by Class")
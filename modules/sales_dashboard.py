@@ -1,20 +1,13 @@
 import streamlit as st
+from modules.lazy_tabs import lazy_tabs
 from modules.sales_reports import summary_by_currency, top_agents_by_currency, agent_summary
 
 def show(df):
     st.title("💰 Sales Dashboard")
 
-    # إنشاء Tabs علوية
-    tab_names = [
-        "📊 Currency Totals",
-        "🏅 Top Agents by Currency",
-        "🗂️ Agent Summary"
-    ]
-    tabs = st.tabs(tab_names)
-
-    with tabs[0]:
-        summary_by_currency.show(df)
-    with tabs[1]:
-        top_agents_by_currency.show(df)
-    with tabs[2]:
-        agent_summary.show(df)
+    # إنشاء Tabs علوية (التبويب المختار فقط يُحسب ويُعرض)
+    lazy_tabs([
+        ("📊 Currency Totals", lambda: summary_by_currency.show(df), None),
+        ("🏅 Top Agents by Currency", lambda: top_agents_by_currency.show(df), ["top_agents_"]),
+        ("🗂️ Agent Summary", lambda: agent_summary.show(df), ["agent_summary_"])
+    ], key="sales_dashboard_tab")
@@ -1,7 +1,33 @@
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder
-import matplotlib.pyplot as plt
+from matplotlib import colormaps
+from modules.chart_cache import show_chart
+from modules.paged_grid import paged_grid
+
+def draw_agent_counts(ax, agent_counts_all):
+    bars = ax.bar(
+        agent_counts_all.index,
+        agent_counts_all.values,
+        color=colormaps["viridis"](agent_counts_all.values / agent_counts_all.values.max())
+    )
+    ax.set_xlabel("Currency", fontsize=14)
+    ax.set_ylabel("Number of Agents", fontsize=14)
+    ax.set_title("Number of Agents per Currency", fontsize=16)
+
+    # عرض العدد أعلى كل عمود
+    for bar in bars:
+        height = bar.get_height()
+        ax.annotate(
+            f'{int(height)}',
+            xy=(bar.get_x() + bar.get_width() / 2, height),
+            xytext=(0,5),
+            textcoords="offset points",
+            ha='center', va='bottom',
+            fontsize=12
+        )
+
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
 
 def show(df):
     st.title("📊 Agent Summary by Currency")
@@ -11,7 +37,8 @@ def show(df):
     selected_agent = st.selectbox(
         "Select Agent (or leave to see all)",
         options=["All"] + all_agents,
-        index=0
+        index=0,
+        key="agent_summary_agent"
     )
 
     # ---------- فلتر العملات ----------
@@ -19,11 +46,12 @@ def show(df):
     selected_currency = st.selectbox(
         "Select Currency (or leave to see all)",
         options=["All"] + all_currencies,
-        index=0
+        index=0,
+        key="agent_summary_currency"
     )
 
     # ---------- تطبيق الفلاتر ----------
-    df_filtered = df.copy()
+    df_filtered = df
     if selected_agent != "All":
         df_filtered = df_filtered[df_filtered['Agent/GSA Name'] == selected_agent]
     if selected_currency != "All":
@@ -34,29 +62,18 @@ def show(df):
         return
 
     # ---------- إعداد الجدول النهائي ----------
-    display_df = df_filtered[['Agent/GSA Name', 'Currency', 'Net Amount']].copy()
-
-    gb = GridOptionsBuilder.from_dataframe(display_df)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_default_column(
-        editable=False,
-        filter=True,
-        sortable=True,
-        resizable=True,
-        wrapText=True,
-        minWidth=150,
-        cellStyle={'font-size': '16px'}
-    )
-    gb.configure_column("Agent/GSA Name", minWidth=300)
-    gb.configure_column("Currency", minWidth=200)
-    gb.configure_column("Net Amount", minWidth=200)
-    gb.configure_grid_options(headerHeight=40)
-    grid_options = gb.build()
+    display_df = df_filtered[['Agent/GSA Name', 'Currency', 'Net Amount']]
 
     st.subheader("📂 Agent Summary Table")
-    AgGrid(
+    paged_grid(
         display_df,
-        gridOptions=grid_options,
+        key="agent_summary_grid",
+        default_column={'minWidth': 150, 'cellStyle': {'font-size': '16px'}},
+        columns={
+            "Agent/GSA Name": {'minWidth': 300},
+            "Currency": {'minWidth': 200},
+            "Net Amount": {'minWidth': 200}
+        },
         height=600,
         width='100%',
         fit_columns_on_grid_load=True
@@ -68,30 +85,6 @@ def show(df):
     st.subheader("📈 Number of Agents per Currency (All Data)")
 
     # نستخدم df الأصلي هنا
-    agent_counts_all = df.groupby('Currency')['Agent/GSA Name'].nunique().sort_values(ascending=False)
-
-    fig, ax = plt.subplots(figsize=(10,5))
-    bars = ax.bar(
-        agent_counts_all.index,
-        agent_counts_all.values,
-        color=plt.cm.viridis(agent_counts_all.values / agent_counts_all.values.max())
-    )
-    ax.set_xlabel("Currency", fontsize=14)
-    ax.set_ylabel("Number of Agents", fontsize=14)
-    ax.set_title("Number of Agents per Currency", fontsize=16)
+    agent_counts_all = df.groupby('Currency', observed=True)['Agent/GSA Name'].nunique().sort_values(ascending=False)
 
-    # عرض العدد أعلى كل عمود
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(
-            f'{int(height)}',
-            xy=(bar.get_x() + bar.get_width() / 2, height),
-            xytext=(0,5),
-            textcoords="offset points",
-            ha='center', va='bottom',
-            fontsize=12
-        )
-
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    st.pyplot(fig)
+    show_chart(draw_agent_counts, agent_counts_all, figsize=(10,5))
@@ -0,0 +1,73 @@
+"""
+Per-currency agent ranking for the Top Agents tab.
+
+``CurrencyRanking`` sums Net Amount per (Currency, agent) once per dataset and
+keeps, for every currency, the agents sorted by amount (descending). Top N of
+a currency is then a slice of those arrays. The same structure ranks all
+currencies together in USD equivalents: the per-currency totals are converted
+with a rate table (``usd_rates``, from finance's ``data/usd_rates.csv``) and
+summed per agent, once per rate table.
+
+Rates are keyed by the currency code as the exports write it: "TRL" is the
+Turkish lira (ISO code TRY since 2005).
+"""
+import numpy as np
+import pandas as pd
+
+from modules.shared_cache import per_dataset
+
+AGENT_COLUMN = "Agent/GSA Name"
+ALL_CURRENCIES_USD = "All currencies (USD equivalent)"
+
+
+
+def usd_rates(rates: pd.DataFrame) -> dict:
+    """{currency: USD per unit} of a ``load_usd_rates`` table."""
+    return dict(zip(rates["currency"], rates["usd_per_unit"].astype(float)))
+
+
+def _ranked(names: np.ndarray, amounts: np.ndarray) -> tuple:
+    order = np.argsort(-amounts, kind="stable")
+    return names[order], amounts[order]
+
+
+class CurrencyRanking:
+    def __init__(self, df: pd.DataFrame):
+        # -------- تجميع واحد لكل (عملة، وكيل) --------
+        totals = df.groupby(["Currency", AGENT_COLUMN], observed=True)["Net Amount"].sum().reset_index()
+        self.totals = totals
+        self.currencies = list(pd.unique(totals["Currency"].astype(str)))
+
+        currency = totals["Currency"].astype(str).to_numpy()
+        names = totals[AGENT_COLUMN].astype(str).to_numpy()
+        amounts = totals["Net Amount"].to_numpy(dtype="float64")
+        self._rankings = {
+            code: _ranked(names[currency == code], amounts[currency == code]) for code in self.currencies
+        }
+        self._usd = {}
+
+    def usd_ranking(self, rates: dict) -> tuple:
+        """(agents, USD amounts) over all currencies with a rate in ``rates``, largest first."""
+        key = tuple(sorted(rates.items()))
+        ranking = self._usd.get(key)
+        if ranking is None:
+            rate = self.totals["Currency"].astype(str).map(rates).to_numpy(dtype="float64")
+            known = ~np.isnan(rate)
+            usd = pd.Series(self.totals["Net Amount"].to_numpy()[known] * rate[known])
+            by_agent = usd.groupby(self.totals[AGENT_COLUMN].astype(str).to_numpy()[known]).sum()
+            ranking = _ranked(by_agent.index.to_numpy(), by_agent.to_numpy())
+            self._usd[key] = ranking
+        return ranking
+
+    def top(self, currency: str, n: int, rates: dict = None) -> pd.Series:
+        """Net Amount of the ``n`` largest agents of ``currency`` (or ``ALL_CURRENCIES_USD``)."""
+        names, amounts = self.usd_ranking(rates) if currency == ALL_CURRENCIES_USD else self._rankings[currency]
+        return pd.Series(amounts[:n], index=pd.Index(names[:n], name=AGENT_COLUMN), name="Net Amount")
+
+    def missing_rates(self, rates: dict) -> list:
+        return [code for code in self.currencies if code not in rates]
+
+
+def currency_ranking(df: pd.DataFrame) -> CurrencyRanking:
+    """The ranking of ``df``, built on first use."""
+    return per_dataset(df, CurrencyRanking, "Currency")
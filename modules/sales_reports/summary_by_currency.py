@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 
 def show(df):
     st.subheader("💰 Currency Totals")
@@ -13,8 +12,8 @@ def show(df):
         return
 
     # -------- عرض فترة التقرير بشكل رسمي في بطاقة --------
-    from_date = df['report_from_date'].iloc[0] if 'report_from_date' in df.columns else None
-    to_date = df['report_to_date'].iloc[0] if 'report_to_date' in df.columns else None
+    from_date = df['report_from_date'].min() if 'report_from_date' in df.columns else None
+    to_date = df['report_to_date'].max() if 'report_to_date' in df.columns else None
 
     if from_date and to_date:
         st.markdown(
@@ -37,11 +36,8 @@ def show(df):
             unsafe_allow_html=True
         )
 
-    # تنظيف وتحويل العمود الرقمي
-    df["Net Amount"] = pd.to_numeric(df["Net Amount"], errors="coerce")
-
     # حساب المجموع لكل عملة
-    summary = df.groupby("Currency")["Net Amount"].sum().reset_index()
+    summary = df.groupby("Currency", observed=True)["Net Amount"].sum().reset_index()
 
     # ألوان مميزة
     colors = ["#1E88E5", "#43A047", "#FB8C00", "#8E24AA", "#E53935", "#00ACC1"]
@@ -1,20 +1,40 @@
 import streamlit as st
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
+from modules.chart_cache import show_chart
+from modules.data_loader import USD_RATES_FILE, load_usd_rates
+from modules.sales_reports.currency_ranking import ALL_CURRENCIES_USD, currency_ranking, usd_rates
 
-def show(df):
-    st.subheader("Top 20 Agents for Selected Currency")
-    currency_to_compare = st.selectbox("Select currency", df['Currency'].unique())
-    df_currency = df[df['Currency'] == currency_to_compare]
-    net_amount_by_agent = df_currency.groupby('Agent/GSA Name')['Net Amount'].sum().sort_values(ascending=False)
-    top_agents = net_amount_by_agent.head(20)
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(x=top_agents.values, y=top_agents.index, palette='viridis', ax=ax)
-    ax.set_title(f'Net Amount by Agent/GSA Name for Currency: {currency_to_compare}')
+def draw_top_agents(ax, top_agents, currency):
+    sns.barplot(x=top_agents.values, y=top_agents.index.astype(str), palette='viridis', ax=ax)
+    ax.set_title(f'Net Amount by Agent/GSA Name for Currency: {currency}')
     ax.set_xlabel('Net Amount')
     ax.set_ylabel('Agent/GSA Name')
     for i, v in enumerate(top_agents.values):
         ax.text(v + max(top_agents.values)*0.01, i, f"{v:,.2f}", color='black', va='center')
-    st.pyplot(fig)
+
+def show(df):
+    ranking = currency_ranking(df)
+
+    top_n = st.slider("Top N agents", min_value=5, max_value=50, value=20, key="top_agents_n")
+    st.subheader(f"Top {top_n} Agents for Selected Currency")
+    currency_to_compare = st.selectbox("Select currency", ranking.currencies + [ALL_CURRENCIES_USD], key="top_agents_currency")
+
+    rates = None
+    if currency_to_compare == ALL_CURRENCIES_USD:
+        table = load_usd_rates(USD_RATES_FILE)
+        used = table[table["currency"].isin(ranking.currencies)]
+        rates = usd_rates(table)
+        missing = ranking.missing_rates(rates)
+        dates = used["rate_date"] if len(used) else table["rate_date"]
+        as_of = f"{dates.min():%d/%m/%Y}" + (f" – {dates.max():%d/%m/%Y}" if dates.max() != dates.min() else "")
+        listed = ", ".join(f"{row.currency} {row.usd_per_unit:.6g}" for row in used.itertuples())
+        st.caption(f"USD per unit, rates of {as_of} ({USD_RATES_FILE}): {listed}"
+                   + (f" — no rate for {', '.join(missing)} (excluded)" if missing else ""))
+    top_agents = ranking.top(currency_to_compare, top_n, rates)
+
+    if top_agents.empty:
+        st.warning("⚠️ No data available.")
+        return
+
+    show_chart(draw_top_agents, top_agents, figsize=(12, 6), currency=currency_to_compare)
@@ -0,0 +1,85 @@
+"""
+Pre-aggregated seat inventory cube shared by the seat inventory tabs.
+
+``SeatCube`` is built once per dataset at day x (flight_no, segment,
+class_of_service) granularity. For every cell it keeps the running totals
+of the measures along the date axis (prefix sums, with a leading row of
+zeros), so the totals of a date range are ``prefix[hi] - prefix[lo]``: one
+subtraction per cell whatever the length of the range.
+A filter + group-by is then a sum over the few thousand cells of that slice
+instead of a scan of the raw rows.
+"""
+import numpy as np
+import pandas as pd
+
+from modules.shared_cache import per_dataset
+
+DIMENSIONS = ["flight_no", "segment", "class_of_service"]
+MEASURES = ["seats_sold", "seats_allocated", "seats_available", "seats_on_hold", "seats_oversell", "fare_usd"]
+
+# الأعمدة التي يحتاجها بناء الـ cube
+CUBE_COLUMNS = ["flight_date"] + DIMENSIONS + MEASURES
+
+# Number of source rows per cell, used to drop groups with no rows in the range
+ROWS = "rows"
+
+
+class SeatCube:
+    def __init__(self, df: pd.DataFrame):
+        df = df[df["flight_date"].notna()]
+        self.measures = [m for m in MEASURES if m in df.columns]
+        dimensions = [d for d in DIMENSIONS if d in df.columns]
+
+        # -------- محور التاريخ: يوم واحد لكل صف من الـ cube --------
+        dates = df["flight_date"].to_numpy(dtype="datetime64[D]")
+        self.days, day_codes = np.unique(dates, return_inverse=True)
+
+        # -------- الخلايا: كل تركيبة (flight_no, segment, class) موجودة --------
+        cell_codes, cells = pd.MultiIndex.from_frame(df[dimensions].astype(str)).factorize()
+        self.cells = cells.to_frame(index=False, name=dimensions)
+
+        n_days, n_cells = len(self.days), len(self.cells)
+        flat = day_codes * n_cells + cell_codes
+        values = [np.bincount(flat, minlength=n_days * n_cells)]
+        for m in self.measures:
+            weights = np.nan_to_num(df[m].to_numpy(dtype="float64"))
+            values.append(np.bincount(flat, weights=weights, minlength=n_days * n_cells))
+        cube = np.stack(values, axis=-1).reshape(n_days, n_cells, len(values))
+
+        self.prefix = np.zeros((n_days + 1, n_cells, len(values)))
+        np.cumsum(cube, axis=0, out=self.prefix[1:])
+
+    def _day_range(self, start=None, end=None) -> tuple:
+        lo = 0 if start is None else np.searchsorted(self.days, np.datetime64(pd.Timestamp(start), "D"), "left")
+        hi = len(self.days) if end is None else np.searchsorted(self.days, np.datetime64(pd.Timestamp(end), "D"), "right")
+        return lo, max(lo, hi)
+
+    def cell_totals(self, start=None, end=None, segments=None) -> pd.DataFrame:
+        """Totals of every cell with start <= flight_date <= end and segment in ``segments``."""
+        lo, hi = self._day_range(start, end)
+        totals = pd.DataFrame(self.prefix[hi] - self.prefix[lo], columns=[ROWS] + self.measures)
+        totals = pd.concat([self.cells, totals], axis=1)
+
+        keep = totals[ROWS] > 0
+        if segments is not None:
+            keep &= totals["segment"].isin([str(s) for s in segments])
+        totals = totals[keep]
+
+        # counts and seats are whole numbers
+        whole = [ROWS] + [m for m in self.measures if m.startswith("seats_")]
+        return totals.astype({col: "int64" for col in whole})
+
+    def totals(self, start=None, end=None, segments=None, by=None):
+        """
+        Measure totals over the selection, grouped by the dimensions in ``by``.
+        Without ``by`` a Series with the grand totals is returned.
+        """
+        totals = self.cell_totals(start, end, segments)
+        if not by:
+            return totals[self.measures].sum()
+        return totals.groupby(by, sort=True)[self.measures].sum().reset_index()
+
+
+def seat_cube(df: pd.DataFrame) -> SeatCube:
+    """The cube of ``df``, built on first use."""
+    return per_dataset(df, SeatCube, "flight_date")
@@ -0,0 +1,108 @@
+"""
+Segment + date filter shared by the seat inventory tabs.
+
+``SeatFilterIndex`` is built once per dataset:
+- row positions ordered by flight_date, so a date range is two binary
+  searches (``np.searchsorted``) and a slice
+- for every segment, the positions of its rows, also ordered by flight_date
+
+A filter is answered by cutting the date range out of the runs of the
+selected segments and merging them, so its cost follows the number of
+matching rows, not the size of the frame.
+``segment_date_selection`` draws the filter widgets and returns the selection,
+``segment_date_filter`` also applies it and returns the matching rows.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.shared_cache import per_dataset
+
+
+class SeatFilterIndex:
+    def __init__(self, df: pd.DataFrame):
+        dates = df["flight_date"].to_numpy(dtype="datetime64[ns]")
+        self.date_order = np.argsort(dates, kind="stable")
+        self.sorted_dates = dates[self.date_order]
+        valid = ~np.isnat(self.sorted_dates)
+        self.min_date = pd.Timestamp(self.sorted_dates[valid][0]) if valid.any() else None
+        self.max_date = pd.Timestamp(self.sorted_dates[valid][-1]) if valid.any() else None
+
+        # -------- positions per segment, each ordered by flight_date --------
+        codes, segments = pd.factorize(df["segment"].astype(str), sort=True)
+        by_segment = self.date_order[np.argsort(codes[self.date_order], kind="stable")]
+        bounds = np.searchsorted(codes[by_segment], np.arange(len(segments) + 1))
+        self.segments = list(segments)
+        self.segment_positions = {
+            segment: by_segment[bounds[i]:bounds[i + 1]] for i, segment in enumerate(self.segments)
+        }
+        self.segment_dates = {
+            segment: dates[positions] for segment, positions in self.segment_positions.items()
+        }
+
+    @staticmethod
+    def _date_slice(sorted_dates: np.ndarray, start, end) -> slice:
+        lo = 0 if start is None else np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(start), "ns"), "left")
+        hi = len(sorted_dates) if end is None else np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(end), "ns"), "right")
+        return slice(lo, hi)
+
+    def positions(self, start=None, end=None, segments=None) -> np.ndarray:
+        """Row positions (ascending) with start <= flight_date <= end and segment in ``segments``."""
+        if segments is None or set(segments) >= set(self.segments):
+            return np.sort(self.date_order[self._date_slice(self.sorted_dates, start, end)])
+
+        # every segment is a date-ordered run: two binary searches per segment
+        parts = [
+            self.segment_positions[s][self._date_slice(self.segment_dates[s], start, end)]
+            for s in dict.fromkeys(segments) if s in self.segment_positions
+        ]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+    def filter(self, df: pd.DataFrame, start=None, end=None, segments=None) -> pd.DataFrame:
+        return df.take(self.positions(start, end, segments))
+
+
+def filter_index(df: pd.DataFrame) -> SeatFilterIndex:
+    return per_dataset(df, SeatFilterIndex, "flight_date")
+
+
+def segment_date_selection(df: pd.DataFrame, key: str, heading=st.subheader):
+    """
+    Draw the segment and date filters (widget keys prefixed with ``key``).
+    Returns (start_date, end_date, segments), ``segments`` is None for all segments.
+    """
+    index = filter_index(df)
+
+    # ---------- فلتر الوجهات ----------
+    heading("✈️ Filter by Segment")
+    all_segments = index.segments
+    segment_filter_type = st.selectbox(
+        "Choose Segment Filter Type",
+        ["All Segments", "Custom Selection"],
+        index=0,
+        key=f"{key}_segment_filter"
+    )
+    selected_segments = all_segments if segment_filter_type == "All Segments" else st.multiselect(
+        "Select Segments",
+        options=all_segments,
+        default=all_segments[:2],
+        key=f"{key}_multiselect_segments"
+    )
+
+    # ---------- فلتر التاريخ ----------
+    heading("📅 Filter by Date")
+    min_date, max_date = index.min_date, index.max_date
+    start_date = pd.to_datetime(st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key=f"{key}_start_date"))
+    end_date = pd.to_datetime(st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key=f"{key}_end_date"))
+
+    if segment_filter_type == "All Segments":
+        selected_segments = None
+    return start_date, end_date, selected_segments or None
+
+
+def segment_date_filter(df: pd.DataFrame, key: str, heading=st.subheader) -> pd.DataFrame:
+    """Draw the segment and date filters and return the matching rows."""
+    start_date, end_date, segments = segment_date_selection(df, key, heading)
+
+    # ---------- تطبيق الفلاتر ----------
+    return filter_index(df).filter(df, start_date, end_date, segments)
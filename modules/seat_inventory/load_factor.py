@@ -1,62 +1,41 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import pandas as pd
+from modules.chart_cache import show_chart
+from modules.seat_inventory.cube import seat_cube
+from modules.seat_inventory.filters import segment_date_selection
 
-def show(df):
-    st.subheader("📈 Load Factor Analysis")
-
-    # تحويل التاريخ
-    if not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
+# الأعمدة التي تحتاجها الصفحة
+REQUIRED_COLUMNS = [
+    "flight_date", "segment", "seats_allocated", "seats_sold"
+]
 
-    # فلتر الوجهات
-    st.subheader("✈️ Filter by Segment")
-    all_segments = sorted(df["segment"].unique())
-    segment_filter_type = st.selectbox(
-        "Choose Segment Filter Type",
-        ["All Segments", "Custom Selection"],
-        index=0,
-        key="load_factor_segment_filter"
-    )
-    selected_segments = all_segments if segment_filter_type == "All Segments" else st.multiselect(
-        "Select Segments",
-        options=all_segments,
-        default=all_segments[:2],
-        key="load_factor_multiselect_segments"
-    )
+def draw_load_factor(ax, summary):
+    ax.bar(summary["segment"], summary["load_factor"], color="skyblue")
+    ax.set_ylabel("Load Factor (%)")
+    ax.set_xlabel("Segment")
+    ax.set_title("Load Factor per Segment")
+    ax.set_xticks(range(len(summary["segment"])))  # مهم لضبط مكان كل label
+    ax.set_xticklabels(summary["segment"], rotation=45, ha='right')
 
-    # فلتر التاريخ
-    st.subheader("📅 Filter by Date")
-    min_date, max_date = df["flight_date"].min(), df["flight_date"].max()
-    start_date = pd.to_datetime(st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key="load_factor_start_date"))
-    end_date = pd.to_datetime(st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key="load_factor_end_date"))
+def show(df):
+    st.subheader("📈 Load Factor Analysis")
 
-    # تطبيق الفلاتر
-    df_filtered = df[(df["flight_date"] >= start_date) & (df["flight_date"] <= end_date)]
-    if selected_segments:
-        df_filtered = df_filtered[df_filtered["segment"].isin(selected_segments)]
+    start_date, end_date, segments = segment_date_selection(df, key="load_factor")
 
-    if df_filtered.empty:
+    # حساب Load Factor لكل Segment (من الـ cube بدل المرور على الصفوف)
+    summary = seat_cube(df).totals(start_date, end_date, segments, by=["segment"])
+    if summary.empty:
         st.warning("⚠️ No data available for selected filters.")
         return
 
-    # حساب Load Factor لكل Segment
-    summary = df_filtered.groupby("segment").agg(
-        seats_sold_total=("seats_sold","sum"),
-        seats_allocated_total=("seats_allocated","sum")
-    ).reset_index()
+    summary = summary[["segment", "seats_sold", "seats_allocated"]].rename(columns={
+        "seats_sold": "seats_sold_total",
+        "seats_allocated": "seats_allocated_total"
+    })
     summary["load_factor"] = (summary["seats_sold_total"] / summary["seats_allocated_total"] * 100).fillna(0)
     summary = summary.sort_values("load_factor", ascending=False)
 
     # رسم Load Factor
-    fig, ax = plt.subplots(figsize=(10,5))
-    ax.bar(summary["segment"], summary["load_factor"], color="skyblue")
-    ax.set_ylabel("Load Factor (%)")
-    ax.set_xlabel("Segment")
-    ax.set_title("Load Factor per Segment")
-    ax.set_xticks(range(len(summary["segment"])))  # مهم لضبط مكان كل label
-    ax.set_xticklabels(summary["segment"], rotation=45, ha='right')
-    st.pyplot(fig)
+    show_chart(draw_load_factor, summary[["segment", "load_factor"]], figsize=(10,5))
 
     # جدول أسفل المخطط
     st.subheader("💺 Seats Summary by Segment")
@@ -67,7 +46,7 @@ def show(df):
     }))
 
     # KPI إجمالي
-    total_sold = df_filtered["seats_sold"].sum()
-    total_alloc = df_filtered["seats_allocated"].sum()
+    total_sold = summary["seats_sold_total"].sum()
+    total_alloc = summary["seats_allocated_total"].sum()
     avg_load = (total_sold / total_alloc * 100) if total_alloc > 0 else 0
     st.metric("💡 Avg Load Factor (All Segments)", f"{avg_load:.1f}%")
@@ -1,59 +1,19 @@
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder
+from modules.paged_grid import paged_grid
+from modules.seat_inventory.cube import seat_cube
+from modules.seat_inventory.filters import filter_index, segment_date_selection
+
+# الأعمدة التي تحتاجها الصفحة (وهي أعمدة الجدول)
+REQUIRED_COLUMNS = [
+    "flight_date", "flight_no", "segment", "class_of_service", "seats_allocated", "seats_sold", "seats_available", "seat_factor"
+]
 
 def show(df):
     st.title("📊 Overview")
 
-    # ---------- تحويل التاريخ ----------
-    if not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
-
-    # ---------- فلتر الوجهات ----------
-    st.header("✈️ Filter by Segment")
-    all_segments = sorted(df["segment"].unique())
-    segment_filter_type = st.selectbox(
-        "Choose Segment Filter Type",
-        ["All Segments", "Custom Selection"],
-        index=0,
-        key="overview_segment_filter"
-    )
-    selected_segments = all_segments if segment_filter_type == "All Segments" else st.multiselect(
-        "Select Segments",
-        options=all_segments,
-        default=all_segments[:2],
-        key="overview_multiselect_segments"
-    )
-
-    # ---------- فلتر التاريخ ----------
-    st.header("📅 Filter by Date")
-    min_date, max_date = df["flight_date"].min(), df["flight_date"].max()
-    start_date = pd.to_datetime(
-        st.date_input(
-            "Start Date",
-            value=min_date,
-            min_value=min_date,
-            max_value=max_date,
-            key="overview_start_date"
-        )
-    )
-    end_date = pd.to_datetime(
-        st.date_input(
-            "End Date",
-            value=max_date,
-            min_value=min_date,
-            max_value=max_date,
-            key="overview_end_date"
-        )
-    )
-
-    # ---------- تطبيق الفلاتر ----------
-    df_filtered = df[
-        (df["flight_date"] >= start_date) &
-        (df["flight_date"] <= end_date)
-    ]
-    if selected_segments:
-        df_filtered = df_filtered[df_filtered["segment"].isin(selected_segments)]
+    start_date, end_date, segments = segment_date_selection(df, key="overview", heading=st.header)
+    df_filtered = filter_index(df).filter(df, start_date, end_date, segments)
 
     if df_filtered.empty:
         st.warning("⚠️ No data available for selected filters.")
@@ -61,11 +21,12 @@ def show(df):
 
     # ---------- KPIs لكل Class of Service ----------
     st.header("💡 KPIs by Class of Service")
-    if "class_of_service" in df_filtered.columns:
-        kpi_df = df_filtered.groupby("class_of_service").agg(
-            total_seats_sold=("seats_sold", "sum"),
-            total_seats_allocated=("seats_allocated", "sum")
-        ).reset_index()
+    cube = seat_cube(df)
+    if "class_of_service" in df.columns:
+        kpi_df = cube.totals(start_date, end_date, segments, by=["class_of_service"]).rename(columns={
+            "seats_sold": "total_seats_sold",
+            "seats_allocated": "total_seats_allocated"
+        })[["class_of_service", "total_seats_sold", "total_seats_allocated"]]
         kpi_df["avg_load_factor"] = (
             kpi_df["total_seats_sold"] / kpi_df["total_seats_allocated"] * 100
         ).fillna(0)
@@ -94,28 +55,20 @@ def show(df):
 
     # ---------- جدول البيانات ----------
     st.header("📂 Data Table (Filtered & Cleaned)")
-    gb = GridOptionsBuilder.from_dataframe(df_filtered)
-    gb.configure_pagination(paginationAutoPageSize=True)
-    gb.configure_default_column(
-        editable=False,
-        filter=True,
-        sortable=True,
-        resizable=True,
-        wrapText=True,
-        minWidth=150
-    )
-    grid_options = gb.build()
-    AgGrid(
-        df_filtered,
-        gridOptions=grid_options,
+    table = df_filtered[[col for col in REQUIRED_COLUMNS if col in df_filtered.columns]]
+    paged_grid(
+        table,
+        key="seat_overview_grid",
+        default_column={'minWidth': 150},
         height=500,
         fit_columns_on_grid_load=True
     )
 
     # ---------- KPI إجمالي ----------
     st.header("💡 Overall Metrics")
-    total_seats_sold = df_filtered["seats_sold"].sum()
-    total_seats_allocated = df_filtered["seats_allocated"].sum()
+    totals = cube.totals(start_date, end_date, segments)
+    total_seats_sold = int(totals["seats_sold"])
+    total_seats_allocated = int(totals["seats_allocated"])
     avg_load_factor = (total_seats_sold / total_seats_allocated * 100) if total_seats_allocated > 0 else 0
     st.metric("Total Seats Sold", f"{total_seats_sold:,}")
     st.metric("Total Seats Allocated", f"{total_seats_allocated:,}")
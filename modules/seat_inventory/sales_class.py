@@ -1,31 +1,31 @@
 import streamlit as st
-import pandas as pd
+from modules.seat_inventory.cube import seat_cube
+from modules.seat_inventory.filters import segment_date_selection
+
+# الأعمدة التي تحتاجها الصفحة
+REQUIRED_COLUMNS = [
+    "flight_date", "segment", "class_of_service", "seats_allocated", "seats_sold",
+    "seats_available", "seats_on_hold", "seats_oversell", "fare_usd"
+]
 
 def show(df):
     st.subheader("🎟️ Sales by Class of Service")
 
-    # ---------- تحويل التاريخ ----------
-    if not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
+    start_date, end_date, segments = segment_date_selection(df, key="sales_class")
 
-    # ---------- فلتر الوجهات ----------
-    st.subheader("✈️ Filter by Segment")
-    all_segments = sorted(df["segment"].unique())
-    segment_filter_type = st.selectbox(
-        "Choose Segment Filter Type",
-        ["All Segments", "Custom Selection"],
-        index=0,
-        key="sales_class_segment_filter"
-    )
-    selected_segments = all_segments if segment_filter_type == "All Segments" else st.multiselect(
-        "Select Segments",
-        options=all_segments,
-        default=all_segments[:2],
-        key="sales_class_multiselect_segments"
-    )
+    # ---------- مجاميع كل Class من الـ cube ----------
+    summary = seat_cube(df).totals(start_date, end_date, segments, by=["class_of_service"])
+    if summary.empty:
+        st.warning("⚠️ No data available for selected filters.")
+        return
 
-    # ---------- فلتر التاريخ ----------
-    st.subheader("📅 Filter by Date")
-    min_date, max_date = df["flight_date"].min(), df["flight_date"].max()
-    start_date = pd.to_datetime(st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key="sales_class_start_date"))
-    end_date = pd.to_datetime(st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key="sales_class_end_date"))
+    summary["load_factor"] = (summary["seats_sold"] / summary["seats_allocated"] * 100).fillna(0)
+    st.dataframe(summary.style.format({
+        "seats_sold": "{:,}",
+        "seats_allocated": "{:,}",
+        "seats_available": "{:,}",
+        "seats_on_hold": "{:,}",
+        "seats_oversell": "{:,}",
+        "fare_usd": "{:,.2f}",
+        "load_factor": "{:.1f}%"
+    }), hide_index=True)
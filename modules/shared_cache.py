@@ -0,0 +1,231 @@
+"""
+Process-wide, thread-safe cache of loaded DataFrames shared by every session.
+
+Streamlit runs each browser session in its own thread of the same process.
+Without this cache every session parses (or reads back from Parquet) its own
+copy of each report. ``shared_cached`` keeps one frame per distinct dataset:
+
+- key: function, arguments and (path, size, mtime) of the source files, so a
+  new export invalidates the entry by itself
+- single flight: when several sessions ask for the same missing dataset at
+  the same time, one of them loads it and the others wait for that result
+- read-only results: callers get a shallow copy of the shared frame. With
+  pandas copy-on-write (always on from pandas 3, the required version) any
+  change they make copies the touched column first, the shared frame is
+  never modified
+- LRU eviction once the frames together exceed ``MAX_BYTES``
+- hit / miss / wait / eviction counters (``cache_stats()``)
+
+``per_dataset`` keeps structures derived from a cached frame (indexes,
+cubes ...) so they are built once per dataset, not once per rerun. Every
+cached frame carries its dataset id in ``df.attrs["shared_dataset"]``.
+"""
+import functools
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pandas as pd
+
+# Memory budget for all cached frames together
+MAX_BYTES = 512 * 1024 * 1024
+
+# Derived structures kept by per_dataset (a few per loaded frame)
+MAX_DERIVED = 16
+
+
+class SharedFrameCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (frame, bytes)
+        self._in_flight = {}           # key -> Future
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.total_bytes = 0
+        self.hits = self.misses = self.waits = self.evictions = 0
+
+    def get(self, key, load):
+        """Return the frame cached under ``key``, calling ``load()`` once if it is missing."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0].copy(deep=False)
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+            else:
+                self.waits += 1
+
+        if not owner:
+            return future.result().copy(deep=False)
+
+        try:
+            df = load()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if isinstance(df, pd.DataFrame):
+                self._store(key, df)
+        future.set_result(df)
+        return df.copy(deep=False)
+
+    def _store(self, key, df: pd.DataFrame):
+        # frames handed out (and frames derived from them) carry the dataset id
+        df.attrs["shared_dataset"] = next(self._ids)
+        size = int(df.memory_usage(deep=True).sum())
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[key] = (df, size)
+        self.total_bytes += size
+
+        # -------- LRU: الأقدم استخداماً يخرج أولاً (الجديد يبقى دائماً) --------
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "evictions": self.evictions,
+            }
+
+
+_cache = SharedFrameCache()
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _source_stamps(paths) -> tuple:
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stamps.append((os.path.abspath(path), None, None))
+    return tuple(stamps)
+
+
+def _freeze(value):
+    """Hashable form of a loader argument (lists of columns, other loaders ...)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if callable(value):
+        return f"{value.__module__}.{value.__qualname__}"
+    return value
+
+
+def shared_cached(sources):
+    """
+    Decorate a loader with the shared cache.
+
+    ``sources(*args, **kwargs)`` returns the paths of the files the loader
+    reads; their size and mtime are part of the key.
+    """
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            key = (
+                f"{loader.__module__}.{loader.__qualname__}",
+                _freeze(args),
+                _freeze(kwargs),
+                _source_stamps(sources(*args, **kwargs)),
+            )
+            return _cache.get(key, lambda: loader(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def _storage(values: pd.Series):
+    """
+    The array holding the values of a column and a token of its memory, read
+    without converting it (``to_numpy()`` of a text column builds a new array).
+    """
+    array = values.array
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        array = array.codes
+    elif hasattr(array, "__arrow_array__"):
+        chunks = array.__arrow_array__()
+        return chunks, tuple((chunk.offset, len(chunk), tuple(b.address if b else 0 for b in chunk.buffers()))
+                             for chunk in chunks.chunks)
+    else:
+        array = values.to_numpy()  # a view of the block for NumPy dtypes
+    return array, (array.__array_interface__["data"][0], array.dtype.str)
+
+
+class DerivedCache:
+    """
+    Structures derived from a dataset, ``build(df)`` built on first use.
+
+    A frame is identified by the shared-cache dataset it comes from
+    (``attrs["shared_dataset"]``), its columns and the memory of ``column``.
+    Frames handed out by the shared cache are shallow copies of one frame and
+    share that memory; a filtered frame or a changed column has its own. An
+    entry keeps the column's array alive, so its memory cannot be reused by
+    another frame while the result is cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df: pd.DataFrame, build, column: str):
+        array, memory = _storage(df[column])
+        token = (build, df.attrs.get("shared_dataset"), memory, len(df), tuple(df.columns))
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                self._entries.move_to_end(token)
+                return entry[1]
+
+        entry = (array, build(df))
+        with self._lock:
+            self._entries[token] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry[1]
+
+
+_derived = DerivedCache(MAX_DERIVED)
+
+
+def per_dataset(df: pd.DataFrame, build, column: str):
+    """``build(df)`` for the dataset of ``df`` (identified by ``column``), built on first use."""
+    return _derived.get(df, build, column)
@@ -9,7 +9,7 @@ def show(df):
     
     # ---------- مثال على فلتر تاريخ ----------
     if "flight_date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["flight_date"]):
-        df["flight_date"] = pd.to_datetime(df["flight_date"], errors="coerce")
+        df = df.assign(flight_date=pd.to_datetime(df["flight_date"], errors="coerce"))
 
     if "flight_date" in df.columns:
         min_date = df["flight_date"].min()
@@ -35,7 +35,7 @@ def show(df):
             (df["flight_date"] <= pd.to_datetime(end_date))
         ]
     else:
-        df_filtered = df.copy()
+        df_filtered = df
     
     st.write("📊 بيانات الفلتر جاهزة للعرض:", df_filtered.head())
 
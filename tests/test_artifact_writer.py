@@ -0,0 +1,30 @@
+import os
+
+import pandas as pd
+
+from modules import artifact_writer
+
+
+def test_deleted_artifact_is_written_again_on_a_cached_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_writer, "ARTIFACT_FOLDER", str(tmp_path / "processed"))
+    (tmp_path / "Report.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    calls = []
+
+    @artifact_writer.writes_artifact(str(tmp_path))
+    def load(file_name):
+        calls.append(file_name)  # stands for a loader answered from its cache
+        return pd.DataFrame({"a": [1], "b": [2]})
+
+    path = artifact_writer.artifact_path("Report.csv")
+    load("Report.csv")
+    artifact_writer._pending[path][1].result()
+    assert os.path.exists(path)
+
+    # up to date: nothing queued
+    assert artifact_writer.write_artifact(load("Report.csv"), "Report.csv", str(tmp_path / "Report.csv")).result() is False
+
+    os.remove(path)
+    load("Report.csv")
+    artifact_writer._pending[path][1].result()
+    assert os.path.exists(path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), pd.DataFrame({"a": [1], "b": [2]}))
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+from modules import incremental_store
+from modules.data_loader import DATA_FOLDER, SEAT_INVENTORY_SPEC, _finish_seat_inventory, _seat_columns
+from modules.report_parser import parse_report
+
+SEAT_FILE = os.path.join(DATA_FOLDER, "SeatInventoryAndCollectionsReport.csv")
+
+
+def load(path):
+    frames = incremental_store.load_incremental(
+        "test_seat", [path], SEAT_INVENTORY_SPEC, version=1,
+        columns=_seat_columns(None), finish=_finish_seat_inventory,
+    )
+    return frames[os.path.abspath(path)]
+
+
+def test_appended_row_keeps_the_stored_dtypes(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental_store, "STORE_FOLDER", str(tmp_path / "store"))
+    with open(SEAT_FILE, encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+    path = tmp_path / "SeatInventoryAndCollectionsReport.csv"
+    path.write_text("".join(lines[:200]), encoding="utf-8")
+    first = load(path)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines[200])
+    appended = load(path)
+
+    fresh = _finish_seat_inventory(parse_report(str(path), SEAT_INVENTORY_SPEC, columns=_seat_columns(None)))
+    assert appended.attrs["incremental"] == {"new_rows": 1, "rebuilt": False}
+    assert len(appended) == len(first) + 1
+    assert (appended.select_dtypes("category").columns == first.select_dtypes("category").columns).all()
+    pd.testing.assert_series_equal(appended.dtypes, fresh.dtypes)
+    pd.testing.assert_frame_equal(appended, fresh, check_categorical=False)
+
+
+def test_parts_are_merged_into_one(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental_store, "STORE_FOLDER", str(tmp_path / "store"))
+    with open(SEAT_FILE, encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+    path = tmp_path / "SeatInventoryAndCollectionsReport.csv"
+    path.write_text("".join(lines[:200]), encoding="utf-8")
+    load(path)
+    for line in lines[200:203]:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        appended = load(path)
+
+    store = next((tmp_path / "store").iterdir())
+    assert len(list(store.glob("*.parquet"))) == 1
+    again = load(path)
+    assert again.attrs["incremental"]["new_rows"] == 0
+    pd.testing.assert_frame_equal(again, appended)
+    assert len(again) == 202
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from modules.data_loader import merge_reports
+
+
+def report(name, start, end, rows, mtime=0.0):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    df = pd.DataFrame(rows, columns=["agent", "amount"])
+    df["report_from_date"] = start
+    df["report_to_date"] = end
+    return name, df, start, end, mtime
+
+
+def test_disjoint_months_keep_every_row():
+    # the same rows (even all-zero ones) in two different months are two months of data
+    rows = [("A", 0.0), ("A", 0.0), ("B", 10.0)]
+    merged = merge_reports([
+        report("jan.csv", "2025-01-01", "2025-01-31", rows),
+        report("feb.csv", "2025-02-01", "2025-02-28", rows),
+    ], "test")
+    assert len(merged) == 6
+    assert merged["report_from_date"].value_counts().tolist() == [3, 3]
+
+
+def test_overlapping_reports_keep_one_copy():
+    merged = merge_reports([
+        report("jan.csv", "2025-01-01", "2025-01-31", [("A", 0.0), ("A", 0.0), ("B", 10.0)]),
+        report("jan-feb.csv", "2025-01-15", "2025-02-15", [("A", 0.0), ("C", 5.0)], mtime=1.0),
+    ], "test")
+    # both copies of A inside jan.csv are real rows, the overlapping report repeats one of them
+    assert sorted(merged["agent"].astype(str)) == ["A", "A", "B", "C"]
+
+
+def test_covered_report_is_skipped():
+    merged = merge_reports([
+        report("jan-mtd.csv", "2025-01-01", "2025-01-15", [("A", 1.0)]),
+        report("jan.csv", "2025-01-01", "2025-01-31", [("A", 2.0)], mtime=1.0),
+    ], "test")
+    assert merged["amount"].tolist() == [2.0]
+    assert merged.attrs["skipped_reports"] == ["jan-mtd.csv"]
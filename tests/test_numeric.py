@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from modules.numeric import parse_numeric
+
+
+def old_chain(values) -> np.ndarray:
+    cleaned = pd.Series(values, dtype=object).astype(str).str.replace(",", "").str.strip()
+    return pd.to_numeric(cleaned, errors="coerce").to_numpy()
+
+
+def parsed(values) -> np.ndarray:
+    return parse_numeric(pd.Series(values, dtype="str")).to_numpy()
+
+
+def test_report_formats_match_to_numeric():
+    values = ["31,059,376.00", "-1,234.50", "115", "0.00", "", "Detail", "1.2.3", "-", "12-3"]
+    np.testing.assert_array_equal(parsed(values), old_chain(values))
+
+
+def test_plus_sign_and_exponent_match_to_numeric():
+    values = ["+5", "+1,000.25", "1e5", "-2.5E-3", "+3e+2", "1e", "e5", "+-5", "5+"]
+    np.testing.assert_array_equal(parsed(values), old_chain(values))
+
+
+def test_long_mantissas_are_correctly_rounded():
+    rng = np.random.default_rng(7)
+    values = [f"{rng.integers(10**14, 10**15)}.{rng.integers(0, 100):02d}" for _ in range(5000)]
+    values += [f"{rng.integers(10**16, 10**17)}" for _ in range(1000)]
+    values += ["0." + "1" * 25, "9007199254740993", "-90071992547409.93"]
+    expected = np.array([float(v) for v in values])
+    np.testing.assert_array_equal(parsed(values), expected)
+    # pd.to_numeric is not correctly rounded past 15 digits (up to 2 ULP off), it agrees within that
+    np.testing.assert_allclose(parsed(values), old_chain(values), rtol=4.5e-16, atol=0)
+
+
+def test_percent_is_read_as_number():
+    np.testing.assert_array_equal(parsed(["82%", " 7 % "]), [82.0, 7.0])
+
+
+def test_malformed_numbers_are_nan():
+    values = ["12%34", "1 234", "- 5", "5%%", "%5", "1,2,3", "12,34", "1234,567", ",123", "1,234.5,6", "1.234,5"]
+    assert np.isnan(parsed(values)).all()
+
+
+def test_thousands_separators_blanks_and_percent_suffix():
+    values = ["1,234,567.5", "999,999", " -5 ", "7 %", "1,234%", "5.", ".5", '"42"']
+    np.testing.assert_array_equal(parsed(values), [1234567.5, 999999.0, -5.0, 7.0, 1234.0, 5.0, 0.5, 42.0])
+
+
+def test_long_cells_are_decoded_one_by_one():
+    values = ["x" * 2000, " " * 100 + "1,250.75", "1" * 60, "5"]
+    np.testing.assert_array_equal(parsed(values), [np.nan, 1250.75, float("1" * 60), 5.0])
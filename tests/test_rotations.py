@@ -0,0 +1,44 @@
+import pandas as pd
+
+from modules.rotations import match_rotations
+
+
+def seat_rows(legs):
+    """Seat inventory rows for (date, flight_no, origin, destination) legs."""
+    df = pd.DataFrame(legs, columns=["flight_date", "flight_no", "origin", "destination"])
+    df["flight_date"] = pd.to_datetime(df["flight_date"])
+    df["seats_sold"] = 50
+    df["seats_allocated"] = 100
+    df["fare_usd"] = 1000.0
+    return df
+
+
+def returns(rotations):
+    return dict(zip(rotations["flight_no_out"].astype(str), rotations["flight_no_in"].astype(str)))
+
+
+def test_two_legs_the_same_day_both_return():
+    rotations = match_rotations(seat_rows([
+        ("2025-08-01", "RB441", "DAM", "IST"), ("2025-08-01", "RB443", "DAM", "IST"),
+        ("2025-08-01", "RB442", "IST", "DAM"), ("2025-08-01", "RB444", "IST", "DAM"),
+    ]))
+    assert returns(rotations) == {"RB441": "RB442", "RB443": "RB444"}
+
+
+def test_returns_on_a_later_day_are_not_left_unclaimed():
+    # two outbound days, both returns on the second day
+    rotations = match_rotations(seat_rows([
+        ("2025-08-01", "RB441", "DAM", "IST"), ("2025-08-02", "RB443", "DAM", "IST"),
+        ("2025-08-02", "RB442", "IST", "DAM"), ("2025-08-02", "RB444", "IST", "DAM"),
+    ]))
+    assert returns(rotations) == {"RB441": "RB442", "RB443": "RB444"}
+    assert rotations["days_away"].tolist() == [1, 0]
+
+
+def test_return_outside_the_window_is_not_matched():
+    rotations = match_rotations(seat_rows([
+        ("2025-08-01", "RB441", "DAM", "IST"), ("2025-08-10", "RB442", "IST", "DAM"),
+        ("2025-08-01", "RB389", "DAM", "RUH"), ("2025-08-01", "RB390", "RUH", "DAM"),
+    ]), window=pd.Timedelta(days=7))
+    matched = rotations.set_index(rotations["flight_no_out"].astype(str))["return_date"].notna()
+    assert matched.to_dict() == {"RB389": True, "RB441": False}
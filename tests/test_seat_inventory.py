@@ -0,0 +1,19 @@
+from modules.data_loader import SEAT_INVENTORY_SPEC, _finish_seat_inventory, _seat_columns
+from modules.report_parser import parse_report
+
+HEADER = ("Flight Date,Flight No,Segment,COS,Seats Allocate,Over sell,Curtailed,Seats Sold,On Hold,Fixed,"
+          "Seats Available,Fare Collection(USD),Seat Factor,Sur Charge,Flight Status,Baggage ,Sold Seats ,Ava.Seats \n")
+
+
+def test_non_numeric_cell_becomes_zero(tmp_path):
+    path = tmp_path / "SeatInventoryAndCollectionsReport.csv"
+    path.write_text(HEADER + (
+        '8/1/2025,RB446,IST/DAM,Y,141,0,0,115,0,0,26,"15,901.38",82%,0,ACT,0,115,26\n'
+        '8/1/2025,RB505,DAM/SHJ,Y,145,0,0,CNX,0,0,77,CNX,0%,0,CNX,0,0,77\n'
+    ), encoding="utf-8")
+    columns = _seat_columns(["flight_date", "seats_sold", "seats_allocated", "fare_usd"])
+    df = _finish_seat_inventory(parse_report(str(path), SEAT_INVENTORY_SPEC, columns=columns), columns)
+    assert df["seats_sold"].tolist() == [115, 0]
+    assert df["seats_allocated"].tolist() == [141, 145]
+    assert df["fare_usd"].tolist() == [15901.38, 0.0]
+    assert df["seats_sold"].dtype.kind == "i"
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from modules.shared_cache import DerivedCache, SharedFrameCache
+
+
+def invoices() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Agent Name": pd.array(["ALHIJAZ", "SHAM", "ALHIJAZ", "NOOR"], dtype="str"),
+        "Invoice Total": [10.0, 20.0, 30.0, 40.0],
+    })
+
+
+class Counter:
+    def __init__(self):
+        self.builds = 0
+
+    def __call__(self, df):
+        self.builds += 1
+        return object()
+
+
+def test_text_column_dataset_is_built_once():
+    cache, derived, build = SharedFrameCache(), DerivedCache(8), Counter()
+    results = {
+        id(derived.get(cache.get("invoices", invoices)[["Agent Name", "Invoice Total"]], build, "Agent Name"))
+        for _ in range(3)
+    }
+    assert build.builds == 1 and len(results) == 1
+
+
+def test_filtered_or_changed_frames_are_built_again():
+    cache, derived, build = SharedFrameCache(), DerivedCache(8), Counter()
+    df = cache.get("invoices", invoices)
+    derived.get(df, build, "Agent Name")
+    derived.get(df[df["Invoice Total"] > 15], build, "Agent Name")
+    changed = cache.get("invoices", invoices)
+    changed["Agent Name"] = changed["Agent Name"].str.lower()
+    derived.get(changed, build, "Agent Name")
+    assert build.builds == 3
+
+
+def test_other_dataset_is_built_again():
+    cache, derived, build = SharedFrameCache(), DerivedCache(8), Counter()
+    derived.get(cache.get("january", invoices), build, "Agent Name")
+    derived.get(cache.get("february", invoices), build, "Agent Name")
+    assert build.builds == 2
+
+
+def test_changes_in_one_session_do_not_reach_another():
+    cache = SharedFrameCache()
+    first = cache.get("invoices", invoices)
+    first.loc[0, "Invoice Total"] = -1.0
+    first["Agent Name"] = "CHANGED"
+    first.iloc[1, 1] = -2.0
+    second = cache.get("invoices", invoices)
+    pd.testing.assert_frame_equal(second, invoices())
+    # the values behind a handed-out frame cannot be written either
+    assert not second["Invoice Total"].to_numpy().flags.writeable
@@ -0,0 +1,22 @@
+import pytest
+
+from modules import data_loader
+from modules.sales_reports.currency_ranking import usd_rates
+
+
+def test_shipped_rates_are_dated():
+    rates = data_loader.load_usd_rates(data_loader.USD_RATES_FILE)
+    assert rates["rate_date"].notna().all()
+    assert usd_rates(rates)["USD"] == 1.0
+
+
+def test_duplicate_rate_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "DATA_FOLDER", str(tmp_path))
+    (tmp_path / "usd_rates.csv").write_text(
+        "currency,usd_per_unit,rate_date,source,note\n"
+        "AED,0.2723,2026-10-01,finance,\n"
+        "AED,0.2722,2026-10-15,finance,\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="AED"):
+        data_loader.load_usd_rates("usd_rates.csv")